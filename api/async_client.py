@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import aiohttp
+
+from utils import config
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_TIMEOUT = 10
+
+
+class AsyncResponse:
+    def __init__(self, status_code, headers, content, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncAPIClient:
+    def __init__(self, base_url=None, concurrency=DEFAULT_CONCURRENCY, pool_size=None,
+                 timeout=DEFAULT_TIMEOUT):
+        self.base_url = base_url or config.BASE_URL
+        self.concurrency = concurrency
+        self.pool_size = pool_size or concurrency
+        self.timeout = timeout
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        if self.session is None:
+            # One connector shared by every request: connections to the host are
+            # pooled and kept alive instead of being opened per call.
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+            self._semaphore = None
+
+    async def request(self, method, path, timeout=None, **kwargs):
+        session = await self.open()
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        url = f"{self.base_url}{path}"
+        async with self._semaphore:
+            async with session.request(method, url, **kwargs) as resp:
+                content = await resp.read()
+                return AsyncResponse(resp.status, resp.headers, content, str(resp.url))
@@ -0,0 +1,29 @@
+async def ping(client, **kwargs):
+    return await client.request("GET", "/ping", **kwargs)
+
+async def create_token(client, username, password, **kwargs):
+    return await client.request("POST", "/auth", json={
+        "username": username,
+        "password": password
+    }, **kwargs)
+
+async def get_booking(client, booking_id, **kwargs):
+    return await client.request("GET", f"/booking/{booking_id}", **kwargs)
+
+async def get_bookings(client, **kwargs):
+    return await client.request("GET", "/booking", **kwargs)
+
+async def create_booking(client, payload, **kwargs):
+    return await client.request("POST", "/booking", json=payload,
+                                headers={"Content-Type": "application/json"}, **kwargs)
+
+async def update_booking(client, booking_id, payload, token, **kwargs):
+    return await client.request("PUT", f"/booking/{booking_id}", json=payload,
+                                headers={
+                                    "Content-Type": "application/json",
+                                    "Cookie": f"token={token}"
+                                }, **kwargs)
+
+async def delete_booking(client, booking_id, token, **kwargs):
+    return await client.request("DELETE", f"/booking/{booking_id}",
+                                headers={"Cookie": f"token={token}"}, **kwargs)
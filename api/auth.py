@@ -0,0 +1,128 @@
+import threading
+import time
+
+from utils.config import AUTH_PASSWORD, AUTH_USERNAME, TOKEN_REFRESH_BACKOFF, TOKEN_REFRESH_MARGIN, TOKEN_TTL
+
+AUTH_FAILURE_STATUS = (401, 403)
+
+
+class AuthenticationError(RuntimeError):
+    pass
+
+
+def _fetch_via_endpoints(username, password):
+    from api.endpoints import create_token
+    resp = create_token(username, password)
+    if resp.status_code != 200:
+        return None
+    try:
+        return resp.json().get("token")
+    except ValueError:
+        return None
+
+
+class TokenProvider:
+    def __init__(self, username, password, fetch=None, ttl=TOKEN_TTL, refresh_margin=TOKEN_REFRESH_MARGIN,
+                 refresh_backoff=TOKEN_REFRESH_BACKOFF, clock=time.monotonic):
+        self.username = username
+        self.password = password
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.refresh_backoff = refresh_backoff
+        self.fetches = 0
+        self._fetch = fetch or _fetch_via_endpoints
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
+        self._inflight = None
+        self._next_background_refresh = 0.0
+
+    def token(self):
+        now = self._clock()
+        token, expires_at = self._token, self._expires_at
+        if token is not None and now < expires_at:
+            if now >= expires_at - self.refresh_margin:
+                self._refresh_in_background(token)
+            return token
+        return self.refresh()
+
+    def refresh(self, stale=None):
+        """Fetch a new token, sharing one fetch between concurrent callers.
+
+        ``stale`` is the token a caller saw rejected; if another caller has already
+        replaced it, the fresh token is returned without another round trip.
+        """
+        with self._lock:
+            if stale is not None and self._token is not None and self._token != stale:
+                return self._token
+            inflight = self._inflight
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight = threading.Event()
+        if not owner:
+            inflight.wait()
+            if self._token is None:
+                raise AuthenticationError(f"Could not obtain a token for {self.username!r}")
+            return self._token
+        try:
+            token = self._fetch(self.username, self.password)
+            with self._lock:
+                self.fetches += 1
+                if token:
+                    self._token = token
+                    self._expires_at = self._clock() + self.ttl
+        finally:
+            with self._lock:
+                self._inflight = None
+            inflight.set()
+        if not token:
+            raise AuthenticationError(f"Could not obtain a token for {self.username!r}")
+        return token
+
+    def invalidate(self):
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+
+    def call(self, fn):
+        """Run ``fn(token)``; on 401/403 refresh the token once and retry."""
+        token = self.token()
+        resp = fn(token)
+        if getattr(resp, "status_code", None) in AUTH_FAILURE_STATUS:
+            resp = fn(self.refresh(stale=token))
+        return resp
+
+    def _refresh_in_background(self, current):
+        # At most one background attempt per ``refresh_backoff`` seconds, so a
+        # failing /auth is not hit again by every call inside the margin.
+        with self._lock:
+            now = self._clock()
+            if self._inflight is not None or now < self._next_background_refresh:
+                return
+            self._next_background_refresh = now + self.refresh_backoff
+
+        def run():
+            try:
+                self.refresh(stale=current)
+            except Exception:
+                pass
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def get_token_provider(username, password):
+    key = (username, password)
+    provider = _providers.get(key)
+    if provider is None:
+        with _providers_lock:
+            provider = _providers.setdefault(key, TokenProvider(username, password))
+    return provider
+
+
+def default_token_provider():
+    return get_token_provider(AUTH_USERNAME, AUTH_PASSWORD)
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from utils.config import CACHE_SIZE, CACHE_TTL
+
+
+class CacheEntry:
+    __slots__ = ("response", "path", "stored_at", "etag", "last_modified")
+
+    def __init__(self, response, path, stored_at):
+        self.response = response
+        self.path = path
+        self.stored_at = stored_at
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._by_path = {}
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "invalidated": 0, "evicted": 0}
+
+    @classmethod
+    def from_config(cls):
+        return cls() if CACHE_TTL > 0 else None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key):
+        """Return ``(entry, fresh)``; stale entries are kept for revalidation."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, False
+            self._entries.move_to_end(key)
+            fresh = self._clock() - entry.stored_at < self.ttl
+            self.stats["hits" if fresh else "misses"] += 1
+            return entry, fresh
+
+    def store(self, key, path, response):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = CacheEntry(response, path, self._clock())
+            self._by_path.setdefault(path, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.stats["evicted"] += 1
+
+    def revalidated(self, entry):
+        with self._lock:
+            entry.stored_at = self._clock()
+            self.stats["revalidated"] += 1
+        return entry.response
+
+    def invalidate(self, path):
+        # A write to /booking/{id} makes that booking and every /booking list stale;
+        # a write to /booking (create) only affects the lists.
+        path = urlsplit(path).path.rstrip("/")
+        parent = path.rsplit("/", 1)[0]
+        with self._lock:
+            for target in {path, parent}:
+                for key in list(self._by_path.get(target, ())):
+                    self._drop(key)
+                    self.stats["invalidated"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_path.clear()
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        keys = self._by_path.get(entry.path)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_path[entry.path]
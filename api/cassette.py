@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils.config import CASSETTE_LATENCY, CASSETTE_MODE, CASSETTE_PATH
+
+MODES = ("record", "replay")
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+def _content(resp):
+    # A streamed httpx response has to be read explicitly; requests reads on access.
+    read = getattr(resp, "read", None)
+    return read() if callable(read) else resp.content
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+def body_bytes(kwargs):
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"], sort_keys=True, separators=(",", ":")).encode()
+    data = kwargs.get("data")
+    if data is None:
+        return b""
+    if isinstance(data, str):
+        data = data.encode()
+    if isinstance(data, (bytes, bytearray)):
+        # Pre-serialised JSON bodies hash the same as the equivalent json= dict.
+        try:
+            return json.dumps(json.loads(data), sort_keys=True, separators=(",", ":")).encode()
+        except ValueError:
+            return bytes(data)
+    return urlencode(sorted(dict(data).items())).encode()
+
+
+def request_key(method, path, kwargs):
+    parts = urlsplit(path)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    params = kwargs.get("params") or {}
+    query.extend((str(k), str(v)) for k, v in (params.items() if isinstance(params, dict) else params))
+    digest = hashlib.sha1(body_bytes(kwargs)).hexdigest()[:16]
+    return f"{method.upper()} {parts.path}?{urlencode(sorted(query))}#{digest}"
+
+
+class Cassette:
+    def __init__(self, path, mode, emulate_latency=False):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.emulate_latency = emulate_latency
+        self._lock = threading.Lock()
+        self._index = {}
+        self._file = None
+        if mode == "replay":
+            self._load()
+
+    @classmethod
+    def from_config(cls):
+        if CASSETTE_MODE not in MODES or not CASSETTE_PATH:
+            return None
+        return cls(CASSETTE_PATH, CASSETTE_MODE, CASSETTE_LATENCY)
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._index.setdefault(entry["key"], deque()).append(entry)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._index.values())
+
+    def record(self, method, path, kwargs, resp):
+        # The whole body is read here, so a streamed response is buffered in
+        # record mode; its caller then iterates over the buffered bytes.
+        entry = {
+            "key": request_key(method, path, kwargs),
+            "status": resp.status_code,
+            "headers": {h: resp.headers[h] for h in KEPT_HEADERS if h in resp.headers},
+            "body": _content(resp).decode("utf-8", errors="surrogateescape"),
+            "elapsed_ms": round(resp.elapsed.total_seconds() * 1000, 3),
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, "w", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def replay(self, method, path, kwargs, base_url=""):
+        key = request_key(method, path, kwargs)
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response for {key}")
+            # Repeated identical requests are served in recording order; the last
+            # recording keeps answering once the queue is down to one entry.
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+        if self.emulate_latency:
+            time.sleep(entry["elapsed_ms"] / 1000.0)
+        return self._response(entry, f"{base_url}{path}")
+
+    @staticmethod
+    def _response(entry, url):
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp._content = entry["body"].encode("utf-8", errors="surrogateescape")
+        # There is no raw stream behind a replayed body: iter_content() and
+        # close() must treat it as already read.
+        resp._content_consumed = True
+        resp.encoding = "utf-8"
+        resp.url = url
+        resp.elapsed = timedelta(milliseconds=entry["elapsed_ms"])
+        return resp
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import requests
+
+from api.auth import AuthenticationError, default_token_provider
+from utils import config
+
+CLEANUP_CONCURRENCY = 20
+REQUEST_TIMEOUT = 10
+
+
+class BookingRegistry:
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._ids = set()
+
+    def add(self, bookingid):
+        with self._lock:
+            self._ids.add(bookingid)
+
+    def discard(self, bookingid):
+        with self._lock:
+            self._ids.discard(bookingid)
+
+    def ids(self):
+        with self._lock:
+            return set(self._ids)
+
+
+def namespaced_ids(namespace):
+    try:
+        resp = requests.get(f"{config.BASE_URL}/booking", params={"lastname": namespace},
+                            timeout=REQUEST_TIMEOUT)
+        return {item["bookingid"] for item in resp.json()}
+    except Exception:
+        return set()
+
+
+async def _delete_all(ids, token):
+    # aiohttp is only worth importing when there is something to clean up.
+    from api import async_endpoints
+    from api.async_client import AsyncAPIClient
+    async with AsyncAPIClient(concurrency=CLEANUP_CONCURRENCY) as client:
+        await asyncio.gather(*(async_endpoints.delete_booking(client, bid, token) for bid in ids),
+                             return_exceptions=True)
+
+
+def cleanup_bookings(registry):
+    """Delete every booking in ``registry``, plus any still filed under its namespace (lastname)."""
+    ids = registry.ids() | namespaced_ids(registry.namespace)
+    if not ids:
+        return
+    try:
+        token = default_token_provider().token()
+    except (AuthenticationError, requests.RequestException):
+        return
+    asyncio.run(_delete_all(sorted(ids), token))
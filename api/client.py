@@ -1,11 +1,133 @@
-import requests
-from utils.config import BASE_URL
+import re
+import time
+
+from api.cache import ResponseCache
+from api.cassette import Cassette, request_key
+from api.codec import attach_json, default_codec
+from api.resilience import Resilience
+from api.transport import build_session, end_trace, start_trace
+from utils import config
+from utils.timing import Instrumentation, set_current_endpoint
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_name(method, path):
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path.split('?', 1)[0])}"
+
 
 class APIClient:
-    def __init__(self):
-        self.session = requests.Session()
-        self.base_url = BASE_URL
+    def __init__(self, base_url=None, cassette=None, codec=None, cache=None, resilience=None, transport=None):
+        # ``transport`` is a name for build_session ("requests", "httpx",
+        # "http2") or a ready session-like object with request() and close().
+        if transport is None or isinstance(transport, str):
+            transport = build_session(transport or config.TRANSPORT)
+        self.session = transport
+        self.base_url = base_url or config.BASE_URL
+        self.cassette = cassette if cassette is not None else Cassette.from_config()
+        self.codec = codec or default_codec()
+        self.cache = cache if cache is not None else ResponseCache.from_config()
+        self.resilience = resilience if resilience is not None else Resilience.from_config()
+        self.instrumentation = Instrumentation()
+
+    def add_hook(self, hook):
+        return self.instrumentation.add_hook(hook)
+
+    def remove_hook(self, hook):
+        self.instrumentation.remove_hook(hook)
+
+    def request(self, method, path, name=None, retries=None, idempotent=None, **kwargs):
+        """Send one API call.
 
-    def request(self, method, path, **kwargs):
+        ``retries`` overrides the configured retry count for this call and
+        ``idempotent`` marks a call safe (or unsafe) to repeat regardless of
+        its HTTP method.
+        """
+        cassette = self.cassette
+        if cassette is not None and cassette.mode == "replay":
+            return attach_json(cassette.replay(method, path, kwargs, self.base_url), self.codec)
+        cache = self.cache
+        # A streamed body is read by the caller, so there is nothing to cache.
+        if cache is None or kwargs.get("stream"):
+            return self._send(method, path, name, kwargs, retries, idempotent)
+        if method.upper() == "GET":
+            return self._cached_get(cache, path, name, kwargs, retries)
+        resp = self._send(method, path, name, kwargs, retries, idempotent)
+        cache.invalidate(path)
+        return resp
+
+    def _cached_get(self, cache, path, name, kwargs, retries=None):
+        key = request_key("GET", path, kwargs)
+        entry, fresh = cache.lookup(key)
+        if fresh:
+            return entry.response
+        if entry is not None:
+            conditional = entry.conditional_headers()
+            if conditional:
+                kwargs = {**kwargs, "headers": {**(kwargs.get("headers") or {}), **conditional}}
+        resp = self._send("GET", path, name, kwargs, retries)
+        if resp.status_code == 304 and entry is not None:
+            return cache.revalidated(entry)
+        if resp.status_code == 200:
+            cache.store(key, path.split("?", 1)[0].rstrip("/"), resp)
+        return resp
+
+    def _send(self, method, path, name, kwargs, retries=None, idempotent=None):
         url = f"{self.base_url}{path}"
-        return self.session.request(method, url, **kwargs)
+        send_kwargs = self._encode_body(kwargs)
+        resilience = self.resilience
+        if resilience is None:
+            resp = self._transmit(method, url, name, path, send_kwargs)
+        else:
+            endpoint = name or endpoint_name(method, path)
+            resp = resilience.call(endpoint, method, lambda: self._transmit(method, url, endpoint, path, send_kwargs),
+                                   idempotent=idempotent, retries=retries)
+        if self.cassette is not None:
+            self.cassette.record(method, path, kwargs, resp)
+        return resp
+
+    def _transmit(self, method, url, name, path, send_kwargs):
+        if self.instrumentation.hooks:
+            return self._traced_request(method, url, name or endpoint_name(method, path), send_kwargs)
+        return attach_json(self.session.request(method, url, **send_kwargs), self.codec)
+
+    def _encode_body(self, kwargs):
+        # Dict bodies are encoded once with the client's codec; bytes bodies
+        # (e.g. BookingGenerator.json_payloads) are sent exactly as given.
+        body = kwargs.get("json")
+        if body is None and not isinstance(kwargs.get("data"), (bytes, bytearray)):
+            return kwargs
+        send_kwargs = dict(kwargs)
+        if body is not None:
+            send_kwargs["data"] = self.codec.dumps(body)
+            del send_kwargs["json"]
+        headers = send_kwargs.get("headers")
+        if not headers or "Content-Type" not in headers:
+            send_kwargs["headers"] = {**(headers or {}), "Content-Type": "application/json"}
+        return send_kwargs
+
+    def _traced_request(self, method, url, endpoint, kwargs):
+        instrumentation = self.instrumentation
+        set_current_endpoint(endpoint, instrumentation)
+        trace = start_trace()
+        t0 = time.perf_counter()
+        try:
+            resp = self.session.request(method, url, **kwargs)
+        finally:
+            end_trace()
+        done = time.perf_counter()
+        phases = trace.phases
+        if trace.headers_at is not None:
+            phases["transfer"] = (done - trace.headers_at) * 1000.0
+        phases["total"] = (done - t0) * 1000.0
+        instrumentation.count_connection(trace.reused)
+        for phase, ms in phases.items():
+            instrumentation.emit(endpoint, phase, ms)
+
+        def timed_decode(loads, content):
+            t0 = time.perf_counter()
+            data = loads(content)
+            instrumentation.emit(endpoint, "json_decode", (time.perf_counter() - t0) * 1000.0)
+            return data
+
+        return attach_json(resp, self.codec, timed_decode)
@@ -0,0 +1,113 @@
+import codecs
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StdlibCodec:
+    name = "json"
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    @staticmethod
+    def dumps(obj):
+        return orjson.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        return orjson.loads(data)
+
+
+def default_codec():
+    return OrjsonCodec() if orjson is not None else StdlibCodec()
+
+
+def attach_json(resp, codec, on_decode=None):
+    # Replaces resp.json with a version that decodes with `codec` once and then
+    # serves the cached object; keyword arguments fall back to requests' own decoder.
+    fallback = resp.json
+    cached = []
+
+    def decode(**kwargs):
+        if kwargs:
+            return fallback(**kwargs)
+        if not cached:
+            if on_decode is None:
+                cached.append(codec.loads(resp.content))
+            else:
+                cached.append(on_decode(codec.loads, resp.content))
+        return cached[0]
+
+    resp.json = decode
+    return resp
+
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def iter_json_array(chunks, decoder=None):
+    """Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Only the unparsed tail of the body is kept, so memory depends on the
+    largest element rather than the whole array. Raises ValueError on
+    anything that is not a single well-formed array.
+    """
+    raw_decode = (decoder or json.JSONDecoder()).raw_decode
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf, pos = "", 0
+    # expect: "[" before the array, "first" right after it, "value" after a
+    # comma and "," after an element.
+    expect, done, eof = "[", False, False
+    chunks = iter(chunks)
+    while not eof:
+        chunk = next(chunks, None)
+        eof = chunk is None
+        buf = buf[pos:] + text.decode(chunk or b"", final=eof)
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buf):
+                break
+            char = buf[pos]
+            if done:
+                raise ValueError(f"Unexpected data after the JSON array: {buf[pos:pos + 20]!r}")
+            if expect == "[":
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {buf[pos:pos + 20]!r}")
+                pos, expect = pos + 1, "first"
+            elif char == "]" and expect != "value":
+                pos, done = pos + 1, True
+            elif expect == ",":
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {buf[pos:pos + 20]!r}")
+                pos, expect = pos + 1, "value"
+            else:
+                try:
+                    item, end = raw_decode(buf, pos)
+                except ValueError:
+                    if eof:
+                        raise
+                    break
+                # A number cut by a chunk boundary ("12" of "123", "-1." of
+                # "-1.5") still decodes, so it only counts once a delimiter follows.
+                if not eof and (end == len(buf) or buf[end] not in _DELIMITERS):
+                    break
+                yield item
+                pos, expect = end, ","
+    if not done:
+        raise ValueError("Truncated JSON array")
@@ -1,33 +1,140 @@
-from api.client import APIClient
+import itertools
+import threading
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-client = APIClient()
+_client_lock = threading.Lock()
 
-def ping():
-    return client.request("GET", "/ping")
 
-def create_token(username, password):
-    return client.request("POST", "/auth", json={
+def get_client():
+    # The shared client (and with it requests/urllib3) is built on first use,
+    # so importing this module stays cheap for tools that never send a request.
+    # Assigning ``endpoints.client`` still replaces it.
+    client = globals().get("client")
+    if client is None:
+        with _client_lock:
+            client = globals().get("client")
+            if client is None:
+                from api.client import APIClient
+                client = globals()["client"] = APIClient()
+    return client
+
+
+def __getattr__(name):
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def ping(**kwargs):
+    return get_client().request("GET", "/ping", name="GET /ping", **kwargs)
+
+def create_token(username, password, **kwargs):
+    # Asking for a token twice is harmless, so POST /auth may be retried.
+    kwargs.setdefault("idempotent", True)
+    return get_client().request("POST", "/auth", name="POST /auth", json={
         "username": username,
         "password": password
-    })
+    }, **kwargs)
+
+def get_booking(booking_id, **kwargs):
+    return get_client().request("GET", f"/booking/{booking_id}", name="GET /booking/{id}", **kwargs)
+
+def get_bookings(**kwargs):
+    return get_client().request("GET", "/booking", name="GET /booking", **kwargs)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def iter_booking_ids(validate=True, chunk_size=STREAM_CHUNK_SIZE, **kwargs):
+    """Yield booking IDs from GET /booking while the body is still arriving.
+
+    The list is parsed incrementally, so memory stays flat however many
+    bookings there are, and each item is checked against the list item
+    schema as it is read. Takes the same keyword arguments as get_bookings
+    (e.g. ``params``); the response cache is bypassed.
+    """
+    import requests
+    from api.codec import iter_json_array
+    from utils.validation import validate_each
+
+    resp = get_client().request("GET", "/booking", name="GET /booking", stream=True, **kwargs)
+    try:
+        if resp.status_code != 200:
+            raise requests.HTTPError(f"GET /booking returned {resp.status_code}", response=resp)
+        items = iter_json_array(resp.iter_content(chunk_size))
+        if validate:
+            items = validate_each(items, "bookings_list_item")
+        for item in items:
+            yield item["bookingid"] if "bookingid" in item else item["id"]
+    finally:
+        resp.close()
+
+def _body(payload):
+    # Ready-made JSON bytes are sent as-is; anything else goes through the codec.
+    if isinstance(payload, (bytes, bytearray)):
+        return {"data": payload}
+    return {"json": payload}
+
+def create_booking(payload, **kwargs):
+    return get_client().request("POST", "/booking", name="POST /booking", **_body(payload),
+                                headers={"Content-Type": "application/json"}, **kwargs)
+
+def update_booking(booking_id, payload, token, **kwargs):
+    return get_client().request("PUT", f"/booking/{booking_id}", name="PUT /booking/{id}", **_body(payload),
+                                headers={
+                                    "Content-Type": "application/json",
+                                    "Cookie": f"token={token}"
+                                }, **kwargs)
+
+def delete_booking(booking_id, token, **kwargs):
+    return get_client().request("DELETE", f"/booking/{booking_id}", name="DELETE /booking/{id}",
+                                headers={"Cookie": f"token={token}"}, **kwargs)
+
+
+BULK_CONCURRENCY = 10
+BULK_RETRIES = 2
+
+BulkResult = namedtuple("BulkResult", "index item response error")
+
+
+def _call(fn, item, retries):
+    # Retries, backoff and the circuit breaker live in APIClient; the bulk
+    # helpers only pass the per-call retry count down.
+    import requests
+    try:
+        return fn(item, retries=retries), None
+    except requests.RequestException as exc:
+        return None, exc
+
 
-def get_booking(booking_id):
-    return client.request("GET", f"/booking/{booking_id}")
+def _bulk(fn, items, concurrency, retries):
+    # Keeps at most `concurrency` calls in flight and pulls the next input only
+    # when a slot frees up, so arbitrarily long iterables stream through.
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    pending = {}
+    source = enumerate(items)
+    try:
+        for index, item in itertools.islice(source, concurrency):
+            pending[executor.submit(_call, fn, item, retries)] = (index, item)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                resp, error = future.result()
+                yield BulkResult(index, item, resp, error)
+                for next_index, next_item in itertools.islice(source, 1):
+                    pending[executor.submit(_call, fn, next_item, retries)] = (next_index, next_item)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
-def get_bookings():
-    return client.request("GET", "/booking")
 
-def create_booking(payload):
-    return client.request("POST", "/booking", json=payload,
-                          headers={"Content-Type": "application/json"})
+def bulk_create_bookings(payloads, concurrency=BULK_CONCURRENCY, retries=BULK_RETRIES):
+    return _bulk(lambda payload, **kw: create_booking(payload, **kw), payloads, concurrency, retries)
 
-def update_booking(booking_id, payload, token):
-    return client.request("PUT", f"/booking/{booking_id}", json=payload,
-                          headers={
-                              "Content-Type": "application/json",
-                              "Cookie": f"token={token}"
-                          })
+def bulk_get_bookings(booking_ids, concurrency=BULK_CONCURRENCY, retries=BULK_RETRIES):
+    return _bulk(lambda booking_id, **kw: get_booking(booking_id, **kw), booking_ids, concurrency, retries)
 
-def delete_booking(booking_id, token):
-    return client.request("DELETE", f"/booking/{booking_id}",
-                          headers={"Cookie": f"token={token}"})
+def bulk_delete_bookings(booking_ids, token, concurrency=BULK_CONCURRENCY, retries=BULK_RETRIES):
+    return _bulk(lambda booking_id, **kw: delete_booking(booking_id, token, **kw), booking_ids, concurrency,
+                 retries)
@@ -0,0 +1,165 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from utils.config import BOOKING_POOL_MODE, BOOKING_POOL_SIZE
+
+MODES = ("round_robin", "random")
+FILL_CONCURRENCY = 10
+
+
+def _create_via_endpoints(payload):
+    from api.endpoints import create_booking
+    resp = create_booking(payload)
+    if resp.status_code != 200:
+        return None
+    data = resp.json()
+    return data["bookingid"], data.get("booking") or (payload if isinstance(payload, dict) else json.loads(payload))
+
+
+def _default_payloads():
+    from utils.payloads import BookingGenerator
+    return BookingGenerator().stream()
+
+
+class Lease:
+    """One booking held exclusively; set ``booking`` after an update or ``deleted`` after a delete."""
+
+    def __init__(self, entry):
+        self.id, self.booking = entry
+        self.deleted = False
+
+
+class BookingPool:
+    """Bookings provisioned once and shared by many consumers.
+
+    Readers get ``(id, booking)`` entries from ``next()`` without taking them
+    out of the pool. Writers ``acquire()`` an entry, which hides it from
+    readers and other writers until it is released. An entry released as
+    deleted is dropped and a new booking is created in its place, so the pool
+    stays at ``size``.
+
+    ``create(payload)`` returns ``(id, booking)`` or ``None``; the default goes
+    through ``api.endpoints``. Load drivers pass their own so provisioning is
+    not timed with the run.
+    """
+
+    def __init__(self, size=BOOKING_POOL_SIZE, create=None, payloads=None, mode=BOOKING_POOL_MODE, rng=None):
+        if mode not in MODES:
+            raise ValueError(f"Booking pool mode must be one of {', '.join(MODES)}, not {mode!r}")
+        self.size = size
+        self.mode = mode
+        self._create = create or _create_via_endpoints
+        self._payloads = payloads or _default_payloads()
+        self._rng = rng or random.Random()
+        self._cond = threading.Condition()
+        self._bookings = {}
+        self._readable = []
+        self._cursor = 0
+        self.stats = {"created": 0, "replaced": 0, "create_failed": 0, "reads": 0, "leases": 0}
+
+    def __len__(self):
+        with self._cond:
+            return len(self._bookings)
+
+    def __contains__(self, bookingid):
+        with self._cond:
+            return bookingid in self._bookings
+
+    def fill(self, concurrency=FILL_CONCURRENCY):
+        """Create bookings until the pool holds ``size``; returns how many were added."""
+        missing = self.size - len(self)
+        if missing <= 0:
+            return 0
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, missing))) as executor:
+            return sum(1 for added in executor.map(lambda _: self._provision(), range(missing)) if added)
+
+    def _provision(self, counter="created"):
+        try:
+            entry = self._create(self._payloads())
+        except Exception:
+            entry = None
+        with self._cond:
+            if entry is None:
+                self.stats["create_failed"] += 1
+                return False
+            self.stats[counter] += 1
+            self._bookings[entry[0]] = entry[1]
+            self._readable.append(entry[0])
+            self._cond.notify_all()
+        return True
+
+    def _wait(self, timeout):
+        # Caller holds the lock. A timeout of 0 never blocks.
+        deadline = time.monotonic() + timeout if timeout else None
+        while not self._readable:
+            remaining = deadline - time.monotonic() if deadline is not None else 0
+            if remaining <= 0:
+                return False
+            self._cond.wait(remaining)
+        return True
+
+    def _pick(self):
+        if self.mode == "random":
+            return self._rng.randrange(len(self._readable))
+        index = self._cursor % len(self._readable)
+        self._cursor = index + 1
+        return index
+
+    def next(self, timeout=0):
+        """A shared ``(id, booking)`` for read-only use, or ``None`` if every booking is leased."""
+        with self._cond:
+            if not self._wait(timeout):
+                return None
+            bookingid = self._readable[self._pick()]
+            self.stats["reads"] += 1
+            return bookingid, self._bookings[bookingid]
+
+    def acquire(self, timeout=0):
+        """Take an ``(id, booking)`` exclusively until ``release()``, or ``None`` if none is free."""
+        with self._cond:
+            if not self._wait(timeout):
+                return None
+            bookingid = self._readable.pop(self._pick())
+            self.stats["leases"] += 1
+            return bookingid, self._bookings[bookingid]
+
+    def release(self, entry, booking=None, deleted=False):
+        bookingid = entry[0]
+        with self._cond:
+            if bookingid not in self._bookings:
+                return
+            if not deleted:
+                if booking is not None:
+                    self._bookings[bookingid] = booking
+                self._readable.append(bookingid)
+                self._cond.notify_all()
+                return
+            del self._bookings[bookingid]
+        self._provision("replaced")
+
+    @contextmanager
+    def lease(self, timeout=0):
+        entry = self.acquire(timeout)
+        if entry is None:
+            raise LookupError(f"No free booking in the pool after {timeout}s")
+        lease = Lease(entry)
+        try:
+            yield lease
+        finally:
+            self.release(entry, lease.booking, lease.deleted)
+
+    def ids(self):
+        with self._cond:
+            return list(self._bookings)
+
+    def clear(self):
+        """Forget every booking and return their ids, for the caller to delete."""
+        with self._cond:
+            ids = list(self._bookings)
+            self._bookings.clear()
+            self._readable.clear()
+            return ids
@@ -0,0 +1,253 @@
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from utils.config import (BREAKER_COOLDOWN, BREAKER_MIN_REQUESTS, BREAKER_THRESHOLD, BREAKER_WINDOW,
+                          RETRY_ATTEMPTS, RETRY_BACKOFF, RETRY_BACKOFF_MAX, RETRY_BUDGET)
+
+TRANSIENT_STATUS = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+def _never_sent(exc):
+    # Connection set-up failures mean the server never saw the request, so even
+    # a POST can be retried without risking a duplicate booking.
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def is_failure(resp, exc):
+    return exc is not None or resp.status_code in TRANSIENT_STATUS
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=RETRY_ATTEMPTS, backoff=RETRY_BACKOFF, backoff_max=RETRY_BACKOFF_MAX,
+                 rng=None):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._rng = rng or random.Random()
+
+    def retryable(self, method, resp, exc, idempotent=None):
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if exc is not None:
+            return not isinstance(exc, CircuitOpenError) and (idempotent or _never_sent(exc))
+        # 429 means the request was turned away before doing anything.
+        return resp.status_code == 429 or (idempotent and resp.status_code in TRANSIENT_STATUS)
+
+    def delay(self, attempt, resp=None):
+        """Full-jitter exponential backoff, or the server's Retry-After if given."""
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return self._rng.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+
+
+class RetryBudget:
+    """Token bucket that caps retries at a fraction of recent requests.
+
+    Every request deposits ``ratio`` tokens and every retry spends one, plus a
+    small per-second allowance so a quiet client can still retry at all. When
+    the server degrades, retries stop at ``ratio`` extra load instead of
+    multiplying it by ``max_attempts``.
+    """
+
+    def __init__(self, ratio=RETRY_BUDGET, min_per_second=1.0, burst=10.0, clock=time.monotonic):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._balance = burst
+        self._refilled_at = clock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self.burst, self._balance + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            now = self._clock()
+            self._balance = min(self.burst, self._balance + (now - self._refilled_at) * self.min_per_second)
+            self._refilled_at = now
+            if self._balance < 1.0 - 1e-9:
+                return False
+            self._balance -= 1.0
+            return True
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_THRESHOLD, min_requests=BREAKER_MIN_REQUESTS, window=BREAKER_WINDOW,
+                 cooldown=BREAKER_COOLDOWN, clock=time.monotonic):
+        self.threshold = threshold
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.opened = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        # One [second, total, failures] bucket per second of the window keeps
+        # memory flat however many requests go through.
+        self._buckets = deque()
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _trim(self, now):
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+
+    def failure_rate(self):
+        with self._lock:
+            self._trim(self._clock())
+            total = sum(b[1] for b in self._buckets)
+            return sum(b[2] for b in self._buckets) / total if total else 0.0
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if self._clock() - self._opened_at < self.cooldown:
+                    return False
+                self.state = HALF_OPEN
+            # Half-open: one probe at a time decides whether to close again.
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, ok):
+        with self._lock:
+            now = self._clock()
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self.state = CLOSED
+                    self._buckets.clear()
+                else:
+                    self._open(now)
+                return
+            second = int(now)
+            if not self._buckets or self._buckets[-1][0] != second:
+                self._buckets.append([second, 0, 0])
+            bucket = self._buckets[-1]
+            bucket[1] += 1
+            bucket[2] += 0 if ok else 1
+            self._trim(now)
+            if self.state == CLOSED and not ok:
+                total = sum(b[1] for b in self._buckets)
+                failures = sum(b[2] for b in self._buckets)
+                if total >= self.min_requests and failures / total >= self.threshold:
+                    self._open(now)
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = now
+
+
+class Resilience:
+    def __init__(self, policy=None, budget=None, breaker_threshold=BREAKER_THRESHOLD, sleep=time.sleep,
+                 breaker_factory=None):
+        self.policy = policy or RetryPolicy()
+        self.budget = budget or RetryBudget()
+        self.breaker_threshold = breaker_threshold
+        self._breaker_factory = breaker_factory or (lambda: CircuitBreaker(threshold=breaker_threshold))
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.breakers = {}
+        self.stats = {"requests": 0, "attempts": 0, "retries": 0, "exhausted": 0, "budget_exhausted": 0,
+                      "short_circuited": 0}
+
+    @classmethod
+    def from_config(cls):
+        if RETRY_ATTEMPTS <= 1 and BREAKER_THRESHOLD <= 0:
+            return None
+        return cls()
+
+    def breaker(self, endpoint):
+        if self.breaker_threshold <= 0:
+            return None
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(endpoint, self._breaker_factory())
+        return breaker
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def call(self, endpoint, method, send, idempotent=None, retries=None):
+        """Run ``send()`` with retries, backoff and the endpoint's breaker.
+
+        ``retries`` overrides the policy's attempt count for this call. Raises
+        CircuitOpenError while the endpoint's breaker is shedding load.
+        """
+        attempts = self.policy.max_attempts if retries is None else retries + 1
+        breaker = self.breaker(endpoint)
+        self._count("requests")
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                self._count("short_circuited")
+                raise CircuitOpenError(f"Circuit open for {endpoint}")
+            self._count("attempts")
+            resp, exc = None, None
+            try:
+                resp = send()
+            except requests.RequestException as e:
+                exc = e
+            except BaseException:
+                # Anything else propagates as is, but still counts against the
+                # breaker so a half-open probe cannot stay in flight forever.
+                if breaker is not None:
+                    breaker.record(False)
+                raise
+            failed = is_failure(resp, exc)
+            if breaker is not None:
+                breaker.record(not failed)
+            if not failed or not self.policy.retryable(method, resp, exc, idempotent):
+                break
+            if attempt + 1 >= attempts:
+                self._count("exhausted")
+                break
+            if not self.budget.withdraw():
+                self._count("budget_exhausted")
+                break
+            self._count("retries")
+            if resp is not None:
+                # A streamed body is never read, so give its connection back now.
+                resp.close()
+            self._sleep(self.policy.delay(attempt, resp))
+            attempt += 1
+        if exc is not None:
+            raise exc
+        return resp
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            breakers = dict(self.breakers)
+        stats["breakers"] = {
+            endpoint: {"state": b.state, "opened": b.opened, "failure_rate": round(b.failure_rate(), 4)}
+            for endpoint, b in sorted(breakers.items())
+        }
+        return stats
@@ -0,0 +1,221 @@
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from utils.config import KEEPALIVE_EXPIRY, POOL_SIZE, TCP_NODELAY, TRANSPORT
+
+TRANSPORTS = ("requests", "httpx", "http2")
+
+_local = threading.local()
+
+
+class RequestTrace:
+    __slots__ = ("phases", "reused", "request_started", "connection_before", "headers_at")
+
+    def __init__(self):
+        self.phases = {}
+        self.reused = True
+        self.request_started = None
+        self.connection_before = 0.0
+        self.headers_at = None
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds * 1000.0
+
+    def connection_ms(self):
+        p = self.phases
+        return p.get("dns", 0.0) + p.get("connect", 0.0) + p.get("tls", 0.0)
+
+
+def start_trace():
+    trace = _local.trace = RequestTrace()
+    return trace
+
+
+def end_trace():
+    _local.trace = None
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+class TimedConnectionMixin:
+    def _new_conn(self):
+        trace = current_trace()
+        if trace is None:
+            return super()._new_conn()
+        trace.reused = False
+        host = self._dns_host
+        t0 = time.perf_counter()
+        try:
+            addr = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4]
+        except OSError:
+            return super()._new_conn()
+        t1 = time.perf_counter()
+        trace.add("dns", t1 - t0)
+        # Connect to the address we just resolved so DNS is not paid twice;
+        # TLS still verifies against self.host.
+        self._dns_host = addr[0]
+        try:
+            conn = super()._new_conn()
+        finally:
+            self._dns_host = host
+        trace.add("connect", time.perf_counter() - t1)
+        return conn
+
+    def request(self, *args, **kwargs):
+        trace = current_trace()
+        if trace is not None:
+            trace.request_started = time.perf_counter()
+            trace.connection_before = trace.connection_ms()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        resp = super().getresponse(*args, **kwargs)
+        trace = current_trace()
+        if trace is not None and trace.request_started is not None:
+            trace.headers_at = time.perf_counter()
+            connecting = trace.connection_ms() - trace.connection_before
+            trace.add("ttfb", trace.headers_at - trace.request_started - connecting / 1000.0)
+        return resp
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        trace = current_trace()
+        if trace is None:
+            return super().connect()
+        t0 = time.perf_counter()
+        before = trace.phases.get("dns", 0.0) + trace.phases.get("connect", 0.0)
+        super().connect()
+        socket_ms = trace.phases.get("dns", 0.0) + trace.phases.get("connect", 0.0) - before
+        trace.add("tls", time.perf_counter() - t0 - socket_ms / 1000.0)
+
+
+class KeepAliveMixin:
+    # 0 keeps idle connections forever (urllib3's behaviour); otherwise a
+    # connection idle for longer is closed and reopened instead of reused,
+    # before a server or load balancer can drop it mid-request.
+    keepalive_expiry = 0
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        if self.keepalive_expiry and conn.sock is not None and \
+                time.monotonic() - getattr(conn, "_idle_since", 0.0) > self.keepalive_expiry:
+            conn.close()
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+
+class TimedHTTPConnectionPool(KeepAliveMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(KeepAliveMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def socket_options(tcp_nodelay=TCP_NODELAY):
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if tcp_nodelay:
+        options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+    return options
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    __attrs__ = HTTPAdapter.__attrs__ + ["keepalive_expiry", "socket_options"]
+
+    def __init__(self, pool_size=POOL_SIZE, keepalive_expiry=KEEPALIVE_EXPIRY, tcp_nodelay=TCP_NODELAY, **kwargs):
+        self.keepalive_expiry = keepalive_expiry
+        self.socket_options = socket_options(tcp_nodelay)
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+        expiry = {"keepalive_expiry": self.keepalive_expiry}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("TimedHTTPConnectionPool", (TimedHTTPConnectionPool,), expiry),
+            "https": type("TimedHTTPSConnectionPool", (TimedHTTPSConnectionPool,), expiry),
+        }
+
+
+class HttpxSession:
+    """requests.Session-shaped wrapper over an httpx client.
+
+    ``http2=True`` multiplexes requests over one connection per host where the
+    server negotiates h2 via TLS ALPN; plain-http servers stay on HTTP/1.1.
+    Per-phase instrumentation is only available on the requests transport.
+    """
+
+    def __init__(self, pool_size=POOL_SIZE, keepalive_expiry=KEEPALIVE_EXPIRY, tcp_nodelay=TCP_NODELAY,
+                 http2=False):
+        try:
+            import httpx
+        except ImportError as exc:
+            raise RuntimeError('The httpx transports need "pip install httpx[http2]"') from exc
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                              keepalive_expiry=keepalive_expiry or None)
+        transport = httpx.HTTPTransport(http2=http2, limits=limits, socket_options=socket_options(tcp_nodelay))
+        self.client = httpx.Client(transport=transport, timeout=None)
+        self._httpx = httpx
+
+    def request(self, method, url, data=None, json=None, headers=None, cookies=None, **kwargs):
+        if cookies:
+            headers = dict(headers or {})
+            jar = "; ".join(f"{k}={v}" for k, v in cookies.items())
+            headers["Cookie"] = f"{headers['Cookie']}; {jar}" if headers.get("Cookie") else jar
+        if isinstance(data, (bytes, bytearray, str)):
+            kwargs["content"] = data
+        elif data is not None:
+            kwargs["data"] = data
+        httpx = self._httpx
+        stream = kwargs.pop("stream", False)
+        try:
+            if not stream:
+                return self.client.request(method, url, json=json, headers=headers, **kwargs)
+            request = self.client.build_request(method, url, json=json, headers=headers, **kwargs)
+            resp = self.client.send(request, stream=True)
+            # Same name requests uses for reading a streamed body in chunks.
+            resp.iter_content = lambda chunk_size=None: resp.iter_bytes(chunk_size)
+            return resp
+        except httpx.ConnectTimeout as exc:
+            raise requests.ConnectTimeout(str(exc)) from exc
+        except httpx.ConnectError as exc:
+            # Same shape requests uses, so callers can tell the request never left.
+            raise requests.ConnectionError(MaxRetryError(None, url, NewConnectionError(None, str(exc)))) from exc
+        except httpx.TimeoutException as exc:
+            raise requests.ReadTimeout(str(exc)) from exc
+        except httpx.TransportError as exc:
+            raise requests.ConnectionError(str(exc)) from exc
+
+    def close(self):
+        self.client.close()
+
+
+def build_session(kind=TRANSPORT, pool_size=POOL_SIZE, keepalive_expiry=KEEPALIVE_EXPIRY,
+                  tcp_nodelay=TCP_NODELAY):
+    if kind == "requests":
+        session = requests.Session()
+        adapter = InstrumentedAdapter(pool_size, keepalive_expiry, tcp_nodelay)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    if kind in ("httpx", "http2"):
+        return HttpxSession(pool_size, keepalive_expiry, tcp_nodelay, http2=kind == "http2")
+    raise ValueError(f"Unknown transport: {kind!r} (expected one of {', '.join(TRANSPORTS)})")
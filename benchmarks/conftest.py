@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from api.auth import TokenProvider
+from api.client import APIClient
+from server import LocalBookerServer
+
+
+@pytest.fixture(scope="session")
+def bench_server():
+    # End-to-end benchmarks always run against the in-process stand-in so the
+    # numbers measure this code, not a shared remote host.
+    with LocalBookerServer() as srv:
+        yield srv
+
+
+@pytest.fixture(scope="session")
+def bench_client(bench_server):
+    client = APIClient(base_url=bench_server.url)
+    yield client
+    client.session.close()
+
+
+@pytest.fixture(scope="session")
+def bench_tokens(bench_client):
+    def fetch(username, password):
+        resp = bench_client.request("POST", "/auth", json={"username": username, "password": password})
+        return resp.json().get("token")
+
+    return TokenProvider("admin", "password123", fetch=fetch)
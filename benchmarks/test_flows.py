@@ -0,0 +1,32 @@
+import pytest
+
+from utils.payloads import BookingGenerator
+
+SUCCESS_STATUS = {200, 201, 204}
+
+
+@pytest.mark.benchmark(group="e2e")
+def test_ping(benchmark, bench_client):
+    assert benchmark(bench_client.request, "GET", "/ping").status_code == 201
+
+
+@pytest.mark.benchmark(group="e2e")
+def test_get_booking(benchmark, bench_client):
+    bid = bench_client.request("POST", "/booking", json=next(BookingGenerator(3).payloads(1))).json()["bookingid"]
+    assert benchmark(bench_client.request, "GET", f"/booking/{bid}").status_code == 200
+
+
+@pytest.mark.benchmark(group="e2e")
+def test_create_get_delete_flow(benchmark, bench_client, bench_tokens):
+    next_payload = BookingGenerator(11).stream(serialized=True)
+
+    def flow():
+        created = bench_client.request("POST", "/booking", data=next_payload())
+        assert created.status_code in SUCCESS_STATUS
+        bid = created.json()["bookingid"]
+        assert bench_client.request("GET", f"/booking/{bid}").status_code == 200
+        deleted = bench_tokens.call(
+            lambda tok: bench_client.request("DELETE", f"/booking/{bid}", cookies={"token": tok}))
+        assert deleted.status_code in SUCCESS_STATUS
+
+    benchmark(flow)
@@ -0,0 +1,79 @@
+import pytest
+import requests
+
+from api.client import APIClient
+from api.codec import StdlibCodec, default_codec
+from tools.histogram import LatencyHistogram
+from utils.payloads import BookingGenerator, booking_payload
+from utils.validation import validate_many, validate_schema
+
+
+@pytest.mark.benchmark(group="request-building")
+def test_prepare_json_request(benchmark):
+    # Measures requests' PreparedRequest building, so the transport is pinned
+    # whatever RB_TRANSPORT says.
+    client = APIClient(base_url="http://127.0.0.1:1", transport="requests")
+    doc = booking_payload()
+
+    def build():
+        kwargs = client._encode_body({"json": doc})
+        return client.session.prepare_request(requests.Request("POST", f"{client.base_url}/booking", **kwargs))
+
+    assert benchmark(build).body
+
+
+@pytest.mark.benchmark(group="request-building")
+def test_prepare_bytes_request(benchmark):
+    client = APIClient(base_url="http://127.0.0.1:1", transport="requests")
+    body = next(BookingGenerator(1).json_payloads(1))
+
+    def build():
+        kwargs = client._encode_body({"data": body})
+        return client.session.prepare_request(requests.Request("POST", f"{client.base_url}/booking", **kwargs))
+
+    assert benchmark(build).body == body
+
+
+@pytest.mark.benchmark(group="json-codec")
+@pytest.mark.parametrize("codec", [StdlibCodec(), default_codec()], ids=lambda c: c.name)
+def test_codec_round_trip(benchmark, codec):
+    doc = booking_payload()
+    assert benchmark(lambda: codec.loads(codec.dumps(doc))) == doc
+
+
+@pytest.mark.benchmark(group="validation")
+def test_validate_booking(benchmark):
+    benchmark(validate_schema, booking_payload(), "booking_object")
+
+
+@pytest.mark.benchmark(group="validation")
+def test_validate_booking_uncompiled(benchmark):
+    # Reference for the cached validators: a validator built on every call.
+    from jsonschema import Draft7Validator
+    from utils.schemas import BOOKING_OBJECT_SCHEMA
+
+    doc = booking_payload()
+    assert benchmark(lambda: list(Draft7Validator(BOOKING_OBJECT_SCHEMA).iter_errors(doc))) == []
+
+
+@pytest.mark.benchmark(group="validation")
+def test_validate_bookings_list(benchmark):
+    items = [{"bookingid": i} for i in range(1000)]
+    assert benchmark(validate_many, items, "bookings_list_item") == 1000
+
+
+@pytest.mark.benchmark(group="payloads")
+def test_generate_payload_batch(benchmark):
+    generator = BookingGenerator(7)
+    assert len(benchmark(lambda: list(generator.json_payloads(1000)))) == 1000
+
+
+@pytest.mark.benchmark(group="payloads")
+def test_booking_payload(benchmark):
+    benchmark(booking_payload)
+
+
+@pytest.mark.benchmark(group="histogram")
+def test_histogram_record(benchmark):
+    hist = LatencyHistogram()
+    benchmark(hist.record, 12.5, True)
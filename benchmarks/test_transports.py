@@ -0,0 +1,54 @@
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.client import APIClient
+from tools.histogram import LatencyHistogram
+from utils.payloads import BookingGenerator
+
+THREADS = 32
+REQUESTS_PER_ROUND = 320
+
+TRANSPORTS = [
+    ("requests", 10),
+    ("requests", THREADS),
+    pytest.param("httpx", THREADS, marks=pytest.mark.skipif(not importlib.util.find_spec("httpx"),
+                                                            reason="httpx not installed")),
+    # The stand-in speaks plain HTTP/1.1, so this measures the h2-capable client
+    # stack falling back to HTTP/1.1; multiplexing needs an https server.
+    pytest.param("http2", THREADS, marks=pytest.mark.skipif(not importlib.util.find_spec("h2"),
+                                                            reason="h2 not installed")),
+]
+
+
+@pytest.mark.benchmark(group="transport")
+@pytest.mark.parametrize("kind,pool_size", TRANSPORTS, ids=lambda v: str(v))
+def test_transport_throughput(benchmark, bench_server, kind, pool_size):
+    from api.transport import build_session
+
+    client = APIClient(base_url=bench_server.url, transport=build_session(kind, pool_size=pool_size))
+    bid = client.request("POST", "/booking", json=next(BookingGenerator(5).payloads(1))).json()["bookingid"]
+    path = f"/booking/{bid}"
+    latencies = LatencyHistogram()
+
+    def one(_):
+        resp = client.request("GET", path)
+        latencies.record(resp.elapsed.total_seconds() * 1000, resp.status_code == 200)
+
+    executor = ThreadPoolExecutor(max_workers=THREADS)
+
+    def burst():
+        list(executor.map(one, range(REQUESTS_PER_ROUND)))
+
+    try:
+        benchmark.pedantic(burst, rounds=3, warmup_rounds=1)
+    finally:
+        executor.shutdown()
+        client.session.close()
+    summary = latencies.summary()
+    assert summary["errors"] == 0
+    benchmark.extra_info.update({
+        "throughput_rps": round(REQUESTS_PER_ROUND / benchmark.stats.stats.median, 1),
+        "p99_ms": summary["p99_ms"],
+    })
@@ -1,88 +1,169 @@
 import os
-import time
-import random
-from locust import HttpUser, task, between
+import json
+import requests
+from locust import HttpUser, LoadTestShape, events, task, between
+from locust.runners import MasterRunner, WorkerRunner
+
+from api.auth import AuthenticationError, TokenProvider
+from api.pool import BookingPool
+from api.resilience import Resilience, RetryPolicy
+from tools import metrics, scenario
+from tools.histogram import LoadStats
+from utils.config import LOCAL_SERVER
+from utils.payloads import BookingGenerator
 
 USERNAME = os.getenv("RB_USERNAME", "admin")
 PASSWORD = os.getenv("RB_PASSWORD", "password123")
+JSON_HEADERS = {"Content-Type": "application/json"}
+AUTH_ATTEMPTS = 5
+BOOKING_POOL = int(os.getenv("BOOKING_POOL", "0"))
+# locust_mix creates the booking it reads; with a pool the reads need no POST.
+SCENARIO = scenario.load(os.getenv("SCENARIO") or ("pooled_flow" if BOOKING_POOL > 0 else "locust_mix"))
+
+_local_server = None
+if LOCAL_SERVER:
+    from server import LocalBookerServer
+    _local_server = LocalBookerServer().start()
+
+# One cached token for every simulated user in this process; it is refreshed
+# ahead of expiry and on 401/403 instead of re-authenticating per user.
+_tokens = None
+_next_payload = BookingGenerator().stream(serialized=True)
+# Only token fetches are retried. Scenario requests are measured as they are,
+# so a struggling server shows up in the stats instead of being retried away.
+_auth_resilience = Resilience(policy=RetryPolicy(max_attempts=AUTH_ATTEMPTS))
+# BOOKING_POOL=<n>: bookings created once per locust process before the run.
+# GET /booking/{id} reads them round-robin and mutations lease one, so reads
+# do not each need a POST /booking of their own. They are not in the stats.
+_pool = None
+
+# Same histograms and exporter as tools/simple_load.py, so both drivers land on
+# one dashboard (RB_METRICS_PORT / RB_METRICS_JSONL).
+_live_stats = LoadStats()
+_exporter = None
+
+
+@events.test_start.add_listener
+def _start_exporter(environment, **kwargs):
+    global _exporter
+    # The master and every worker import this file, but requests only fire on
+    # workers (or a local runner), so the master exports nothing. Workers on one
+    # host would collide on RB_METRICS_PORT: worker N serves RB_METRICS_PORT + 1 + N.
+    # worker_index is only known once the master has acked the worker, hence
+    # test_start rather than init.
+    runner = environment.runner
+    if _exporter is not None or isinstance(runner, MasterRunner):
+        return
+    offset = runner.worker_index + 1 if isinstance(runner, WorkerRunner) else 0
+    _exporter = metrics.start_from_config(lambda: _live_stats, "locust", port_offset=offset)
+
+
+@events.request.add_listener
+def _record_request(name, response_time, exception=None, **kwargs):
+    if _exporter is not None:
+        _live_stats.record(name, response_time, ok=exception is None)
+
+
+@events.quitting.add_listener
+def _stop_exporter(**kwargs):
+    if _exporter is not None:
+        _exporter.stop()
+
+
+def _pool_create(host):
+    def create(payload):
+        try:
+            resp = requests.post(f"{host}/booking", data=payload, headers=JSON_HEADERS)
+            data = resp.json() if resp.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            return None
+        return (data["bookingid"], data["booking"]) if data else None
+
+    return create
+
+
+@events.test_start.add_listener
+def _fill_pool(environment, **kwargs):
+    global _pool
+    # Each worker process pools its own bookings; the master runs no users.
+    if BOOKING_POOL > 0 and _pool is None and not isinstance(environment.runner, MasterRunner):
+        host = environment.host or RestfulBookerUser.host
+        _pool = BookingPool(BOOKING_POOL, create=_pool_create(host),
+                            payloads=BookingGenerator().stream(serialized=True))
+        _pool.fill()
+
+
+@events.test_stop.add_listener
+def _drain_pool(environment, **kwargs):
+    global _pool
+    pool, _pool = _pool, None
+    if pool is None or _tokens is None:
+        return
+    host = environment.host or RestfulBookerUser.host
+    try:
+        token = _tokens.token()
+    except AuthenticationError:
+        return
+    for bookingid in pool.clear():
+        try:
+            requests.delete(f"{host}/booking/{bookingid}", cookies={"token": token})
+        except requests.RequestException:
+            pass
 
 
 class RestfulBookerUser(HttpUser):
-    wait_time = between(0.2, 1.0)
-    host = os.getenv("BASE_URL", "https://restful-booker.herokuapp.com")
-    token = None
+    wait_time = between(*SCENARIO.think_time)
+    host = _local_server.url if _local_server else os.getenv("BASE_URL", "https://restful-booker.herokuapp.com")
 
     def on_start(self):
-        self._authenticate_with_retry()
-        if self.token:
-            self.client.headers.update({"Cookie": f"token={self.token}"})
-
-    def _authenticate_with_retry(self, max_attempts=5, wait_seconds=1.0):
-        for _ in range(max_attempts):
-            resp = self.client.post(
-                "/auth",
-                json={"username": USERNAME, "password": PASSWORD},
-                name="POST /auth",
-            )
-            tok = None
-            if resp.status_code == 200:
-                try:
-                    tok = resp.json().get("token")
-                except Exception:
-                    tok = None
-            if tok:
-                self.token = tok
-                self.client.headers.update({"Cookie": f"token={self.token}"})
-                return
-            time.sleep(wait_seconds)
-
-    @task(1)
-    def ping(self):
-        self.client.get("/ping", name="GET /ping")
-
-    @task(1)
-    def refresh_auth(self):
-        self._authenticate_with_retry(max_attempts=1, wait_seconds=0.5)
-
-    @task(2)
-    def create_get_delete_booking(self):
-        if not self.token:
-            self._authenticate_with_retry()
-            if not self.token:
-                return
-
-        payload = {
-            "firstname": "John",
-            "lastname": "Doe",
-            "totalprice": random.randint(50, 500),
-            "depositpaid": True,
-            "bookingdates": {"checkin": "2026-02-01", "checkout": "2026-02-03"},
-            "additionalneeds": "Breakfast",
-        }
-
-        bid = None
-        resp = self.client.post("/booking", json=payload, name="POST /booking")
-        if resp.status_code in (200, 201):
+        global _tokens
+        if _tokens is None:
+            _tokens = TokenProvider(USERNAME, PASSWORD, fetch=self._authenticate)
+        self.scenario_user = scenario.ScenarioUser(SCENARIO, self._send, _next_payload, _tokens, pool=_pool)
+
+    def _send(self, step, method, path, body=None, params=None, token=None, start=None):
+        kwargs = {"name": step.endpoint, "params": params}
+        if body is not None:
+            kwargs["data"] = body if isinstance(body, bytes) else json.dumps(body)
+            kwargs["headers"] = JSON_HEADERS
+        if token:
+            kwargs["cookies"] = {"token": token}
+        resp = self.client.request(method, path, **kwargs)
+        data = None
+        if step.op == "create_booking" and resp.status_code in (200, 201):
             try:
-                bid = resp.json().get("bookingid")
+                data = resp.json()
             except Exception:
-                bid = None
-        if not bid:
-            return
-
-        self.client.get(f"/booking/{bid}", name="GET /booking/{id}")
-
-        def try_delete():
-            del_resp = self.client.delete(f"/booking/{bid}", name="DELETE /booking/{id}")
-            if del_resp.status_code in (200, 201, 204):
-                return True
-            if del_resp.status_code in (401, 403):
-                return False
-            return True
-
-        ok = try_delete()
-        if not ok:
-            self._authenticate_with_retry(max_attempts=2, wait_seconds=0.5)
-            if self.token:
-                self.client.headers.update({"Cookie": f"token={self.token}"})
-            try_delete()
+                data = None
+        return resp.status_code, data
+
+    def _authenticate(self, username=USERNAME, password=PASSWORD):
+        def send():
+            resp = self.client.post("/auth", json={"username": username, "password": password}, name="POST /auth")
+            if resp.status_code == 0:
+                # Locust reports connection failures as status 0 instead of raising.
+                raise requests.ConnectionError(resp.error)
+            return resp
+
+        try:
+            resp = _auth_resilience.call("POST /auth", "POST", send, idempotent=True)
+        except requests.RequestException:
+            return None
+        if resp.status_code != 200:
+            return None
+        try:
+            return resp.json().get("token")
+        except Exception:
+            return None
+
+    @task
+    def run_scenario_task(self):
+        self.scenario_user.run_task()
+
+
+if SCENARIO.stages:
+    class ScenarioShape(LoadTestShape):
+        # Ramp stages from the scenario file replace --users/--spawn-rate.
+        def tick(self):
+            users = SCENARIO.users_at(self.get_run_time())
+            return (users, max(users, 1)) if users else None
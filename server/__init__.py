@@ -0,0 +1,4 @@
+from server.app import LocalBookerServer
+from server.store import BookingStore
+
+__all__ = ["LocalBookerServer", "BookingStore"]
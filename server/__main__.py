@@ -0,0 +1,23 @@
+import argparse
+
+from server.app import LocalBookerServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local Restful-Booker stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    args = parser.parse_args()
+
+    srv = LocalBookerServer(args.host, args.port)
+    print(f"Serving Restful-Booker stand-in on {srv.url}", flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+
+
+if __name__ == "__main__":
+    main()
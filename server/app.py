@@ -0,0 +1,203 @@
+import base64
+import hashlib
+import json
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from server.store import BookingStore
+
+USERNAME = "admin"
+PASSWORD = "password123"
+BASIC_AUTH = "Basic " + base64.b64encode(f"{USERNAME}:{PASSWORD}".encode()).decode()
+
+
+class BookerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "LocalBooker/1.0"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def parse_request(self):
+        # One handler instance serves every request on a keep-alive connection.
+        self._body = None
+        return super().parse_request()
+
+    def do_GET(self):
+        path, query = self._split()
+        if path == "/ping":
+            return self._send_text(201, "Created")
+        if path == "/booking":
+            filters = {k: v[0] for k, v in query.items()
+                       if k in ("firstname", "lastname", "checkin", "checkout")}
+            ids = self.server.store.ids(**filters)
+            return self._send_json(200, [{"bookingid": bid} for bid in ids])
+        bid = self._booking_id(path)
+        booking = self.server.store.get(bid) if bid is not None else None
+        if booking is None:
+            return self._send_text(404, "Not Found")
+        return self._send_json(200, booking)
+
+    def do_POST(self):
+        path, _ = self._split()
+        body = self._read_json()
+        if path == "/auth":
+            if isinstance(body, dict) and body.get("username") == USERNAME \
+                    and body.get("password") == PASSWORD:
+                token = secrets.token_hex(8)[:15]
+                self.server.tokens.add(token)
+                return self._send_json(200, {"token": token})
+            return self._send_json(200, {"reason": "Bad credentials"})
+        if path == "/booking":
+            if not BookingStore.is_valid(body):
+                return self._send_text(500, "Internal Server Error")
+            bid = self.server.store.create(body)
+            return self._send_json(200, {"bookingid": bid, "booking": body})
+        return self._send_text(404, "Not Found")
+
+    def do_PUT(self):
+        bid = self._authorized_booking_id()
+        if bid is None:
+            return
+        body = self._read_json()
+        if not BookingStore.is_valid(body):
+            return self._send_text(400, "Bad Request")
+        if self.server.store.replace(bid, body) is None:
+            return self._send_text(405, "Method Not Allowed")
+        return self._send_json(200, body)
+
+    def do_PATCH(self):
+        bid = self._authorized_booking_id()
+        if bid is None:
+            return
+        body = self._read_json()
+        if not isinstance(body, dict):
+            return self._send_text(400, "Bad Request")
+        try:
+            booking = self.server.store.patch(bid, body)
+        except ValueError:
+            return self._send_text(400, "Bad Request")
+        if booking is None:
+            return self._send_text(405, "Method Not Allowed")
+        return self._send_json(200, booking)
+
+    def do_DELETE(self):
+        bid = self._authorized_booking_id()
+        if bid is None:
+            return
+        if not self.server.store.delete(bid):
+            return self._send_text(405, "Method Not Allowed")
+        return self._send_text(201, "Created")
+
+    def _split(self):
+        parts = urlsplit(self.path)
+        return parts.path.rstrip("/") or "/", parse_qs(parts.query)
+
+    @staticmethod
+    def _booking_id(path):
+        prefix, _, raw = path.rpartition("/")
+        if prefix != "/booking" or not raw.isdigit():
+            return None
+        return int(raw)
+
+    def _authorized_booking_id(self):
+        self._read_body()
+        path, _ = self._split()
+        bid = self._booking_id(path)
+        if not self._is_authorized():
+            self._send_text(403, "Forbidden")
+            return None
+        if bid is None:
+            self._send_text(405, "Method Not Allowed")
+            return None
+        return bid
+
+    def _is_authorized(self):
+        if self.headers.get("Authorization") == BASIC_AUTH:
+            return True
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "token" and value in self.server.tokens:
+                return True
+        return False
+
+    def _read_body(self):
+        # Drain the body exactly once so keep-alive connections stay in sync even
+        # when a request is rejected before its payload is looked at.
+        if self._body is None:
+            length = int(self.headers.get("Content-Length") or 0)
+            self._body = self.rfile.read(length) if length else b""
+        return self._body
+
+    def _read_json(self):
+        raw = self._read_body()
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode(), "application/json; charset=utf-8")
+
+    def _send_text(self, status, text):
+        self._send(status, text.encode(), "text/plain; charset=utf-8")
+
+    def _send(self, status, body, content_type):
+        self._read_body()
+        etag = None
+        if self.command == "GET" and status == 200:
+            # Weak validator in the same shape Express (and so Restful-Booker) sends.
+            etag = f'W/"{len(body):x}-{hashlib.sha1(body).hexdigest()[:27]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class LocalBookerServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), BookerHandler)
+        self.store = BookingStore()
+        self.tokens = set()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,118 @@
+import bisect
+import itertools
+import threading
+
+REQUIRED_FIELDS = ("firstname", "lastname", "totalprice", "depositpaid", "bookingdates")
+
+
+class BookingStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._bookings = {}
+        self._by_firstname = {}
+        self._by_lastname = {}
+        # Sorted (date, id) pairs so date-range filters are a bisect, not a scan.
+        self._by_checkin = []
+        self._by_checkout = []
+
+    def __len__(self):
+        return len(self._bookings)
+
+    @staticmethod
+    def is_valid(booking):
+        if not isinstance(booking, dict) or any(f not in booking for f in REQUIRED_FIELDS):
+            return False
+        dates = booking["bookingdates"]
+        return isinstance(dates, dict) and "checkin" in dates and "checkout" in dates
+
+    def create(self, booking):
+        with self._lock:
+            bid = next(self._ids)
+            self._insert(bid, booking)
+        return bid
+
+    def get(self, bid):
+        return self._bookings.get(bid)
+
+    def replace(self, bid, booking):
+        with self._lock:
+            if bid not in self._bookings:
+                return None
+            self._remove(bid)
+            self._insert(bid, booking)
+        return booking
+
+    def patch(self, bid, fields):
+        with self._lock:
+            current = self._bookings.get(bid)
+            if current is None:
+                return None
+            merged = dict(current)
+            for key, value in fields.items():
+                if key == "bookingdates" and isinstance(value, dict):
+                    merged["bookingdates"] = {**current["bookingdates"], **value}
+                else:
+                    merged[key] = value
+            if not self.is_valid(merged):
+                raise ValueError("patched booking is missing required fields")
+            self._remove(bid)
+            self._insert(bid, merged)
+        return merged
+
+    def delete(self, bid):
+        with self._lock:
+            if bid not in self._bookings:
+                return False
+            self._remove(bid)
+        return True
+
+    def ids(self, firstname=None, lastname=None, checkin=None, checkout=None):
+        with self._lock:
+            candidates = None
+            if firstname is not None:
+                candidates = set(self._by_firstname.get(firstname, ()))
+            if lastname is not None:
+                found = self._by_lastname.get(lastname, set())
+                candidates = set(found) if candidates is None else candidates & found
+            if checkin is not None:
+                start = bisect.bisect_left(self._by_checkin, (checkin, 0))
+                found = {bid for _, bid in self._by_checkin[start:]}
+                candidates = found if candidates is None else candidates & found
+            if checkout is not None:
+                end = bisect.bisect_right(self._by_checkout, (checkout, float("inf")))
+                found = {bid for _, bid in self._by_checkout[:end]}
+                candidates = found if candidates is None else candidates & found
+            if candidates is None:
+                return list(self._bookings)
+            return sorted(candidates)
+
+    def _insert(self, bid, booking):
+        self._bookings[bid] = booking
+        self._by_firstname.setdefault(str(booking["firstname"]), set()).add(bid)
+        self._by_lastname.setdefault(str(booking["lastname"]), set()).add(bid)
+        dates = booking["bookingdates"]
+        bisect.insort(self._by_checkin, (str(dates["checkin"]), bid))
+        bisect.insort(self._by_checkout, (str(dates["checkout"]), bid))
+
+    def _remove(self, bid):
+        booking = self._bookings.pop(bid)
+        self._discard(self._by_firstname, str(booking["firstname"]), bid)
+        self._discard(self._by_lastname, str(booking["lastname"]), bid)
+        dates = booking["bookingdates"]
+        self._remove_sorted(self._by_checkin, (str(dates["checkin"]), bid))
+        self._remove_sorted(self._by_checkout, (str(dates["checkout"]), bid))
+
+    @staticmethod
+    def _discard(index, key, bid):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(bid)
+            if not ids:
+                del index[key]
+
+    @staticmethod
+    def _remove_sorted(entries, entry):
+        pos = bisect.bisect_left(entries, entry)
+        if pos < len(entries) and entries[pos] == entry:
+            del entries[pos]
@@ -1,3 +1,4 @@
+import sys
 import warnings
 
 warnings.filterwarnings(
@@ -6,10 +7,39 @@ warnings.filterwarnings(
     category=RuntimeWarning,
 )
 
-try:
-    import urllib3.util as _util
-    from urllib3.util.ssl_ import create_urllib3_context as _ctx
-    if not hasattr(_util, "create_urllib3_context"):
-        setattr(_util, "create_urllib3_context", _ctx)
-except Exception:
-    pass
+
+# Older tools expect urllib3.util.create_urllib3_context. This file runs in
+# every interpreter started from the repo, so the alias is added when
+# urllib3.util is first imported instead of importing urllib3 up front.
+def _patch_urllib3_util(module):
+    try:
+        from urllib3.util.ssl_ import create_urllib3_context
+        if not hasattr(module, "create_urllib3_context"):
+            module.create_urllib3_context = create_urllib3_context
+    except Exception:
+        pass
+
+
+class _Urllib3UtilHook:
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname != "urllib3.util":
+            return None
+        sys.meta_path.remove(self)
+        from importlib.util import find_spec
+        spec = find_spec(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def exec_and_patch(module):
+            exec_module(module)
+            _patch_urllib3_util(module)
+
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+
+if "urllib3.util" in sys.modules:
+    _patch_urllib3_util(sys.modules["urllib3.util"])
+else:
+    sys.meta_path.insert(0, _Urllib3UtilHook())
@@ -1,6 +1,91 @@
 import os
 import sys
+import uuid
+
+import pytest
+import requests
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
\ No newline at end of file
+    sys.path.insert(0, PROJECT_ROOT)
+
+from api.cleanup import BookingRegistry, cleanup_bookings
+from api.pool import BookingPool
+from server import LocalBookerServer
+from utils import config as rb_config
+from utils.payloads import booking_payload
+
+pytest_plugins = ["tools.latency_budget"]
+
+REQUEST_TIMEOUT = 10
+
+_session_server = None
+
+
+def pytest_configure(config):
+    global _session_server
+    # RB_LOCAL_SERVER=1 points the whole suite at an in-process stand-in. It has to
+    # start before collection so module-level clients pick up its URL.
+    if rb_config.LOCAL_SERVER and _session_server is None:
+        _session_server = LocalBookerServer().start()
+        rb_config.BASE_URL = _session_server.url
+        os.environ["BASE_URL"] = _session_server.url
+
+
+def pytest_unconfigure(config):
+    global _session_server
+    if _session_server is not None:
+        _session_server.stop()
+        _session_server = None
+
+
+@pytest.fixture(scope="session")
+def local_server():
+    if _session_server is not None:
+        yield _session_server
+        return
+    with LocalBookerServer() as srv:
+        yield srv
+
+
+@pytest.fixture(scope="session")
+def booking_namespace():
+    # Unique per xdist worker (or per plain run), used as the lastname of
+    # bookings the fixtures create so a worker can find all of its own data.
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    return f"rbf-{worker}-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope="session")
+def booking_registry(booking_namespace):
+    # Imported here rather than at the top so pytest_plugins loads the plugin
+    # module first and can rewrite its asserts.
+    from tools.latency_budget import untimed
+    registry = BookingRegistry(booking_namespace)
+    yield registry
+    with untimed():
+        cleanup_bookings(registry)
+
+
+@pytest.fixture(scope="session")
+def booking_pool(booking_registry):
+    # RB_BOOKING_POOL_SIZE bookings created once per worker. Read-only tests take
+    # them with next(); tests that change or delete one take a lease() instead.
+    from tools.latency_budget import untimed
+
+    def create(payload):
+        with untimed():
+            resp = requests.post(f"{rb_config.BASE_URL}/booking", json=payload, timeout=REQUEST_TIMEOUT)
+        if resp.status_code != 200:
+            return None
+        bookingid = resp.json()["bookingid"]
+        booking_registry.add(bookingid)
+        return bookingid, payload
+
+    pool = BookingPool(create=create,
+                       payloads=lambda: {**booking_payload(), "firstname": f"Pool-{uuid.uuid4().hex[:8]}",
+                                         "lastname": booking_registry.namespace})
+    pool.fill()
+    if not len(pool):
+        pytest.fail("Could not provision any pooled bookings")
+    return pool
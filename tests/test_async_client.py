@@ -0,0 +1,68 @@
+import asyncio
+
+from api.async_client import AsyncAPIClient
+from api import async_endpoints
+from utils.payloads import booking_payload
+from utils.validation import validate_schema
+
+SUCCESS_STATUS = {200, 201, 204}
+
+
+def test_async_ping():
+    async def run():
+        async with AsyncAPIClient() as client:
+            return await async_endpoints.ping(client)
+
+    resp = asyncio.run(run())
+    assert resp.status_code in SUCCESS_STATUS
+
+
+def test_async_booking_crud_flow():
+    async def run():
+        async with AsyncAPIClient(concurrency=4) as client:
+            token = (await async_endpoints.create_token(client, "admin", "password123")).json()["token"]
+            create = await async_endpoints.create_booking(client, booking_payload())
+            validate_schema(create.json(), "booking_create_response")
+            bid = create.json()["bookingid"]
+            get_resp = await async_endpoints.get_booking(client, bid)
+            delete = await async_endpoints.delete_booking(client, bid, token)
+            return get_resp, delete
+
+    get_resp, delete = asyncio.run(run())
+    assert get_resp.status_code == 200
+    validate_schema(get_resp.json(), "booking_object")
+    assert delete.status_code in SUCCESS_STATUS
+
+
+def test_async_concurrent_gets_are_bounded():
+    from aiohttp import web
+
+    in_flight = {"now": 0, "peak": 0, "total": 0}
+
+    async def ping(request):
+        in_flight["now"] += 1
+        in_flight["total"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.02)
+        in_flight["now"] -= 1
+        return web.Response(status=201, text="Created")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/ping", ping)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            # A connection pool larger than the limit, so only the client's own bound applies.
+            async with AsyncAPIClient(base_url=f"http://127.0.0.1:{port}", concurrency=3, pool_size=20) as client:
+                return await asyncio.gather(*(async_endpoints.ping(client, timeout=10) for _ in range(10)))
+        finally:
+            await runner.cleanup()
+
+    results = asyncio.run(run())
+    assert all(r.status_code in SUCCESS_STATUS for r in results)
+    assert in_flight["total"] == 10
+    assert 1 < in_flight["peak"] <= 3
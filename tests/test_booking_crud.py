@@ -1,14 +1,15 @@
 import pytest
 from api.endpoints import (
     create_booking, get_booking, get_bookings,
-    create_token, update_booking, delete_booking
+    update_booking, delete_booking
 )
+from api.auth import get_token_provider
 from utils.payloads import booking_payload, updated_booking_payload
 from utils.validation import validate_schema
 
 @pytest.fixture(scope="module")
 def token():
-    return create_token("admin", "password123").json()["token"]
+    return get_token_provider("admin", "password123").token()
 
 def test_booking_crud_flow(token):
     create = create_booking(booking_payload())
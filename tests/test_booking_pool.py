@@ -0,0 +1,168 @@
+import itertools
+import random
+import threading
+
+import pytest
+import requests
+
+from api.auth import TokenProvider
+from api.pool import BookingPool
+from tools import scenario, simple_load
+from tools.histogram import LoadStats
+from utils.payloads import BookingGenerator
+
+
+def _pool(size=3, mode="round_robin", fail=()):
+    ids = itertools.count(1)
+
+    def create(payload):
+        bookingid = next(ids)
+        return None if bookingid in fail else (bookingid, payload)
+
+    return BookingPool(size, create=create, payloads=lambda: {"firstname": "Pool"}, mode=mode,
+                       rng=random.Random(1))
+
+
+def test_readers_share_bookings_round_robin_or_at_random():
+    pool = _pool()
+    assert pool.fill() == 3 and pool.fill() == 0
+    assert [pool.next()[0] for _ in range(6)] == [1, 2, 3, 1, 2, 3]
+
+    pool = _pool(mode="random")
+    pool.fill()
+    assert {pool.next()[0] for _ in range(100)} == {1, 2, 3}
+    with pytest.raises(ValueError):
+        BookingPool(1, create=lambda p: None, payloads=dict, mode="fifo")
+
+
+def test_leased_bookings_are_hidden_until_released():
+    pool = _pool(size=2)
+    pool.fill()
+    with pool.lease() as lease:
+        assert {pool.next()[0] for _ in range(4)} == {3 - lease.id}
+        assert pool.acquire()[0] == 3 - lease.id
+        assert pool.next() is None and pool.acquire() is None
+        lease.booking = {"firstname": "Updated"}
+    assert pool.next(timeout=0.1) is not None
+    assert dict(pool.next() for _ in range(2)) == {lease.id: {"firstname": "Updated"}}
+
+
+def test_deleted_leases_are_replaced():
+    pool = _pool(size=2, fail={4})
+    pool.fill()
+    with pool.lease() as lease:
+        lease.deleted = True
+    assert lease.id not in pool and sorted(pool.ids()) == [2, 3]
+    with pool.lease() as lease:
+        lease.deleted = True
+    # The replacement failed, so the pool shrinks instead of blocking.
+    assert len(pool) == 1
+    assert pool.stats == {"created": 2, "replaced": 1, "create_failed": 1, "reads": 0, "leases": 2}
+    assert pool.clear() == [3 if lease.id == 2 else 2] and len(pool) == 0
+
+
+def test_waiting_for_a_lease_and_concurrent_use():
+    pool = _pool(size=4)
+    pool.fill()
+    held = [pool.acquire() for _ in range(4)]
+    threading.Timer(0.05, pool.release, args=(held[0],)).start()
+    assert pool.acquire(timeout=5) == held[0]
+    for entry in held:
+        pool.release(entry)
+
+    leased, errors = set(), []
+    lock = threading.Lock()
+
+    def writer():
+        for _ in range(200):
+            with pool.lease(timeout=5) as lease:
+                with lock:
+                    if lease.id in leased:
+                        errors.append(lease.id)
+                    leased.add(lease.id)
+                with lock:
+                    leased.discard(lease.id)
+
+    threads = [threading.Thread(target=writer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == [] and len(pool) == 4
+
+
+def test_fixture_pool_serves_namespaced_bookings(booking_pool, booking_registry):
+    bookingid, booking = booking_pool.next()
+    assert booking["lastname"] == booking_registry.namespace
+    assert bookingid in booking_registry.ids()
+
+
+@pytest.fixture
+def pooled_user(local_server, monkeypatch):
+    monkeypatch.setattr(simple_load, "BASE_URL", local_server.url)
+    monkeypatch.setattr(simple_load, "BOOKING_POOL", 3)
+    pool = simple_load.booking_pool(seed=1)
+    stats = LoadStats()
+
+    def make(spec, session=None):
+        monkeypatch.setattr(simple_load, "SCENARIO", scenario.Scenario(spec))
+        return simple_load.scenario_user(session or requests.Session(), stats, TokenProvider("admin", "password123"),
+                                         BookingGenerator(5).stream(serialized=True), pool)
+
+    yield make, pool, stats
+    simple_load.drain_pool(pool, TokenProvider("admin", "password123"))
+
+
+def test_scenario_reads_and_mutations_use_the_pool(pooled_user, local_server):
+    make, pool, stats = pooled_user
+    user = make({"tasks": [{"name": "read", "steps": ["get_booking", "get_booking", "get_booking"]}]})
+    user.run_task()
+    user.run_task()
+    assert "create" not in stats.summary() and stats.summary()["get"]["errors"] == 0
+    # Steps in a task share the booking they read, like one they created.
+    assert pool.stats["reads"] == 2 and user.known == []
+
+    user = make({"tasks": [{"name": "churn", "steps": [
+        "get_booking", "update_booking", {"op": "patch_booking", "fields": ["firstname"]}, "delete_booking"]}]})
+    original = set(pool.ids())
+    user.run_task()
+    summary = stats.summary()
+    for op in ("update", "patch", "delete"):
+        assert summary[op]["count"] == 1 and summary[op]["errors"] == 0, op
+    assert "create" not in summary
+    assert pool.stats["leases"] == 3 and pool.stats["replaced"] == 1
+    assert len(pool) == 3 and len(original - set(pool.ids())) == 1
+    for bookingid, booking in (pool.next() for _ in range(3)):
+        assert local_server.store.get(bookingid)["firstname"] == booking["firstname"]
+
+    ids = pool.ids()
+    simple_load.drain_pool(pool, TokenProvider("admin", "password123"))
+    assert all(local_server.store.get(bookingid) is None for bookingid in ids)
+
+
+class _RecordingSession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def request(self, method, url, *args, **kwargs):
+        self.sent.append(method)
+        return super().request(method, url, *args, **kwargs)
+
+
+def test_pooled_flow_reads_without_a_post_per_read(pooled_user, monkeypatch):
+    make, pool, stats = pooled_user
+    assert simple_load.default_scenario() == "pooled_flow"
+    monkeypatch.setattr(simple_load, "BOOKING_POOL", 0)
+    assert simple_load.default_scenario() == "booking_flow"
+
+    session = _RecordingSession()
+    user = make(scenario.load("pooled_flow").spec, session)
+    for _ in range(50):
+        user.run_task()
+    summary = stats.summary()
+    assert summary["get"]["count"] > 30 and summary["get"]["errors"] == 0
+    assert summary["update"]["count"] == summary["delete"]["count"] > 0
+    # The only creates were the pool replacing deleted bookings, outside the session.
+    assert "POST" not in session.sent and "create" not in summary
+    assert pool.stats["replaced"] == summary["delete"]["count"] and len(pool) == 3
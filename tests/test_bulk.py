@@ -0,0 +1,71 @@
+import requests
+
+from api import endpoints
+from api.resilience import Resilience
+from api.auth import get_token_provider
+from utils.payloads import booking_payload
+
+SUCCESS_STATUS = {200, 201, 204}
+
+
+def test_bulk_create_get_delete_roundtrip():
+    payloads = [{**booking_payload(), "totalprice": i} for i in range(50)]
+    created = {}
+    for result in endpoints.bulk_create_bookings(payloads, concurrency=8):
+        assert result.error is None
+        assert result.response.status_code in SUCCESS_STATUS
+        created[result.response.json()["bookingid"]] = result.index
+    assert sorted(created.values()) == list(range(50))
+
+    for result in endpoints.bulk_get_bookings(created, concurrency=8):
+        assert result.response.status_code == 200
+        assert result.response.json()["totalprice"] == created[result.item]
+
+    token = get_token_provider("admin", "password123").token()
+    deleted = list(endpoints.bulk_delete_bookings(created, token, concurrency=8))
+    assert len(deleted) == 50
+    assert all(r.response.status_code in SUCCESS_STATUS for r in deleted)
+
+
+def _response(status):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = b"{}"
+    resp._content_consumed = True
+    return resp
+
+
+def test_bulk_retries_transient_failures(monkeypatch):
+    attempts = {}
+
+    def flaky_request(method, url, **kwargs):
+        booking_id = int(url.rsplit("/", 1)[1])
+        attempts[booking_id] = attempts.get(booking_id, 0) + 1
+        if booking_id == 2 and attempts[booking_id] == 1:
+            raise requests.ConnectionError("reset")
+        if booking_id == 3 and attempts[booking_id] < 3:
+            return _response(503)
+        return _response(200)
+
+    monkeypatch.setattr(endpoints.client, "resilience", Resilience(sleep=lambda s: None))
+    monkeypatch.setattr(endpoints.client, "cache", None)
+    monkeypatch.setattr(endpoints.client.session, "request", flaky_request)
+    results = {r.item: r for r in endpoints.bulk_get_bookings(range(1, 6), concurrency=2)}
+    assert all(r.response.status_code == 200 and r.error is None for r in results.values())
+    assert attempts == {1: 1, 2: 2, 3: 3, 4: 1, 5: 1}
+
+
+def test_bulk_reports_exhausted_retries(monkeypatch):
+    calls = []
+
+    def down(method, url, **kwargs):
+        calls.append(url)
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(endpoints.client, "resilience", Resilience(sleep=lambda s: None))
+    monkeypatch.setattr(endpoints.client, "cache", None)
+    monkeypatch.setattr(endpoints.client.session, "request", down)
+    [result] = list(endpoints.bulk_get_bookings([7], retries=1))
+    assert result.response is None
+    assert isinstance(result.error, requests.ConnectionError)
+    assert len(calls) == 2
@@ -0,0 +1,67 @@
+import csv
+
+from tools import capacity, simple_load
+from tools.histogram import LoadStats
+
+
+def _fake_measure(limit, seen):
+    def measure_rate(rate):
+        seen.append(rate)
+        return {"offered_rps": rate, "passed": rate <= limit}
+    return measure_rate
+
+
+def test_binary_search_doubles_then_bisects():
+    seen = []
+    rows = capacity.binary_search(_fake_measure(57, seen), 10, 200, tolerance=0.05)
+    assert seen[:4] == [10, 20, 40, 80]
+    assert all(40 < rate < 80 for rate in seen[4:])
+    result = capacity.report(rows, capacity.DEFAULT_SLO, {})
+    assert 57 * 0.95 <= result["capacity_rps"] <= 57
+    assert [row["offered_rps"] for row in result["levels"]] == sorted(seen)
+
+
+def test_binary_search_edges():
+    seen = []
+    assert capacity.binary_search(_fake_measure(5, seen), 10, 200) == [{"offered_rps": 10, "passed": False}]
+    seen = []
+    capacity.binary_search(_fake_measure(1000, seen), 10, 50)
+    assert seen == [10, 20, 40, 50]
+
+
+def test_step_search_stops_at_first_failure():
+    seen = []
+    rows = capacity.step_search(_fake_measure(35, seen), 10, 10, 100)
+    assert seen == [10, 20, 30, 40]
+    assert capacity.report(rows, capacity.DEFAULT_SLO, {})["capacity_rps"] == 30
+
+
+def test_evaluate_checks_every_slo_part():
+    slo = capacity.Slo(p99_ms=50, error_rate=0.01, sustain_ratio=0.9)
+    stats = LoadStats()
+    for _ in range(99):
+        stats.record("get", 10)
+        stats.record("flow", 20)
+    stats.record("get", 10)
+    assert capacity.evaluate(10, stats, elapsed=9.9, slo=slo)["passed"]
+
+    for _ in range(3):
+        stats.record("get", 500, ok=False)
+    row = capacity.evaluate(20, stats, elapsed=9.9, slo=slo)
+    assert not row["passed"]
+    assert "p99" in row["reason"] and "error rate" in row["reason"] and "achieved" in row["reason"]
+    assert capacity.evaluate(10, LoadStats(), elapsed=1, slo=slo)["reason"] == "no requests completed"
+
+
+def test_measure_runs_a_level_against_the_local_server(local_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(simple_load, "BASE_URL", local_server.url)
+    row = capacity.measure(20, warmup=0.2, window=0.5, workers=4, slo=capacity.Slo(5000, 0.01, 0.5))
+    assert row["passed"], row["reason"]
+    assert row["requests"] > 0 and row["error_rate"] == 0
+    assert row["p50_ms"] <= row["p99_ms"] <= row["flow_p99_ms"]
+
+    path = tmp_path / "curve.csv"
+    capacity.write_csv([row], path)
+    with open(path, newline="") as fh:
+        written = list(csv.DictReader(fh))
+    assert written[0]["offered_rps"] == "20" and written[0]["passed"] == "True"
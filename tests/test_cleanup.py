@@ -0,0 +1,21 @@
+import requests
+
+from api.cleanup import BookingRegistry, cleanup_bookings
+from utils import config
+from utils.payloads import booking_payload
+
+REQUEST_TIMEOUT = 10
+
+
+def test_cleanup_deletes_registered_and_namespaced_bookings(booking_namespace):
+    registry = BookingRegistry(f"{booking_namespace}-cleanup")
+    url = f"{config.BASE_URL}/booking"
+    tagged = [requests.post(url, json={**booking_payload(), "lastname": registry.namespace},
+                            timeout=REQUEST_TIMEOUT).json()["bookingid"] for _ in range(3)]
+    registered = requests.post(url, json=booking_payload(), timeout=REQUEST_TIMEOUT).json()["bookingid"]
+    registry.add(registered)
+
+    cleanup_bookings(registry)
+
+    for bid in tagged + [registered]:
+        assert requests.get(f"{url}/{bid}", timeout=REQUEST_TIMEOUT).status_code == 404
@@ -0,0 +1,32 @@
+import json
+
+from api.client import APIClient
+from api.codec import StdlibCodec, default_codec, orjson
+from utils.payloads import BookingGenerator, booking_payload
+
+
+def test_codecs_round_trip():
+    payload = booking_payload()
+    for codec in (StdlibCodec(), default_codec()):
+        encoded = codec.dumps(payload)
+        assert isinstance(encoded, bytes)
+        assert codec.loads(encoded) == payload
+    assert default_codec().name == ("orjson" if orjson is not None else "json")
+
+
+def test_decoded_body_is_cached(local_server):
+    client = APIClient(base_url=local_server.url)
+    resp = client.request("POST", "/booking", json=booking_payload())
+    first = resp.json()
+    assert resp.json() is first
+    assert first["booking"] == booking_payload()
+
+
+def test_preserialized_bytes_are_sent_verbatim(local_server):
+    client = APIClient(base_url=local_server.url, codec=StdlibCodec(), transport="requests")
+    body = next(BookingGenerator(seed=9).json_payloads(1))
+    resp = client.request("POST", "/booking", data=body)
+    assert resp.status_code == 200
+    assert resp.json()["booking"] == json.loads(body)
+    assert resp.request.body == body
+    assert resp.request.headers["Content-Type"] == "application/json"
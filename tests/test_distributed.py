@@ -0,0 +1,66 @@
+import socket
+import threading
+
+from tools import distributed, scenario, simple_load
+
+
+def _run(local_server, monkeypatch, agents=2, **settings):
+    monkeypatch.setattr(simple_load, "BASE_URL", local_server.url)
+    monkeypatch.setattr(simple_load, "REPORT_INTERVAL", 0)
+    for name, value in settings.items():
+        monkeypatch.setattr(simple_load, name, value)
+    controller = distributed.Controller(agents, port=0, lead=0.2)
+    procs = distributed.spawn_local_agents(agents, *controller.address)
+    try:
+        controller.accept(timeout=30)
+        assert sorted(controller.names) == [f"local-{i}" for i in range(agents)]
+        return controller.run()
+    finally:
+        controller.close()
+        for proc in procs:
+            assert proc.wait(timeout=30) == 0
+
+
+def test_local_agents_merge_into_one_report(local_server, monkeypatch):
+    stats, extra, elapsed = _run(local_server, monkeypatch, DURATION=1, USERS=1)
+    assert extra == {"agents": 2}
+    assert elapsed == 1
+    summary = stats.summary(elapsed)
+    assert summary["create"]["count"] > 0 and summary["create"]["errors"] == 0
+    assert summary["get"]["count"] == summary["delete"]["count"]
+
+
+def test_open_loop_rate_is_split_between_agents(local_server, monkeypatch):
+    stats, extra, _ = _run(local_server, monkeypatch, agents=3, MODE="open", RATE=30, DURATION=1, USERS=4)
+    assert extra["agents"] == 3
+    assert extra["open_loop"]["scheduled"] == 30
+    assert extra["open_loop"]["completed"] == 30
+    assert stats.summary()["flow"]["count"] == 30
+
+
+def test_agents_fill_their_pools_before_the_start(local_server, monkeypatch):
+    monkeypatch.setattr(simple_load, "SCENARIO", scenario.load("pooled_flow"))
+    before = len(local_server.store)
+    stats, extra, _ = _run(local_server, monkeypatch, DURATION=1, USERS=1, BOOKING_POOL=5)
+    assert extra == {"agents": 2}
+    summary = stats.summary()
+    assert summary["get"]["count"] > 0 and summary["get"]["errors"] == 0
+    assert summary["create"]["count"] == 0
+    # Each agent deletes what is left of its pool after the run.
+    assert len(local_server.store) == before
+
+
+def test_clock_offset_is_measured_from_the_fastest_round_trip():
+    controller_side, agent_side = socket.socketpair()
+    agent = distributed.Connection(agent_side)
+
+    def skewed_agent():
+        for _ in range(distributed.SYNC_ROUNDS):
+            agent.receive()
+            agent.send({"type": "sync", "now": distributed.time.time() + 120.0})
+
+    thread = threading.Thread(target=skewed_agent)
+    thread.start()
+    offset = distributed.measure_offset(distributed.Connection(controller_side))
+    thread.join()
+    assert abs(offset - 120.0) < 0.05
@@ -0,0 +1,54 @@
+import random
+import threading
+
+from tools.histogram import LatencyHistogram, LoadStats, bucket_bounds, bucket_index, BUCKET_COUNT
+
+
+def test_buckets_are_contiguous_and_bounded():
+    for value in (0, 1, 127, 128, 255, 256, 10_000, 2_500_000):
+        low, high = bucket_bounds(bucket_index(value))
+        assert low <= value < high
+        assert (high - low) / max(low, 1) <= 1 / 64 or high - low == 1
+    assert bucket_index(10 ** 12) == BUCKET_COUNT - 1
+
+
+def test_percentiles_within_relative_error():
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(3, 1) for _ in range(20000)]
+    hist = LatencyHistogram()
+    for s in samples:
+        hist.record(s)
+    ordered = sorted(samples)
+    for pct in (50, 90, 99, 99.9):
+        exact = ordered[int(len(ordered) * pct / 100) - 1]
+        assert abs(hist.percentile(pct) - exact) / exact < 0.02
+    summary = hist.summary(elapsed_s=2.0)
+    assert summary["count"] == 20000
+    assert summary["throughput_rps"] == 10000
+    assert summary["min_ms"] <= summary["p50_ms"] <= summary["p99_9_ms"] <= summary["max_ms"]
+
+
+def test_merge_and_serialization_preserve_counts():
+    a, b = LoadStats(["get"]), LoadStats(["get", "delete"])
+    a.record("get", 1.5)
+    b.record("get", 3.0, ok=False)
+    b.record("delete", 7.0)
+    merged = LoadStats.from_dict(a.to_dict()).merge(LoadStats.from_dict(b.to_dict()))
+    assert merged.histograms["get"].count == 2
+    assert merged.histograms["get"].errors == 1
+    assert merged.histograms["delete"].max_us == 7000
+
+
+def test_concurrent_recording_is_thread_safe():
+    stats = LoadStats(["ping"])
+
+    def record():
+        for _ in range(5000):
+            stats.record("ping", 2.0)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert stats.histograms["ping"].count == 40000
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.config import IMPORT_BUDGET_MS
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LIGHT_MODULES = ("api.endpoints", "api.auth", "utils.validation", "utils.payloads", "utils.schemas",
+                 "utils.timing")
+HEAVY_MODULES = ("requests", "urllib3", "jsonschema", "fastjsonschema", "aiohttp", "numpy", "orjson")
+
+
+def _python(code, *flags):
+    env = {**os.environ, "PYTHONPATH": PROJECT_ROOT}
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=PROJECT_ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def _loaded_heavy(code):
+    out = _python(f"{code}; import sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def import_time_ms(modules):
+    """Cumulative ``-X importtime`` cost of importing ``modules`` after startup."""
+    def top_level(stderr):
+        times = {}
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if not name.startswith("  ") and cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+        return times
+
+    startup = top_level(_python("pass", "-X", "importtime").stderr)
+    times = top_level(_python(f"import {', '.join(modules)}", "-X", "importtime").stderr)
+    return sum(us for name, us in times.items() if name not in startup) / 1000
+
+
+def test_light_modules_do_not_import_heavy_dependencies():
+    assert _loaded_heavy(f"import {', '.join(LIGHT_MODULES)}") == []
+
+
+def test_startup_does_not_import_urllib3():
+    # sitecustomize runs in every interpreter started from the repo.
+    assert _loaded_heavy("pass") == []
+    out = _python("import urllib3.util; print(hasattr(urllib3.util, 'create_urllib3_context'))")
+    assert out.stdout.strip() == "True"
+
+
+def test_client_is_built_on_first_use():
+    assert _loaded_heavy("from api import endpoints; assert 'client' not in vars(endpoints)") == []
+    assert "requests" in _loaded_heavy("from api import endpoints; endpoints.client")
+
+
+def test_validation_loads_jsonschema_only_to_explain_failures():
+    pytest.importorskip("fastjsonschema")
+    ok = "from utils.validation import validate_schema; validate_schema({'token': 'x'}, 'auth_token_response')"
+    assert "jsonschema" not in _loaded_heavy(ok)
+
+
+def test_import_time_budget():
+    # Best of three keeps a busy machine from failing the budget on one slow run.
+    elapsed = min(import_time_ms(LIGHT_MODULES) for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS, f"importing {LIGHT_MODULES} took {elapsed:.1f} ms (budget {IMPORT_BUDGET_MS} ms)"
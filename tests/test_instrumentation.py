@@ -0,0 +1,61 @@
+from api.client import APIClient, endpoint_name
+from utils.payloads import booking_payload
+from utils.timing import PhaseRecorder
+from utils.validation import validate_schema
+
+
+def test_endpoint_name_templates_ids():
+    assert endpoint_name("get", "/booking/42?x=1") == "GET /booking/{id}"
+    assert endpoint_name("GET", "/booking") == "GET /booking"
+
+
+def test_phases_are_reported_per_endpoint(local_server):
+    client = APIClient(base_url=local_server.url, transport="requests")
+    recorder = client.add_hook(PhaseRecorder())
+    try:
+        for _ in range(3):
+            resp = client.request("POST", "/booking", json=booking_payload())
+            validate_schema(resp.json(), "booking_create_response")
+        client.request("GET", f"/booking/{resp.json()['bookingid']}", name="get_booking")
+    finally:
+        client.remove_hook(recorder)
+
+    summary = recorder.summary()
+    create = summary["POST /booking"]
+    for phase in ("dns", "connect", "ttfb", "transfer", "total", "json_decode", "validation"):
+        assert phase in create, phase
+    assert create["total"]["count"] == 3
+    assert create["dns"]["count"] == 1
+    assert create["ttfb"]["mean_ms"] <= create["total"]["mean_ms"]
+    assert summary["get_booking"]["total"]["count"] == 1
+    assert client.instrumentation.connections == {"new": 1, "reused": 3}
+
+
+def test_hooks_belong_to_their_client(local_server):
+    traced = APIClient(base_url=local_server.url, transport="requests")
+    other = APIClient(base_url=local_server.url, transport="requests")
+    recorder = traced.add_hook(PhaseRecorder())
+    try:
+        other.request("GET", "/ping")
+        assert recorder.summary() == {}
+        traced.request("GET", "/ping")
+    finally:
+        traced.remove_hook(recorder)
+    assert recorder.summary()["GET /ping"]["total"]["count"] == 1
+    assert other.instrumentation.connections == {"new": 0, "reused": 0}
+
+
+def test_removed_hooks_skip_the_traced_path(local_server, monkeypatch):
+    client = APIClient(base_url=local_server.url, transport="requests")
+    recorder = client.add_hook(PhaseRecorder())
+    client.remove_hook(recorder)
+
+    def traced(*args, **kwargs):
+        raise AssertionError("traced request sent with no hooks registered")
+
+    monkeypatch.setattr(client, "_traced_request", traced)
+    resp = client.request("POST", "/booking", json=booking_payload())
+    validate_schema(resp.json(), "booking_create_response")
+    assert recorder.summary() == {}
+    assert not client.instrumentation.enabled
+    assert client.instrumentation.connections == {"new": 0, "reused": 0}
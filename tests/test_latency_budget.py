@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tools import latency_budget
+from tools.latency_budget import BudgetError, LatencyBudgetPlugin, parse_budgets, untimed, violations
+from tools.histogram import LoadStats
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SUITE = '''
+import pytest
+import requests
+
+from api.client import APIClient
+from server import LocalBookerServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with LocalBookerServer() as srv:
+        yield srv
+
+
+def test_plain_requests(server):
+    for _ in range(5):
+        assert requests.get(f"{server.url}/ping").status_code == 201
+
+
+def test_client(server):
+    client = APIClient(base_url=server.url, transport="requests")
+    assert client.request("POST", "/booking", json={"firstname": "a"}).status_code in (200, 400, 500)
+
+
+@pytest.mark.latency_budget("GET /ping", p95=MARKER_P95)
+def test_marked(server):
+    requests.get(f"{server.url}/ping")
+'''
+
+
+def _run(tmp_path, budgets, marker_p95=60000, *args):
+    (tmp_path / "test_suite.py").write_text(SUITE.replace("MARKER_P95", str(marker_p95)))
+    (tmp_path / "pytest.ini").write_text("[pytest]\nlatency_budget_mode = enforce\nlatency_budgets =\n"
+                                         + "".join(f"\t{b}\n" for b in budgets))
+    env = {**os.environ, "PYTHONPATH": PROJECT_ROOT}
+    return subprocess.run([sys.executable, "-m", "pytest", "-p", "tools.latency_budget", "-p", "no:cacheprovider",
+                           "-rf", str(tmp_path), *args],
+                          cwd=tmp_path, env=env, capture_output=True, text=True)
+
+
+def test_parse_budgets():
+    assert parse_budgets(["*: p95=500", "", "PUT /booking/{id}: p50=100, p95=300"]) == {
+        "*": {"p95": 500.0}, "PUT /booking/{id}": {"p50": 100.0, "p95": 300.0}}
+    for bad in (["GET /ping p95=1"], ["GET /ping: p90=1"], ["GET /ping: p95="]):
+        with pytest.raises(BudgetError):
+            parse_budgets(bad)
+
+
+def test_violations_use_the_default_and_min_samples():
+    stats = LoadStats()
+    for ms in (10, 10, 10, 400):
+        stats.record("GET /ping", ms)
+    stats.record("POST /auth", 900)
+    budgets = {"*": {"p95": 500}, "GET /ping": {"p50": 5, "p95": 300}}
+    found = violations(stats, budgets)
+    assert [(endpoint, key) for endpoint, key, _, _ in found] == [
+        ("GET /ping", "p50"), ("GET /ping", "p95"), ("POST /auth", "p95")]
+    assert [v[0] for v in violations(stats, budgets, min_samples=2)] == ["GET /ping", "GET /ping"]
+
+
+class _Config:
+    def __init__(self, **ini):
+        self.ini = {"latency_budgets": [], "latency_budget_exclude": list(latency_budget.DEFAULT_EXCLUDE), **ini}
+
+    def getoption(self, name):
+        return None
+
+    def getini(self, name):
+        return self.ini.get(name, "")
+
+
+def test_budgets_enforce_only_against_the_local_server(monkeypatch):
+    monkeypatch.setattr(latency_budget, "LATENCY_BUDGET_MODE", "")
+    monkeypatch.setattr(latency_budget, "LOCAL_SERVER", False)
+    assert latency_budget.default_mode() == "report"
+    assert LatencyBudgetPlugin(_Config()).mode == "report"
+    assert LatencyBudgetPlugin(_Config(latency_budget_mode="enforce")).mode == "enforce"
+    monkeypatch.setattr(latency_budget, "LOCAL_SERVER", True)
+    assert latency_budget.default_mode() == "enforce"
+    monkeypatch.setattr(latency_budget, "LATENCY_BUDGET_MODE", "off")
+    assert latency_budget.default_mode() == "off"
+
+
+def test_infrastructure_calls_are_not_timed():
+    plugin = LatencyBudgetPlugin(_Config())
+    plugin.record("GET", "http://api.test/ping", 5, True)
+    plugin.record("GET", "http://127.0.0.1:9464/metrics", 5, True)
+    with untimed():
+        plugin.record("POST", "http://api.test/booking", 5, True)
+    assert list(plugin.stats.histograms) == ["GET /ping"]
+
+
+def test_session_table_and_passing_budgets(tmp_path):
+    # Runs without xdist so the plugin's optional xdist hook is exercised too.
+    result = _run(tmp_path, ["*: p50=60000 p95=60000"], 60000, "-p", "no:xdist")
+    assert result.returncode == 0, result.stdout
+    assert "latency budgets" in result.stdout
+    rows = {line.split()[0] + " " + line.split()[1]: line.split() for line in result.stdout.splitlines()
+            if line.startswith(("GET /ping", "POST /booking"))}
+    assert rows["GET /ping"][2] == "6"
+    assert rows["POST /booking"][2] == "1"
+
+
+def test_exceeded_session_budget_fails_the_run(tmp_path):
+    result = _run(tmp_path, ["GET /ping: p50=0.0001"])
+    assert result.returncode == 1
+    assert "3 passed" in result.stdout
+    assert "Latency budget exceeded: GET /ping p50" in result.stdout
+
+
+def test_marker_budget_fails_only_its_test(tmp_path):
+    result = _run(tmp_path, ["*: p95=60000"], 0.0001)
+    assert result.returncode == 1
+    assert "1 failed, 2 passed" in result.stdout
+    assert "FAILED test_suite.py::test_marked" in result.stdout
+    assert "Latency budget exceeded: GET /ping p95" in result.stdout
+
+    result = _run(tmp_path, ["*: p95=60000"], 0.0001, "--latency-budget-mode=report")
+    assert result.returncode == 0, result.stdout
@@ -0,0 +1,76 @@
+import time
+
+import requests
+
+from server import BookingStore, LocalBookerServer
+from utils.payloads import booking_payload
+
+REQUEST_TIMEOUT = 10
+
+
+def _token(url):
+    return requests.post(f"{url}/auth", json={"username": "admin", "password": "password123"},
+                         timeout=REQUEST_TIMEOUT).json()["token"]
+
+
+def test_server_starts_fast():
+    t0 = time.perf_counter()
+    with LocalBookerServer() as srv:
+        resp = requests.get(f"{srv.url}/ping", timeout=REQUEST_TIMEOUT)
+    assert resp.status_code == 201
+    assert time.perf_counter() - t0 < 1.0
+
+
+def test_auth_rejects_bad_credentials(local_server):
+    resp = requests.post(f"{local_server.url}/auth", json={"username": "admin", "password": "nope"},
+                         timeout=REQUEST_TIMEOUT)
+    assert resp.status_code == 200
+    assert "token" not in resp.json()
+
+
+def test_booking_lifecycle(local_server):
+    url = local_server.url
+    token = _token(url)
+    created = requests.post(f"{url}/booking", json=booking_payload(), timeout=REQUEST_TIMEOUT).json()
+    bid = created["bookingid"]
+    assert created["booking"] == booking_payload()
+
+    forbidden = requests.delete(f"{url}/booking/{bid}", timeout=REQUEST_TIMEOUT)
+    assert forbidden.status_code == 403
+
+    patched = requests.patch(f"{url}/booking/{bid}", json={"bookingdates": {"checkout": "2026-01-09"}},
+                             cookies={"token": token}, timeout=REQUEST_TIMEOUT)
+    assert patched.status_code == 200
+    assert patched.json()["bookingdates"] == {"checkin": "2026-01-01", "checkout": "2026-01-09"}
+
+    deleted = requests.delete(f"{url}/booking/{bid}", cookies={"token": token}, timeout=REQUEST_TIMEOUT)
+    assert deleted.status_code == 201
+    assert requests.get(f"{url}/booking/{bid}", timeout=REQUEST_TIMEOUT).status_code == 404
+    assert requests.delete(f"{url}/booking/{bid}", cookies={"token": token},
+                           timeout=REQUEST_TIMEOUT).status_code == 405
+
+
+def test_invalid_booking_is_rejected(local_server):
+    resp = requests.post(f"{local_server.url}/booking", json={"firstname": "Only"}, timeout=REQUEST_TIMEOUT)
+    assert resp.status_code == 500
+
+
+def test_store_filters_use_indexes():
+    store = BookingStore()
+    a = store.create({**booking_payload(), "firstname": "Ann",
+                      "bookingdates": {"checkin": "2026-03-01", "checkout": "2026-03-04"}})
+    b = store.create({**booking_payload(), "firstname": "Ann",
+                      "bookingdates": {"checkin": "2026-05-01", "checkout": "2026-05-04"}})
+    c = store.create({**booking_payload(), "firstname": "Bob",
+                      "bookingdates": {"checkin": "2026-05-02", "checkout": "2026-05-03"}})
+
+    assert store.ids(firstname="Ann") == [a, b]
+    assert store.ids(checkin="2026-04-01") == [b, c]
+    assert store.ids(checkout="2026-05-03") == [a, c]
+    assert store.ids(firstname="Ann", checkin="2026-04-01", checkout="2026-05-31") == [b]
+
+    store.replace(b, {**booking_payload(), "firstname": "Cat"})
+    assert store.ids(firstname="Ann") == [a]
+    assert store.delete(a)
+    assert store.ids(firstname="Ann") == []
+    assert sorted(store.ids()) == [b, c]
@@ -0,0 +1,89 @@
+import json
+import socket
+
+import requests
+
+from tools import metrics
+from tools.histogram import LoadStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_snapshots_are_time_buckets_of_the_cumulative_stats():
+    stats, clock = LoadStats(), FakeClock()
+    live = metrics.LiveMetrics(lambda: stats, "test", clock=clock)
+    for ms in (2, 4, 8):
+        stats.record("get", ms)
+    clock.now += 2
+    first = live.snapshot()
+    stats.record("get", 30, ok=False)
+    clock.now += 1
+    second = live.snapshot()
+
+    assert first["interval_s"] == 2 and first["ops"]["get"]["count"] == 3
+    assert first["ops"]["get"]["rate_rps"] == 1.5
+    assert second["ops"]["get"]["count"] == 1 and second["ops"]["get"]["errors"] == 1
+    assert 29 < second["ops"]["get"]["p50_ms"] < 31
+
+
+def test_openmetrics_exposition_over_http():
+    stats = LoadStats()
+    for ms in (0.5, 3, 40, 400):
+        stats.record("create", ms)
+    stats.record("create", 4000, ok=False)
+    exporter = metrics.MetricsExporter(metrics.LiveMetrics(lambda: stats, "test"), port=0, interval=60).start()
+    try:
+        resp = requests.get(exporter.server.url, timeout=5)
+    finally:
+        exporter.stop()
+
+    assert resp.headers["Content-Type"].startswith("application/openmetrics-text")
+    lines = resp.text.splitlines()
+    assert lines[-1] == "# EOF"
+    labels = 'driver="test",endpoint="create"'
+    assert f"rb_requests_total{{{labels}}} 5" in lines
+    assert f"rb_request_errors_total{{{labels}}} 1" in lines
+    assert f'rb_request_latency_seconds_bucket{{{labels},le="0.001"}} 1' in lines
+    assert f'rb_request_latency_seconds_bucket{{{labels},le="0.05"}} 3' in lines
+    assert f'rb_request_latency_seconds_bucket{{{labels},le="+Inf"}} 5' in lines
+
+
+def test_exporters_on_one_host_take_offset_ports(monkeypatch):
+    # locust workers share RB_METRICS_PORT as a base and add their own offset.
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        free = sock.getsockname()[1]
+    monkeypatch.setattr(metrics, "METRICS_PORT", free - 1)
+    monkeypatch.setattr(metrics, "METRICS_JSONL", "")
+    exporter = metrics.start_from_config(LoadStats, "locust", port_offset=1)
+    try:
+        assert exporter.server.server_address[1] == free
+        assert requests.get(exporter.server.url, timeout=5).status_code == 200
+    finally:
+        exporter.stop()
+
+
+def test_jsonl_stream_replays_and_diffs(tmp_path):
+    path_a, path_b = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    for path, latency in ((path_a, 10), (path_b, 20)):
+        stats = LoadStats()
+        exporter = metrics.MetricsExporter(metrics.LiveMetrics(lambda: stats, "test"), jsonl_path=str(path),
+                                           interval=60)
+        for _ in range(3):
+            for _ in range(50):
+                stats.record("get", latency)
+            exporter.write_snapshot()
+        exporter.start().stop()
+
+    records = list(metrics.read_snapshots(path_a))
+    assert len(records) == 4 and [r["ops"].get("get", {}).get("count", 0) for r in records] == [50, 50, 50, 0]
+    assert metrics.replay(path_a).summary()["get"]["count"] == 150
+    change = metrics.diff(path_a, path_b)["get"]["p50_ms"]["change"]
+    assert 0.9 < change < 1.1
+    json.dumps(metrics.diff(path_a, path_b))
@@ -0,0 +1,34 @@
+import time
+
+import pytest
+
+from tools import open_loop
+
+
+def test_schedules():
+    assert open_loop.constant(4, 1) == [0, 0.25, 0.5, 0.75]
+    offsets, window = open_loop.build_schedule("ramp", 0, 0, "2:1,4:1")
+    assert window == 2
+    assert offsets == [0, 0.5, 1.0, 1.25, 1.5, 1.75]
+    arrivals = open_loop.poisson(1000, 2, seed=3)
+    assert 1800 < len(arrivals) < 2200
+    assert arrivals == sorted(arrivals)
+    with pytest.raises(ValueError):
+        open_loop.build_schedule("sine", 1, 1)
+
+
+def test_run_measures_from_scheduled_time():
+    latencies = []
+
+    def slow(scheduled_at):
+        time.sleep(0.02)
+        latencies.append(time.perf_counter() - scheduled_at)
+
+    # One sender at 100/s cannot keep up with 20 ms calls: later calls queue up,
+    # and that waiting must show up in their latency.
+    result = open_loop.run(open_loop.constant(100, 0.2), slow, workers=1, schedule_duration=0.2)
+    assert result["scheduled"] == result["completed"] == 20
+    assert result["target_rps"] == 100
+    assert result["achieved_rps"] < 60
+    assert max(latencies) > 0.15
+    assert result["max_start_lag_ms"] > 150
@@ -0,0 +1,57 @@
+import json
+import threading
+from datetime import date
+
+from utils.payloads import BookingGenerator
+from utils.validation import validate_many
+
+
+def test_generator_is_seeded_and_valid():
+    a = list(BookingGenerator(seed=11).payloads(2000, batch_size=512))
+    b = list(BookingGenerator(seed=11).payloads(2000, batch_size=512))
+    assert a == b
+    assert a != list(BookingGenerator(seed=12).payloads(2000, batch_size=512))
+    assert validate_many(a, "booking_object") == 2000
+
+
+def test_distributions_follow_configuration():
+    gen = BookingGenerator(seed=3, deposit_rate=0.25, price_min=50, price_max=60, stay_mean=2, stay_max=4,
+                           start_date="2027-05-01", date_span_days=10)
+    rows = list(gen.payloads(5000))
+    deposit_share = sum(r["depositpaid"] for r in rows) / len(rows)
+    assert 0.2 < deposit_share < 0.3
+    assert all(50 <= r["totalprice"] <= 60 for r in rows)
+    for r in rows:
+        checkin = date.fromisoformat(r["bookingdates"]["checkin"])
+        checkout = date.fromisoformat(r["bookingdates"]["checkout"])
+        assert date(2027, 5, 1) <= checkin < date(2027, 5, 11)
+        assert 1 <= (checkout - checkin).days <= 4
+    # Zipf-skewed names: the first name in the list is the most common one.
+    counts = {}
+    for r in rows:
+        counts[r["firstname"]] = counts.get(r["firstname"], 0) + 1
+    assert max(counts, key=counts.get) == gen.first_names[0]
+
+
+def test_json_payloads_match_dict_payloads():
+    dicts = list(BookingGenerator(seed=5).payloads(300))
+    raw = list(BookingGenerator(seed=5).json_payloads(300))
+    assert all(isinstance(body, bytes) for body in raw)
+    assert [json.loads(body) for body in raw] == dicts
+
+
+def test_stream_is_thread_safe():
+    next_payload = BookingGenerator(seed=1).stream(batch_size=64)
+    seen = []
+
+    def pull():
+        for _ in range(500):
+            seen.append(next_payload())
+
+    threads = [threading.Thread(target=pull) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(seen) == 2000
+    assert seen[0]["bookingdates"]["checkin"] < seen[0]["bookingdates"]["checkout"]
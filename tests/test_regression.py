@@ -0,0 +1,55 @@
+import json
+import random
+
+import pytest
+
+from tools import regression
+
+
+def samples(centre, spread=0.02, n=200, seed=0):
+    rng = random.Random(seed)
+    return [centre * (1 + rng.uniform(-spread, spread)) for _ in range(n)]
+
+
+def test_mann_whitney_detects_shift_and_ignores_identical_distributions():
+    base = samples(1.0)
+    p_slower, p_faster = regression.mann_whitney(base, samples(1.05, seed=1))
+    assert p_slower < 1e-6 and p_faster > 0.99
+    p_slower, p_faster = regression.mann_whitney(base, samples(1.0, seed=2))
+    assert p_slower > 0.01 and p_faster > 0.01
+    assert regression.mann_whitney([1.0] * 10, [1.0] * 10) == (1.0, 1.0)
+
+
+def test_compare_needs_significance_and_effect():
+    runs = [samples(1.0)]
+    # Significant but smaller than the 10% minimum effect: noise, not a regression.
+    assert regression.compare(runs, samples(1.05, seed=1))["verdict"] == "unchanged"
+    assert regression.compare(runs, samples(1.3, seed=1))["verdict"] == "regressed"
+    assert regression.compare(runs, samples(0.7, seed=1))["verdict"] == "improved"
+    # Baseline runs that drifted 40% between themselves raise the bar.
+    noisy = [samples(1.0), samples(1.4, seed=3)]
+    row = regression.compare(noisy, samples(1.5, seed=1))
+    assert row["threshold"] > 0.3 and row["verdict"] == "unchanged"
+
+
+def test_baselines_are_keyed_by_machine_and_keep_recent_runs(tmp_path):
+    machine = {"id": "abc123"}
+    for i in range(regression.MAX_RUNS + 2):
+        regression.save_baseline({"bench": samples(1.0, n=1000, seed=i)}, tmp_path, machine)
+    stored = regression.load_baseline(tmp_path, machine)
+    assert len(stored["bench"]) == regression.MAX_RUNS
+    assert all(len(run) == regression.MAX_SAMPLES for run in stored["bench"])
+    assert regression.load_baseline(tmp_path, {"id": "other"}) is None
+
+    report = regression.compare_all({"bench": samples(1.0, seed=9), "fresh": [1.0]}, stored)
+    assert report["bench"]["verdict"] == "unchanged"
+    assert report["fresh"]["verdict"] == "new"
+
+
+def test_load_results_requires_raw_data(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps({"benchmarks": [{"fullname": "b", "stats": {"data": [1.0, 2.0]}}]}))
+    assert regression.load_results(path) == {"b": [1.0, 2.0]}
+    path.write_text(json.dumps({"benchmarks": [{"fullname": "b", "stats": {"mean": 1.0}}]}))
+    with pytest.raises(ValueError):
+        regression.load_results(path)
@@ -0,0 +1,165 @@
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from api.client import APIClient
+from api.resilience import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, Resilience, RetryBudget,
+                            RetryPolicy)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status, headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    resp._content = b"{}"
+    resp._content_consumed = True
+    return resp
+
+
+def refused():
+    reason = NewConnectionError(None, "refused")
+    return requests.ConnectionError(MaxRetryError(None, "/", reason))
+
+
+def test_retry_policy_respects_idempotency():
+    policy = RetryPolicy()
+    assert policy.retryable("GET", response(503), None)
+    assert policy.retryable("DELETE", None, requests.ReadTimeout())
+    # A POST may already have created a booking: only retry when it never left.
+    assert not policy.retryable("POST", response(503), None)
+    assert not policy.retryable("POST", None, requests.ReadTimeout())
+    assert policy.retryable("POST", None, refused())
+    assert policy.retryable("POST", response(429), None)
+    assert policy.retryable("POST", response(503), None, idempotent=True)
+    assert not policy.retryable("GET", None, CircuitOpenError())
+
+
+def test_backoff_is_jittered_capped_and_honours_retry_after():
+    policy = RetryPolicy(backoff=0.1, backoff_max=1.0)
+    delays = [policy.delay(3) for _ in range(200)]
+    assert all(0 <= d <= 0.8 for d in delays) and len(set(delays)) > 100
+    assert all(policy.delay(10) <= 1.0 for _ in range(50))
+    assert policy.delay(0, response(503, {"Retry-After": "0.5"})) == 0.5
+    assert policy.delay(0, response(503, {"Retry-After": "120"})) == 1.0
+
+
+def test_retry_budget_caps_retries_to_a_share_of_requests():
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.1, min_per_second=0, burst=2, clock=clock)
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+    for _ in range(10):
+        budget.deposit()
+    assert budget.withdraw() and not budget.withdraw()
+
+
+def test_breaker_opens_sheds_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=0.5, min_requests=4, window=10, cooldown=5, clock=clock)
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(ok)
+    assert breaker.state == OPEN and breaker.opened == 1
+    assert not breaker.allow()
+
+    clock.now += 5
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # one probe at a time
+    breaker.record(False)
+    assert breaker.state == OPEN and breaker.opened == 2
+
+    clock.now += 5
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CLOSED and breaker.failure_rate() == 0.0
+
+
+def test_a_probe_that_raises_does_not_wedge_the_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=0.5, min_requests=1, cooldown=5, clock=clock)
+    resilience = Resilience(sleep=lambda s: None, breaker_factory=lambda: breaker)
+    breaker.record(False)
+    clock.now += 5
+
+    def broken():
+        raise ValueError("bad hook")
+
+    with pytest.raises(ValueError):
+        resilience.call("GET /ping", "GET", broken)
+    assert breaker.state == OPEN
+    clock.now += 5
+    assert resilience.call("GET /ping", "GET", lambda: response(200)).status_code == 200
+    assert breaker.state == CLOSED
+
+
+def test_breaker_forgets_failures_outside_the_window():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=0.5, min_requests=4, window=10, clock=clock)
+    for _ in range(3):
+        breaker.record(False)
+    clock.now += 11
+    breaker.record(False)
+    assert breaker.state == CLOSED
+
+
+def test_client_retries_idempotent_calls_and_reports_metrics(monkeypatch):
+    resilience = Resilience(sleep=lambda s: None)
+    client = APIClient(base_url="http://stub", resilience=resilience, cache=None)
+    replies = iter([response(502), response(503), response(200)])
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: next(replies))
+
+    assert client.request("GET", "/booking/1").status_code == 200
+    stats = resilience.snapshot()
+    assert stats["retries"] == 2 and stats["attempts"] == 3
+    assert stats["breakers"]["GET /booking/{id}"]["state"] == CLOSED
+
+
+def test_client_does_not_retry_failed_creates(monkeypatch):
+    resilience = Resilience(sleep=lambda s: None)
+    client = APIClient(base_url="http://stub", resilience=resilience, cache=None)
+    calls = []
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: calls.append(url) or response(503))
+    assert client.request("POST", "/booking", json={}).status_code == 503
+    assert len(calls) == 1
+    assert client.request("POST", "/auth", json={}, idempotent=True, retries=1).status_code == 503
+    assert len(calls) == 3
+    assert resilience.snapshot()["exhausted"] == 1
+
+
+def test_open_breaker_short_circuits_client_calls(monkeypatch):
+    resilience = Resilience(policy=RetryPolicy(max_attempts=1),
+                            breaker_factory=lambda: CircuitBreaker(threshold=0.5, min_requests=3, cooldown=60))
+    client = APIClient(base_url="http://stub", resilience=resilience, cache=None)
+    calls = []
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: calls.append(url) or response(500))
+    for _ in range(3):
+        client.request("GET", "/ping")
+    with pytest.raises(CircuitOpenError):
+        client.request("GET", "/ping")
+    assert len(calls) == 3
+    # Other endpoints keep their own breaker.
+    client.request("GET", "/booking")
+    stats = resilience.snapshot()
+    assert stats["short_circuited"] == 1
+    assert stats["breakers"]["GET /ping"] == {"state": OPEN, "opened": 1, "failure_rate": 1.0}
+
+
+def test_budget_stops_a_retry_storm(monkeypatch):
+    resilience = Resilience(budget=RetryBudget(ratio=0.1, min_per_second=0, burst=1), sleep=lambda s: None,
+                            breaker_threshold=0)
+    client = APIClient(base_url="http://stub", resilience=resilience, cache=None)
+    calls = []
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: calls.append(url) or response(503))
+    for _ in range(20):
+        client.request("GET", "/ping")
+    # 20 requests with 3 attempts each would be 60 calls; the budget allows ~3 retries.
+    assert len(calls) <= 24
+    assert resilience.snapshot()["budget_exhausted"] >= 17
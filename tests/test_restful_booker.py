@@ -3,7 +3,9 @@ import pytest
 import uuid
 from datetime import datetime, timedelta
 
-BASE_URL = "https://restful-booker.herokuapp.com"
+from api.auth import get_token_provider
+from utils.config import BASE_URL
+
 REQUEST_TIMEOUT = 10
 
 SUCCESS_STATUS = {200, 201, 204}
@@ -16,12 +18,7 @@ def base_url():
 
 @pytest.fixture(scope="session")
 def auth_token(base_url):
-    url = f"{base_url}/auth"
-    resp = requests.post(url, json={"username": "admin", "password": "password123"}, timeout=REQUEST_TIMEOUT)
-    assert resp.status_code in SUCCESS_STATUS, f"Auth request failed: {resp.status_code} {resp.text}"
-    body = resp.json()
-    assert "token" in body, "Auth response missing token"
-    return body["token"]
+    return get_token_provider("admin", "password123").token()
 
 
 def booking_payload(firstname=None, lastname=None, totalprice=123, depositpaid=False,
@@ -44,26 +41,18 @@ def booking_payload(firstname=None, lastname=None, totalprice=123, depositpaid=F
 
 
 @pytest.fixture
-def create_booking(base_url):
-    created = []
-
+def create_booking(base_url, booking_registry):
     def _create(payload=None):
-        p = payload or booking_payload()
+        p = payload or booking_payload(lastname=booking_registry.namespace)
         resp = requests.post(f"{base_url}/booking", json=p, timeout=REQUEST_TIMEOUT)
         assert resp.status_code in SUCCESS_STATUS, f"Create booking failed: {resp.status_code} {resp.text}"
         body = resp.json()
         assert "bookingid" in body, f"Unexpected create response body: {body}"
         bookingid = body["bookingid"]
-        created.append(bookingid)
+        booking_registry.add(bookingid)
         return bookingid, p
 
-    yield _create
-
-    for bid in created:
-        try:
-            requests.delete(f"{base_url}/booking/{bid}", timeout=REQUEST_TIMEOUT)
-        except Exception:
-            pass
+    return _create
 
 
 def test_ping(base_url):
@@ -88,6 +77,13 @@ def test_create_and_get_booking(base_url, create_booking):
     assert body["bookingdates"]["checkin"] == payload["bookingdates"]["checkin"]
 
 
+def test_get_pooled_booking(base_url, booking_pool):
+    bookingid, booking = booking_pool.next()
+    resp = requests.get(f"{base_url}/booking/{bookingid}", timeout=REQUEST_TIMEOUT)
+    assert resp.status_code == 200, f"GET booking/{bookingid} failed: {resp.status_code}"
+    assert resp.json()["firstname"] == booking["firstname"]
+
+
 def test_get_bookings_list_and_filter(base_url, create_booking):
     firstname = f"First-{uuid.uuid4().hex[:6]}"
     lastname = f"Last-{uuid.uuid4().hex[:6]}"
@@ -105,34 +101,41 @@ def test_get_bookings_list_and_filter(base_url, create_booking):
     assert any((bid == bookingid) for bid in ids), f"Filtered bookings did not include created booking {bookingid}"
 
 
-def test_update_booking_put_requires_token(base_url, create_booking, auth_token):
-    bookingid, payload = create_booking()
-    updated_payload = payload.copy()
-    updated_payload["firstname"] = "Updated-" + payload["firstname"]
-    headers = {"Cookie": f"token={auth_token}", "Content-Type": "application/json"}
-    resp = requests.put(f"{base_url}/booking/{bookingid}", json=updated_payload, headers=headers, timeout=REQUEST_TIMEOUT)
-    assert resp.status_code in SUCCESS_STATUS, f"PUT /booking/{bookingid} failed: {resp.status_code} {resp.text}"
-    body = resp.json()
-    assert body["firstname"] == updated_payload["firstname"]
-
-
-def test_partial_update_patch_requires_token(base_url, create_booking, auth_token):
-    bookingid, payload = create_booking()
-    patch_payload = {"firstname": "Patched-" + payload["firstname"]}
-    headers = {"Cookie": f"token={auth_token}", "Content-Type": "application/json"}
-    resp = requests.patch(f"{base_url}/booking/{bookingid}", json=patch_payload, headers=headers, timeout=REQUEST_TIMEOUT)
-    assert resp.status_code in SUCCESS_STATUS, f"PATCH /booking/{bookingid} failed: {resp.status_code} {resp.text}"
-    body = resp.json()
-    assert body["firstname"] == patch_payload["firstname"]
+def test_update_booking_put_requires_token(base_url, booking_pool, auth_token):
+    with booking_pool.lease() as lease:
+        bookingid, payload = lease.id, lease.booking
+        updated_payload = payload.copy()
+        updated_payload["firstname"] = "Updated-" + payload["firstname"]
+        headers = {"Cookie": f"token={auth_token}", "Content-Type": "application/json"}
+        resp = requests.put(f"{base_url}/booking/{bookingid}", json=updated_payload, headers=headers, timeout=REQUEST_TIMEOUT)
+        assert resp.status_code in SUCCESS_STATUS, f"PUT /booking/{bookingid} failed: {resp.status_code} {resp.text}"
+        body = resp.json()
+        assert body["firstname"] == updated_payload["firstname"]
+        lease.booking = body
 
 
-def test_delete_booking_requires_token(base_url, create_booking, auth_token):
-    bookingid, _ = create_booking()
-    headers = {"Cookie": f"token={auth_token}"}
-    resp = requests.delete(f"{base_url}/booking/{bookingid}", headers=headers, timeout=REQUEST_TIMEOUT)
-    assert resp.status_code in SUCCESS_STATUS, f"DELETE /booking/{bookingid} failed: {resp.status_code} {resp.text}"
-    resp_get = requests.get(f"{base_url}/booking/{bookingid}", timeout=REQUEST_TIMEOUT)
-    assert resp_get.status_code == 404, f"Deleted booking {bookingid} still retrievable, status: {resp_get.status_code}"
+def test_partial_update_patch_requires_token(base_url, booking_pool, auth_token):
+    with booking_pool.lease() as lease:
+        bookingid, payload = lease.id, lease.booking
+        patch_payload = {"firstname": "Patched-" + payload["firstname"]}
+        headers = {"Cookie": f"token={auth_token}", "Content-Type": "application/json"}
+        resp = requests.patch(f"{base_url}/booking/{bookingid}", json=patch_payload, headers=headers, timeout=REQUEST_TIMEOUT)
+        assert resp.status_code in SUCCESS_STATUS, f"PATCH /booking/{bookingid} failed: {resp.status_code} {resp.text}"
+        body = resp.json()
+        assert body["firstname"] == patch_payload["firstname"]
+        lease.booking = body
+
+
+def test_delete_booking_requires_token(base_url, booking_pool, auth_token):
+    with booking_pool.lease() as lease:
+        bookingid = lease.id
+        headers = {"Cookie": f"token={auth_token}"}
+        resp = requests.delete(f"{base_url}/booking/{bookingid}", headers=headers, timeout=REQUEST_TIMEOUT)
+        assert resp.status_code in SUCCESS_STATUS, f"DELETE /booking/{bookingid} failed: {resp.status_code} {resp.text}"
+        lease.deleted = True
+        resp_get = requests.get(f"{base_url}/booking/{bookingid}", timeout=REQUEST_TIMEOUT)
+        assert resp_get.status_code == 404, f"Deleted booking {bookingid} still retrievable, status: {resp_get.status_code}"
+    assert bookingid not in booking_pool and len(booking_pool) == booking_pool.size
 
 
 def test_create_booking_response_structure(base_url):
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+import requests
+
+from api.auth import TokenProvider
+from tools import scenario, simple_load
+from tools.histogram import LoadStats
+from utils.payloads import BookingGenerator
+
+
+def test_bundled_scenarios_load():
+    flow = scenario.load("booking_flow")
+    assert [s.label for s in flow.tasks[0].steps] == ["ping", "create", "get", "delete"]
+    assert flow.think_time == (0.0, 0.0) and flow.duration is None
+
+    heavy = scenario.load("read_heavy")
+    assert heavy.duration == 120 and heavy.max_users == 20
+    assert [heavy.users_at(t) for t in (0, 29, 30, 100, 119, 120)] == [5, 5, 20, 5, 5, 0]
+    assert scenario.load("locust_mix").weights == [1.0, 2.0]
+    assert [t.name for t in scenario.load("pooled_flow").tasks] == ["ping_get", "update_delete"]
+
+
+def test_invalid_scenarios_are_rejected():
+    with pytest.raises(scenario.ScenarioError):
+        scenario.Scenario({"tasks": [{"name": "x", "steps": ["teleport"]}]})
+    with pytest.raises(scenario.ScenarioError):
+        scenario.Scenario({"tasks": [{"name": "x", "steps": [{"op": "list_bookings", "filter": ["price"]}]}]})
+    with pytest.raises(scenario.ScenarioError):
+        scenario.Scenario({"tasks": []})
+
+
+def test_weighted_pick_follows_weights():
+    scn = scenario.Scenario({"tasks": [{"name": "a", "weight": 3, "steps": ["ping"]},
+                                       {"name": "b", "weight": 1, "steps": ["ping"]}]})
+    user = scenario.ScenarioUser(scn, None, None, None, random.Random(1))
+    picks = [user.pick().name for _ in range(4000)]
+    assert 0.7 < picks.count("a") / len(picks) < 0.8
+
+
+@pytest.fixture
+def run_user(local_server, monkeypatch):
+    monkeypatch.setattr(simple_load, "BASE_URL", local_server.url)
+    stats = LoadStats()
+    tokens = TokenProvider("admin", "password123")
+
+    def make(spec):
+        scn = scenario.Scenario(spec)
+        monkeypatch.setattr(simple_load, "SCENARIO", scn)
+        user = simple_load.scenario_user(requests.Session(), stats, tokens,
+                                         BookingGenerator(5).stream(serialized=True))
+        return user, stats
+
+    return make
+
+
+def test_steps_without_a_booking_create_one_first(run_user, local_server):
+    user, stats = run_user({"tasks": [{"name": "read", "steps": ["get_booking"]}]})
+    user.run_task()
+    user.run_task()
+    summary = stats.summary()
+    # The first read had to create a booking; the second reuses it.
+    assert summary["create"]["count"] == 1
+    assert summary["get"]["count"] == 2 and summary["get"]["errors"] == 0
+    assert len(user.known) == 1
+    assert local_server.store.get(user.known[0][0]) is not None
+
+
+def test_task_steps_share_their_booking(run_user, local_server):
+    user, stats = run_user({"tasks": [{"name": "churn", "steps": [
+        "create_booking",
+        {"op": "list_bookings", "filter": ["firstname", "lastname"], "name": "search"},
+        {"op": "patch_booking", "fields": ["totalprice"]},
+        "update_booking",
+        "delete_booking",
+    ]}]})
+    user.run_task()
+    summary = stats.summary()
+    for op in ("create", "search", "patch", "update", "delete"):
+        assert summary[op]["count"] == 1 and summary[op]["errors"] == 0, op
+    assert user.known == []
@@ -0,0 +1,80 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from tools import scenario, simple_load
+from tools.histogram import LoadStats
+
+
+def test_multi_process_run_merges_into_one_report(local_server, monkeypatch):
+    monkeypatch.setattr(simple_load, "BASE_URL", local_server.url)
+    monkeypatch.setattr(simple_load, "DURATION", 1)
+    monkeypatch.setattr(simple_load, "USERS", 1)
+    monkeypatch.setattr(simple_load, "REPORT_INTERVAL", 0)
+
+    stats, extra, elapsed = simple_load.run_processes(2)
+
+    assert extra == {"processes": 2}
+    assert elapsed == 1
+    summary = stats.summary(elapsed)
+    assert summary["create"]["count"] > 0
+    assert summary["create"]["errors"] == 0
+    assert summary["get"]["count"] == summary["delete"]["count"]
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="children must inherit the patch")
+def test_crashed_process_is_reported_instead_of_hanging(local_server, monkeypatch):
+    monkeypatch.setattr(simple_load, "BASE_URL", local_server.url)
+    monkeypatch.setattr(simple_load, "DURATION", 1)
+    monkeypatch.setattr(simple_load, "USERS", 1)
+    monkeypatch.setattr(simple_load, "REPORT_INTERVAL", 0)
+    monkeypatch.setattr(simple_load, "LIVENESS_POLL", 0.2)
+    run_load = simple_load.run_load
+
+    def crashing_run_load(stats, share=1.0, end=None, stop=None, seed=None, pool=None):
+        if seed == 1:
+            os._exit(3)
+        return run_load(stats, share, end, stop, seed, pool)
+
+    # The children are forked, so they inherit the patched run_load.
+    monkeypatch.setattr(simple_load, "run_load", crashing_run_load)
+    stats, extra, elapsed = simple_load.run_processes(2)
+
+    assert extra == {"processes": 2, "lost_processes": [1]}
+    assert stats.summary(elapsed)["create"]["count"] > 0
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="children must inherit the patch")
+def test_slow_set_up_does_not_shift_a_process_window(local_server, monkeypatch):
+    monkeypatch.setattr(simple_load, "BASE_URL", local_server.url)
+    monkeypatch.setattr(simple_load, "DURATION", 1)
+    monkeypatch.setattr(simple_load, "USERS", 1)
+    monkeypatch.setattr(simple_load, "REPORT_INTERVAL", 0)
+
+    def slow_pool(seed=None):
+        # Longer than the start lead: before the ready handshake this process
+        # woke up after its window had already closed.
+        time.sleep(1.5 if seed == 1 else 0)
+
+    monkeypatch.setattr(simple_load, "booking_pool", slow_pool)
+    latest = {}
+    _, extra, _ = simple_load.run_processes(2, latest)
+
+    assert extra == {"processes": 2}
+    for index in (0, 1):
+        assert LoadStats.from_dict(latest[index]).summary()["create"]["count"] > 0, index
+
+
+def test_open_loop_runs_for_the_scenario_duration(local_server, monkeypatch):
+    monkeypatch.setattr(simple_load, "BASE_URL", local_server.url)
+    monkeypatch.setattr(simple_load, "DURATION", 30)
+    monkeypatch.setattr(simple_load, "RATE", 20)
+    monkeypatch.setattr(simple_load, "SCENARIO", scenario.Scenario(
+        {"stages": [{"users": 2, "duration": 0.5}], "tasks": [{"name": "ping", "steps": ["ping"]}]}))
+    stats = LoadStats(simple_load.OPERATIONS)
+
+    result = simple_load.run_open_loop(stats, None, None)
+
+    assert result["scheduled"] == 10 and result["completed"] == 10
@@ -0,0 +1,135 @@
+import json
+import tracemalloc
+import uuid
+
+import pytest
+import requests
+
+from api import endpoints
+from api.client import APIClient
+from api.codec import iter_json_array
+from api.resilience import Resilience
+from utils.payloads import booking_payload
+
+
+def _chunks(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("size", [1, 3, 64])
+def test_iter_json_array_matches_json_loads(size):
+    doc = '[ {"bookingid": 1}, {"id": 22, "name": "Zoë 漢"}, 12345, -1.5e3, "a,]", [1, [2]], true, null ]'
+    assert list(iter_json_array(_chunks(doc.encode(), size))) == json.loads(doc)
+    assert list(iter_json_array(_chunks(b" [ ] ", size))) == []
+
+
+@pytest.mark.parametrize("doc", [b"", b"{}", b"[1,]", b"[,1]", b"[1 2]", b"[1, 2", b"[1] x", b"[1.]"])
+def test_iter_json_array_rejects_malformed_bodies(doc):
+    with pytest.raises(ValueError):
+        list(iter_json_array(_chunks(doc, 2)))
+
+
+def test_iter_json_array_memory_stays_flat():
+    def body(count):
+        yield b"["
+        for i in range(count):
+            yield (b"," if i else b"") + b'{"bookingid": %d}' % i
+        yield b"]"
+
+    tracemalloc.start()
+    try:
+        total = sum(1 for _ in iter_json_array(body(200_000)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert total == 200_000
+    # json.loads of the same body holds ~200k dicts, tens of megabytes.
+    assert peak < 1_000_000
+
+
+class _Raw:
+    """A body that arrives one read at a time, recording how much was read."""
+
+    def __init__(self, data, size):
+        self.pieces = list(_chunks(data, size))
+        self.reads = 0
+
+    closed = False
+
+    def read(self, amt=None, **kwargs):
+        if self.reads >= len(self.pieces):
+            return b""
+        self.reads += 1
+        return self.pieces[self.reads - 1]
+
+    def close(self):
+        self.closed = True
+
+
+class _StreamingSession:
+    def __init__(self, body, status=200):
+        self.body = body
+        self.statuses = [status] if isinstance(status, int) else list(status)
+        self.raw = None
+        self.raws = []
+
+    def request(self, method, url, stream=False, **kwargs):
+        assert stream
+        resp = requests.Response()
+        resp.status_code = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        resp.raw = self.raw = _Raw(self.body, 16)
+        self.raws.append(self.raw)
+        return resp
+
+    def close(self):
+        pass
+
+
+def _stream_client(monkeypatch, body, status=200, resilience=None):
+    session = _StreamingSession(body, status)
+    monkeypatch.setattr(endpoints, "client", APIClient(base_url="http://stream.test", transport=session,
+                                                       cache=None, resilience=resilience))
+    return session
+
+
+def test_first_id_arrives_before_the_body_is_read(monkeypatch):
+    body = json.dumps([{"bookingid": i} for i in range(1000)]).encode()
+    session = _stream_client(monkeypatch, body)
+    ids = endpoints.iter_booking_ids(chunk_size=16)
+    assert next(ids) == 0
+    assert session.raw.reads < 5
+    assert list(ids) == list(range(1, 1000))
+    assert session.raw.reads == len(session.raw.pieces)
+
+
+def test_invalid_items_fail_at_their_index(monkeypatch):
+    _stream_client(monkeypatch, b'[{"bookingid": 1}, {"id": 2}, {"bookingid": "three"}]')
+    ids = endpoints.iter_booking_ids(chunk_size=16)
+    assert [next(ids), next(ids)] == [1, 2]
+    with pytest.raises(AssertionError, match=r"^Schema validation failed: 2"):
+        next(ids)
+
+
+def test_error_status_raises(monkeypatch):
+    _stream_client(monkeypatch, b'{"error": "nope"}', status=500)
+    with pytest.raises(requests.HTTPError):
+        list(endpoints.iter_booking_ids())
+
+
+def test_retried_streams_are_closed(monkeypatch):
+    session = _stream_client(monkeypatch, b'[{"bookingid": 1}]', status=(503, 503, 200),
+                             resilience=Resilience(sleep=lambda s: None))
+    assert list(endpoints.iter_booking_ids()) == [1]
+    # The discarded 503 bodies were never read, so closing them frees their connections.
+    assert [(raw.closed, raw.reads) for raw in session.raws[:2]] == [(True, 0), (True, 0)]
+
+
+def test_streamed_ids_match_the_list(local_server, monkeypatch):
+    monkeypatch.setattr(endpoints, "client", APIClient(base_url=local_server.url))
+    lastname = f"Stream-{uuid.uuid4().hex[:8]}"
+    payload = {**booking_payload(), "lastname": lastname}
+    created = {endpoints.create_booking(payload).json()["bookingid"] for _ in range(5)}
+    streamed = list(endpoints.iter_booking_ids(chunk_size=8, params={"lastname": lastname}))
+    assert set(streamed) == created
+    listed = endpoints.get_bookings(params={"lastname": lastname}).json()
+    assert streamed == [item["bookingid"] for item in listed]
@@ -0,0 +1,116 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from api.auth import AuthenticationError, TokenProvider, get_token_provider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def counting_fetch(delay=0.0):
+    calls = []
+
+    def fetch(username, password):
+        time.sleep(delay)
+        calls.append((username, password))
+        return f"tok-{len(calls)}"
+
+    return fetch, calls
+
+
+def test_token_is_cached_until_expiry():
+    fetch, calls = counting_fetch()
+    clock = FakeClock()
+    provider = TokenProvider("admin", "pw", fetch=fetch, ttl=100, refresh_margin=0, clock=clock)
+    assert provider.token() == "tok-1"
+    clock.now = 99
+    assert provider.token() == "tok-1"
+    clock.now = 100
+    assert provider.token() == "tok-2"
+    assert len(calls) == 2
+
+
+def test_refreshes_in_background_before_expiry():
+    fetch, calls = counting_fetch()
+    clock = FakeClock()
+    provider = TokenProvider("admin", "pw", fetch=fetch, ttl=100, refresh_margin=10, clock=clock)
+    provider.token()
+    clock.now = 95
+    assert provider.token() == "tok-1"
+    deadline = time.monotonic() + 2
+    while provider._token != "tok-2" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert provider.token() == "tok-2"
+
+
+def test_failed_background_refreshes_back_off():
+    attempts = []
+
+    def fetch(username, password):
+        attempts.append(username)
+        return "tok-1" if len(attempts) == 1 else None
+
+    def settle(expected):
+        deadline = time.monotonic() + 2
+        while (len(attempts) < expected or provider._inflight is not None) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        return len(attempts)
+
+    clock = FakeClock()
+    provider = TokenProvider("admin", "pw", fetch=fetch, ttl=100, refresh_margin=10, refresh_backoff=5,
+                             clock=clock)
+    provider.token()
+    for now, expected in ((91, 2), (93, 2), (96, 3)):
+        clock.now = now
+        for _ in range(50):
+            assert provider.token() == "tok-1"
+        assert settle(expected) == expected, now
+
+
+def test_concurrent_refreshes_are_deduplicated():
+    fetch, calls = counting_fetch(delay=0.05)
+    provider = TokenProvider("admin", "pw", fetch=fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.token())) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["tok-1"] * 10
+    assert len(calls) == 1
+
+
+def test_call_refreshes_once_on_auth_failure():
+    fetch, calls = counting_fetch()
+    provider = TokenProvider("admin", "pw", fetch=fetch)
+    seen = []
+
+    def fn(token):
+        seen.append(token)
+        return SimpleNamespace(status_code=403 if token == "tok-1" else 201)
+
+    assert provider.call(fn).status_code == 201
+    assert seen == ["tok-1", "tok-2"]
+    # A second caller that still holds the rejected token reuses the new one.
+    assert provider.refresh(stale="tok-1") == "tok-2"
+    assert len(calls) == 2
+
+
+def test_failed_fetch_raises():
+    provider = TokenProvider("admin", "wrong", fetch=lambda u, p: None)
+    with pytest.raises(AuthenticationError):
+        provider.token()
+
+
+def test_providers_are_shared_per_credential_pair():
+    assert get_token_provider("a", "b") is get_token_provider("a", "b")
+    assert get_token_provider("a", "b") is not get_token_provider("a", "c")
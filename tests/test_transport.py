@@ -0,0 +1,67 @@
+import importlib.util
+import socket
+
+import pytest
+import requests
+
+from api.client import APIClient
+from api.resilience import _never_sent
+from api.transport import HttpxSession, build_session, socket_options
+from utils.payloads import booking_payload
+from utils.timing import PhaseRecorder
+
+needs_httpx = pytest.mark.skipif(not importlib.util.find_spec("httpx"), reason="httpx not installed")
+
+
+def test_requests_transport_settings():
+    session = build_session("requests", pool_size=32, keepalive_expiry=5, tcp_nodelay=False)
+    adapter = session.get_adapter("http://example.invalid")
+    assert adapter._pool_maxsize == 32
+    pool = adapter.poolmanager.connection_from_url("http://example.invalid")
+    assert pool.keepalive_expiry == 5 and pool.pool.maxsize == 32
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) not in pool.conn_kw["socket_options"]
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in socket_options(True)
+    with pytest.raises(ValueError):
+        build_session("carrier-pigeon")
+
+
+def test_idle_connections_past_keepalive_expiry_are_replaced(local_server, monkeypatch):
+    client = APIClient(base_url=local_server.url, transport=build_session("requests", keepalive_expiry=30))
+    recorder = client.add_hook(PhaseRecorder())
+    clock = [1000.0]
+    monkeypatch.setattr("api.transport.time.monotonic", lambda: clock[0])
+    try:
+        client.request("GET", "/ping")
+        client.request("GET", "/ping")
+        clock[0] += 31
+        client.request("GET", "/ping")
+    finally:
+        client.remove_hook(recorder)
+    assert client.instrumentation.connections == {"new": 2, "reused": 1}
+
+
+@needs_httpx
+@pytest.mark.parametrize("kind", ["httpx", "http2"])
+def test_httpx_transports_speak_the_same_api(local_server, kind):
+    if kind == "http2":
+        pytest.importorskip("h2")
+    client = APIClient(base_url=local_server.url, transport=kind)
+    assert isinstance(client.session, HttpxSession)
+    created = client.request("POST", "/booking", json=booking_payload())
+    bid = created.json()["bookingid"]
+    assert client.request("GET", f"/booking/{bid}").json()["firstname"] == booking_payload()["firstname"]
+    token = client.request("POST", "/auth", json={"username": "admin", "password": "password123"}).json()["token"]
+    assert client.request("DELETE", f"/booking/{bid}", cookies={"token": token}).status_code == 201
+    client.session.close()
+
+
+@needs_httpx
+def test_httpx_connection_errors_look_like_requests_errors():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    session = HttpxSession()
+    with pytest.raises(requests.ConnectionError) as info:
+        session.request("POST", f"http://127.0.0.1:{port}/booking", json={})
+    assert _never_sent(info.value)
+    session.close()
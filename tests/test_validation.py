@@ -0,0 +1,25 @@
+import pytest
+
+from utils.payloads import booking_payload
+from utils.validation import get_validator, is_valid, validate_many, validate_schema
+
+
+def test_validator_is_compiled_once_per_schema():
+    assert get_validator("booking_object") is get_validator("booking_object")
+
+
+def test_is_valid_fast_path():
+    assert is_valid(booking_payload(), "booking_object")
+    assert not is_valid({"firstname": "Only"}, "booking_object")
+
+
+def test_validate_schema_reports_errors():
+    with pytest.raises(AssertionError, match="<root>: 'lastname' is a required property"):
+        validate_schema({"firstname": "Only"}, "booking_object")
+
+
+def test_validate_many_reports_failing_index():
+    items = [{"bookingid": 1}, {"id": 2}, {"bookingid": "x"}]
+    with pytest.raises(AssertionError, match=r"^Schema validation failed: 2: "):
+        validate_many(items, "bookings_list_item")
+    assert validate_many(items[:2], "bookings_list_item") == 2
@@ -0,0 +1,210 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tools import simple_load
+from tools.histogram import LatencyHistogram, LoadStats
+from utils.config import LOCAL_SERVER, SLO_ERROR_RATE, SLO_P99_MS
+from utils.payloads import BookingGenerator
+
+# A level also fails when the server completes less than this share of the
+# offered rate: past saturation the queue grows and latency only lags behind.
+SUSTAIN_RATIO = 0.9
+CSV_FIELDS = ("offered_rps", "achieved_rps", "requests", "error_rate", "p50_ms", "p95_ms", "p99_ms",
+              "flow_p99_ms", "max_start_lag_ms", "passed", "reason")
+
+Slo = namedtuple("Slo", "p99_ms error_rate sustain_ratio")
+DEFAULT_SLO = Slo(SLO_P99_MS, SLO_ERROR_RATE, SUSTAIN_RATIO)
+
+
+def request_histogram(stats):
+    # Every request the workflow sends, without the per-task "flow" timing.
+    merged = LatencyHistogram()
+    for op, hist in stats.histograms.items():
+        if op != "flow":
+            merged.merge(hist)
+    return merged
+
+
+def _round(ms):
+    return round(ms, 2) if ms is not None else None
+
+
+def evaluate(rate, steady, elapsed, slo=DEFAULT_SLO, start_lag_ms=None):
+    """Score one level's steady-state stats against the SLO."""
+    hist = request_histogram(steady)
+    flows = steady.histograms.get("flow")
+    tasks = flows.count if flows is not None else 0
+    row = {
+        "offered_rps": rate,
+        "achieved_rps": round(tasks / elapsed, 2) if elapsed else 0.0,
+        "requests": hist.count,
+        "error_rate": round(hist.errors / hist.count, 4) if hist.count else None,
+        "p50_ms": _round(hist.percentile(50)),
+        "p95_ms": _round(hist.percentile(95)),
+        "p99_ms": _round(hist.percentile(99)),
+        "flow_p99_ms": _round(flows.percentile(99)) if flows is not None else None,
+        "max_start_lag_ms": start_lag_ms,
+    }
+    reasons = []
+    if not hist.count:
+        reasons.append("no requests completed")
+    else:
+        if row["p99_ms"] > slo.p99_ms:
+            reasons.append(f"p99 {row['p99_ms']:.1f} ms > {slo.p99_ms:g} ms")
+        if row["error_rate"] > slo.error_rate:
+            reasons.append(f"error rate {row['error_rate']:.2%} > {slo.error_rate:.2%}")
+        if row["achieved_rps"] < rate * slo.sustain_ratio:
+            reasons.append(f"achieved {row['achieved_rps']:g}/s of {rate:g}/s")
+    row["passed"] = not reasons
+    row["reason"] = "; ".join(reasons)
+    return row
+
+
+def measure(rate, warmup, window, workers, slo=DEFAULT_SLO, seed=None):
+    """Offer ``rate`` booking workflows per second open-loop for warmup + window.
+
+    Only the window counts: the stats are snapshotted once the warmup is
+    over, and the window is closed when the last scheduled task has finished,
+    so work still queued at the end is not dropped from the latencies.
+    """
+    stats = LoadStats(simple_load.OPERATIONS)
+    tokens = simple_load.token_provider(stats)
+    next_payload = BookingGenerator(seed).stream(serialized=True)
+    warm = {"stats": LoadStats(), "at": time.perf_counter()}
+
+    def end_warmup():
+        warm["stats"], warm["at"] = stats.copy(), time.perf_counter()
+
+    timer = threading.Timer(warmup, end_warmup)
+    timer.start()
+    try:
+        result = simple_load.run_open_loop(stats, tokens, next_payload, seed=seed, rate=rate,
+                                           duration=warmup + window, workers=workers)
+    finally:
+        timer.cancel()
+    elapsed = time.perf_counter() - warm["at"]
+    return evaluate(rate, stats.since(warm["stats"]), elapsed, slo, result["max_start_lag_ms"])
+
+
+def step_search(measure_rate, start, step, max_rate):
+    """Raise the offered rate by ``step`` until a level misses the SLO."""
+    rows = []
+    rate = start
+    while rate <= max_rate + 1e-9:
+        rows.append(measure_rate(rate))
+        if not rows[-1]["passed"]:
+            break
+        rate = round(rate + step, 3)
+    return rows
+
+
+def binary_search(measure_rate, low, high, tolerance=0.05):
+    """Double from ``low`` until a level fails (or ``high`` passes), then bisect.
+
+    Doubling first avoids opening with a badly overloaded level whose backlog
+    takes minutes to drain. Bisection stops once the passing and failing
+    rates are within ``tolerance`` of each other.
+    """
+    rows = [measure_rate(low)]
+    if not rows[-1]["passed"]:
+        return rows
+    while True:
+        rate = min(low * 2, high)
+        rows.append(measure_rate(rate))
+        if not rows[-1]["passed"]:
+            high = rate
+            break
+        low = rate
+        if rate >= high:
+            return rows
+    while high - low > max(tolerance * low, 0.1):
+        mid = round((low + high) / 2, 1)
+        if mid in (low, high):
+            break
+        rows.append(measure_rate(mid))
+        if rows[-1]["passed"]:
+            low = mid
+        else:
+            high = mid
+    return rows
+
+
+def report(rows, slo, search):
+    passed = [row["offered_rps"] for row in rows if row["passed"]]
+    return {
+        "capacity_rps": max(passed) if passed else None,
+        "slo": slo._asdict(),
+        "search": search,
+        "levels": sorted(rows, key=lambda row: row["offered_rps"]),
+    }
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in sorted(rows, key=lambda row: row["offered_rps"]):
+            writer.writerow({k: row.get(k) for k in CSV_FIELDS})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Find the highest booking-workflow rate that meets the latency/error SLO.")
+    parser.add_argument("--search", choices=("binary", "step"), default="binary")
+    parser.add_argument("--min-rate", type=float, default=5.0, help="first rate tried (workflows/s)")
+    parser.add_argument("--max-rate", type=float, default=200.0)
+    parser.add_argument("--step", type=float, default=10.0, help="step search increment")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="binary search stops within this share")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds per level not measured")
+    parser.add_argument("--window", type=float, default=30.0, help="measured seconds per level")
+    parser.add_argument("--workers", type=int, default=50, help="open-loop sender threads")
+    parser.add_argument("--p99-ms", type=float, default=SLO_P99_MS)
+    parser.add_argument("--max-error-rate", type=float, default=SLO_ERROR_RATE)
+    parser.add_argument("--csv", help="write the latency-vs-throughput curve here")
+    parser.add_argument("--json", help="write the full report here")
+    args = parser.parse_args(argv)
+
+    slo = Slo(args.p99_ms, args.max_error_rate, SUSTAIN_RATIO)
+    local = None
+    if LOCAL_SERVER:
+        from server import LocalBookerServer
+        local = LocalBookerServer().start()
+        simple_load.BASE_URL = local.url
+
+    def measure_rate(rate):
+        row = measure(rate, args.warmup, args.window, args.workers, slo)
+        print(json.dumps(row), file=sys.stderr, flush=True)
+        return row
+
+    try:
+        if args.search == "step":
+            rows = step_search(measure_rate, args.min_rate, args.step, args.max_rate)
+        else:
+            rows = binary_search(measure_rate, args.min_rate, args.max_rate, args.tolerance)
+    finally:
+        if local is not None:
+            local.stop()
+    search = {k: getattr(args, k) for k in ("search", "min_rate", "max_rate", "step", "tolerance", "warmup",
+                                             "window", "workers")}
+    result = report(rows, slo, search)
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+    print(json.dumps(result, indent=2))
+    return 0 if result["capacity_rps"] is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
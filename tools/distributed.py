@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from tools import metrics, open_loop, scenario, simple_load
+from tools.histogram import LoadStats
+from utils.config import LOCAL_SERVER
+
+DEFAULT_PORT = 5557
+# simple_load settings the controller hands to every agent.
+SETTINGS = ("MODE", "RATE", "RATE_PROFILE", "RAMP", "USERS", "DURATION", "BOOKING_POOL")
+SYNC_ROUNDS = 5
+START_LEAD = 1.0
+
+
+class Connection:
+    """Newline-delimited JSON messages over one TCP socket."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self._reader = sock.makefile("rb")
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        data = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+        with self._lock:
+            self.sock.sendall(data)
+
+    def receive(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("peer closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def measure_offset(conn, rounds=SYNC_ROUNDS):
+    # NTP-style: the agent's clock minus ours, from the round trip with the
+    # least delay. Agents on other machines need not share a synced clock.
+    best = None
+    for _ in range(rounds):
+        sent = time.time()
+        conn.send({"type": "sync"})
+        reply = conn.receive()
+        received = time.time()
+        rtt = received - sent
+        if best is None or rtt < best[0]:
+            best = (rtt, reply["now"] - (sent + received) / 2)
+    return best[1]
+
+
+class Controller:
+    """Hands the scenario and a rate share to each agent and merges what they stream back.
+
+    Agents report cumulative histograms, so the latest snapshot per agent is
+    all that is kept; merging them gives the fleet-wide numbers at any time.
+    """
+
+    def __init__(self, agents, host="127.0.0.1", port=DEFAULT_PORT, base_url=None, lead=START_LEAD):
+        self.expected = agents
+        self.base_url = base_url or simple_load.BASE_URL
+        self.lead = lead
+        self.server = socket.create_server((host, port))
+        self.connections = []
+        self.names = []
+        self.latest = {}
+
+    @property
+    def address(self):
+        return self.server.getsockname()[:2]
+
+    def accept(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while len(self.connections) < self.expected:
+            self.server.settimeout(max(0.01, deadline - time.monotonic()))
+            try:
+                sock, _ = self.server.accept()
+            except socket.timeout:
+                raise TimeoutError(f"only {len(self.connections)} of {self.expected} agents connected") from None
+            sock.settimeout(10)
+            conn = Connection(sock)
+            try:
+                hello = conn.receive()
+            except (ConnectionError, OSError, ValueError):
+                hello = {}
+            if hello.get("type") != "hello":
+                conn.close()
+                continue
+            sock.settimeout(None)
+            self.connections.append(conn)
+            self.names.append(hello.get("name") or f"agent-{len(self.names)}")
+
+    def run(self):
+        count = len(self.connections)
+        settings = {name: getattr(simple_load, name) for name in SETTINGS}
+        for index, conn in enumerate(self.connections):
+            conn.send({"type": "prepare", "index": index, "count": count, "base_url": self.base_url,
+                       "settings": settings, "scenario": simple_load.SCENARIO.spec,
+                       "interval": simple_load.push_interval()})
+        # Agents report ready once their set-up (e.g. the booking pool) is done,
+        # so the start time is only chosen when every agent can meet it.
+        lost, finished = [], set()
+        for index, conn in enumerate(self.connections):
+            try:
+                while conn.receive()["type"] != "ready":
+                    pass
+            except (ConnectionError, OSError, ValueError):
+                finished.add(index)
+                lost.append(self.names[index])
+        ready = [index for index in range(count) if index not in finished]
+        offsets = {index: measure_offset(self.connections[index]) for index in ready}
+        start_at = time.time() + self.lead + 0.05 * count
+        for index in ready:
+            self.connections[index].send({"type": "run", "start_at": start_at + offsets[index]})
+
+        results = queue.Queue()
+        for index in ready:
+            threading.Thread(target=self._read, args=(index, self.connections[index], results),
+                             daemon=True).start()
+
+        extras = []
+        last_report = time.monotonic()
+        try:
+            while len(finished) < count:
+                kind, index, data, extra = results.get()
+                if kind == "lost":
+                    finished.add(index)
+                    lost.append(self.names[index])
+                    continue
+                self.latest[index] = data
+                if kind == "final":
+                    finished.add(index)
+                    if extra:
+                        extras.append(extra["open_loop"])
+                elif 0 < simple_load.REPORT_INTERVAL <= time.monotonic() - last_report:
+                    last_report = time.monotonic()
+                    print(json.dumps({"elapsed_s": round(time.time() - start_at, 1),
+                                      "interim": self.merged().summary(time.time() - start_at)}),
+                          file=sys.stderr, flush=True)
+        except KeyboardInterrupt:
+            self.stop()
+            raise
+
+        elapsed = max(time.time() - start_at, 1e-9) if simple_load.MODE == "open" else simple_load.run_duration()
+        extra = {"agents": count}
+        if extras:
+            extra["open_loop"] = open_loop.merge_results(extras)
+        if lost:
+            extra["lost_agents"] = lost
+        return self.merged(), extra, elapsed
+
+    def _read(self, index, conn, results):
+        try:
+            while True:
+                message = conn.receive()
+                if message["type"] == "stats":
+                    results.put(("final" if message["final"] else "interim", index, message["stats"],
+                                 message.get("extra")))
+                    if message["final"]:
+                        return
+        except (ConnectionError, OSError, ValueError):
+            results.put(("lost", index, None, None))
+
+    def merged(self):
+        return simple_load.merge_stats(list(self.latest.values()))
+
+    def stop(self):
+        for conn in self.connections:
+            try:
+                conn.send({"type": "stop"})
+            except OSError:
+                pass
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+        self.server.close()
+
+
+def run_agent(host, port=DEFAULT_PORT, name=None, connect_timeout=30):
+    """Connect to a controller, run the share it hands out and stream stats back."""
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port), timeout=5)
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+    sock.settimeout(None)
+    conn = Connection(sock)
+    conn.send({"type": "hello", "name": name or f"{socket.gethostname()}-{os.getpid()}"})
+    try:
+        while True:
+            message = conn.receive()
+            if message["type"] == "sync":
+                conn.send({"type": "sync", "now": time.time()})
+            elif message["type"] == "prepare":
+                job = message
+                pool = _prepare(job)
+                conn.send({"type": "ready"})
+            elif message["type"] == "run":
+                _run_share(conn, {**job, **message}, pool)
+                return
+    finally:
+        conn.close()
+
+
+def _prepare(job):
+    for name, value in job["settings"].items():
+        setattr(simple_load, name, value)
+    simple_load.BASE_URL = job["base_url"]
+    simple_load.SCENARIO = scenario.Scenario(job["scenario"])
+    return simple_load.booking_pool(job["index"])
+
+
+def _run_share(conn, job, pool=None):
+    stop = threading.Event()
+
+    def listen():
+        try:
+            while conn.receive()["type"] != "stop":
+                pass
+        except (ConnectionError, OSError, ValueError):
+            pass
+        stop.set()
+
+    threading.Thread(target=listen, daemon=True).start()
+    # start_at is already in this machine's clock; histograms are only created
+    # once the shared window opens.
+    start_at = job["start_at"]
+    time.sleep(max(0.0, start_at - time.time()))
+    stats = LoadStats(simple_load.OPERATIONS)
+    done = threading.Event()
+
+    def push():
+        while not done.wait(job["interval"]):
+            conn.send({"type": "stats", "final": False, "stats": stats.to_dict()})
+
+    if job["interval"] > 0:
+        threading.Thread(target=push, daemon=True).start()
+    extra = simple_load.run_load(stats, share=1.0 / job["count"], end=start_at + simple_load.run_duration(),
+                                 stop=stop, seed=job["index"], pool=pool)
+    done.set()
+    conn.send({"type": "stats", "final": True, "stats": stats.to_dict(), "extra": extra})
+
+
+def spawn_local_agents(count, host, port):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [PROJECT_ROOT, os.getenv("PYTHONPATH")]))}
+    return [subprocess.Popen([sys.executable, "-m", "tools.distributed", "agent", f"{host}:{port}",
+                              "--name", f"local-{i}"], cwd=PROJECT_ROOT, env=env)
+            for i in range(count)]
+
+
+def _address(value):
+    host, _, port = value.rpartition(":")
+    return (host or "127.0.0.1"), int(port or DEFAULT_PORT)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run tools/simple_load across several machines.")
+    sub = parser.add_subparsers(dest="role", required=True)
+    ctl = sub.add_parser("controller", help="hand out the run and merge the agents' results")
+    ctl.add_argument("--agents", type=int, required=True, help="number of agents to wait for")
+    ctl.add_argument("--bind", default="127.0.0.1:%d" % DEFAULT_PORT, help="host:port to listen on")
+    ctl.add_argument("--local-agents", action="store_true", help="start the agents on this machine")
+    ctl.add_argument("--wait", type=float, default=60, help="seconds to wait for agents to connect")
+    agent = sub.add_parser("agent", help="connect to a controller and generate load")
+    agent.add_argument("controller", help="controller host:port")
+    agent.add_argument("--name")
+    args = parser.parse_args(argv)
+
+    if args.role == "agent":
+        host, port = _address(args.controller)
+        run_agent(host, port, args.name)
+        return 0
+
+    local = None
+    if LOCAL_SERVER:
+        from server import LocalBookerServer
+        local = LocalBookerServer().start()
+        simple_load.BASE_URL = local.url
+    host, port = _address(args.bind)
+    controller = Controller(args.agents, host, port)
+    procs = spawn_local_agents(args.agents, *controller.address) if args.local_agents else []
+    exporter = None
+    try:
+        controller.accept(args.wait)
+        exporter = metrics.start_from_config(controller.merged, "distributed")
+        stats, extra, elapsed = controller.run()
+    finally:
+        if exporter is not None:
+            exporter.stop()
+        controller.close()
+        for proc in procs:
+            proc.wait(timeout=30)
+        if local is not None:
+            local.stop()
+    simple_load.summarize(stats, extra=extra, elapsed_s=elapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+import math
+import threading
+import time
+
+# Log-linear buckets over integer microseconds: values below SUB_BUCKETS get their
+# own bucket, above that every power of two is split into HALF_BUCKETS equal
+# slices, which keeps the relative error under 1/HALF_BUCKETS (~1.6%).
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_BUCKETS = SUB_BUCKETS // 2
+MAX_SHIFT = 26  # covers up to ~2**32 us, a bit over an hour
+BUCKET_COUNT = SUB_BUCKETS + MAX_SHIFT * HALF_BUCKETS
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def bucket_index(value_us):
+    if value_us < SUB_BUCKETS:
+        return max(0, value_us)
+    shift = value_us.bit_length() - SUB_BUCKET_BITS
+    if shift > MAX_SHIFT:
+        return BUCKET_COUNT - 1
+    return SUB_BUCKETS + (shift - 1) * HALF_BUCKETS + (value_us >> shift) - HALF_BUCKETS
+
+
+def bucket_bounds(index):
+    if index < SUB_BUCKETS:
+        return index, index + 1
+    k = index - SUB_BUCKETS
+    shift = k // HALF_BUCKETS + 1
+    low = (k % HALF_BUCKETS + HALF_BUCKETS) << shift
+    return low, low + (1 << shift)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.errors = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = None
+
+    def record(self, latency_ms, ok=True):
+        value = int(latency_ms * 1000)
+        idx = bucket_index(value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.total_us += value
+            if self.min_us is None or value < self.min_us:
+                self.min_us = value
+            if self.max_us is None or value > self.max_us:
+                self.max_us = value
+            if not ok:
+                self.errors += 1
+
+    def merge(self, other):
+        with other._lock:
+            counts = list(other.counts)
+            count, errors, total = other.count, other.errors, other.total_us
+            lo, hi = other.min_us, other.max_us
+        with self._lock:
+            for i, c in enumerate(counts):
+                if c:
+                    self.counts[i] += c
+            self.count += count
+            self.errors += errors
+            self.total_us += total
+            if lo is not None and (self.min_us is None or lo < self.min_us):
+                self.min_us = lo
+            if hi is not None and (self.max_us is None or hi > self.max_us):
+                self.max_us = hi
+        return self
+
+    def copy(self):
+        return LatencyHistogram().merge(self)
+
+    def since(self, earlier):
+        """Histogram of what was recorded after ``earlier`` (a copy of self)."""
+        delta = LatencyHistogram()
+        with self._lock:
+            counts = list(self.counts)
+            delta.count = self.count - earlier.count
+            delta.errors = self.errors - earlier.errors
+            delta.total_us = self.total_us - earlier.total_us
+        for i, (now, before) in enumerate(zip(counts, earlier.counts)):
+            if now != before:
+                delta.counts[i] = now - before
+                # Exact extremes are lost in a difference; bucket edges stand in.
+                low, high = bucket_bounds(i)
+                if delta.min_us is None:
+                    delta.min_us = low
+                delta.max_us = high - 1
+        return delta
+
+    def cumulative(self, bounds_ms):
+        """Counts at or below each bound, as exported in "le" histogram buckets."""
+        out, seen, idx = [], 0, 0
+        with self._lock:
+            counts = list(self.counts)
+        for bound in bounds_ms:
+            limit = bound * 1000
+            while idx < BUCKET_COUNT and bucket_bounds(idx)[1] - 1 <= limit:
+                seen += counts[idx]
+                idx += 1
+            out.append(seen)
+        return out
+
+    def percentile(self, pct):
+        with self._lock:
+            return self._percentile_us(pct) / 1000.0 if self.count else None
+
+    def _percentile_us(self, pct):
+        target = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                low, high = bucket_bounds(idx)
+                mid = (low + high - 1) / 2.0
+                return min(max(mid, self.min_us), self.max_us)
+        return self.max_us
+
+    def summary(self, elapsed_s=None):
+        with self._lock:
+            if not self.count:
+                return {"count": 0, "errors": self.errors}
+            out = {
+                "count": self.count,
+                "errors": self.errors,
+                "error_rate": round(self.errors / self.count, 4),
+                "mean_ms": round(self.total_us / self.count / 1000.0, 2),
+                "min_ms": round(self.min_us / 1000.0, 2),
+                "max_ms": round(self.max_us / 1000.0, 2),
+            }
+            for pct in PERCENTILES:
+                out[f"p{pct:g}_ms".replace(".", "_")] = round(self._percentile_us(pct) / 1000.0, 2)
+            if elapsed_s:
+                out["throughput_rps"] = round(self.count / elapsed_s, 2)
+            return out
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "counts": {i: c for i, c in enumerate(self.counts) if c},
+                "count": self.count,
+                "errors": self.errors,
+                "total_us": self.total_us,
+                "min_us": self.min_us,
+                "max_us": self.max_us,
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls()
+        for i, c in data["counts"].items():
+            hist.counts[int(i)] = c
+        hist.count = data["count"]
+        hist.errors = data["errors"]
+        hist.total_us = data["total_us"]
+        hist.min_us = data["min_us"]
+        hist.max_us = data["max_us"]
+        return hist
+
+
+class LoadStats:
+    def __init__(self, operations=()):
+        self._lock = threading.Lock()
+        self.histograms = {op: LatencyHistogram() for op in operations}
+        self.started = time.monotonic()
+
+    def histogram(self, op):
+        hist = self.histograms.get(op)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(op, LatencyHistogram())
+        return hist
+
+    def record(self, op, latency_ms, ok=True):
+        self.histogram(op).record(latency_ms, ok)
+
+    def merge(self, other):
+        for op, hist in list(other.histograms.items()):
+            self.histogram(op).merge(hist)
+        return self
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def copy(self):
+        return LoadStats().merge(self)
+
+    def since(self, earlier):
+        delta = LoadStats()
+        delta.started = earlier.started
+        delta.histograms = {op: hist.since(earlier.histograms.get(op) or LatencyHistogram())
+                            for op, hist in list(self.histograms.items())}
+        return delta
+
+    def summary(self, elapsed_s=None):
+        elapsed_s = elapsed_s or self.elapsed()
+        return {op: hist.summary(elapsed_s) for op, hist in list(self.histograms.items())}
+
+    def to_dict(self):
+        return {op: hist.to_dict() for op, hist in list(self.histograms.items())}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for op, hist in data.items():
+            stats.histograms[op] = LatencyHistogram.from_dict(hist)
+        return stats
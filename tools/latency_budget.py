@@ -0,0 +1,227 @@
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import pytest
+
+from api.client import endpoint_name
+from tools.histogram import LoadStats
+from utils.config import LATENCY_BUDGET_MODE, LOCAL_SERVER
+
+MODES = ("enforce", "report", "off")
+BUDGET_KEYS = ("p50", "p95")
+# Calls the suite's own infrastructure makes, not the API under test.
+DEFAULT_EXCLUDE = ("GET /metrics",)
+
+_untimed = threading.local()
+
+
+@contextmanager
+def untimed():
+    """Leave the HTTP calls made in this block (on this thread) out of the budgets."""
+    previous = getattr(_untimed, "active", False)
+    _untimed.active = True
+    try:
+        yield
+    finally:
+        _untimed.active = previous
+
+
+def default_mode():
+    # Budgets only fail the run against the in-process server, where latency
+    # is the code's own; against a remote host the table is informational.
+    return LATENCY_BUDGET_MODE or ("enforce" if LOCAL_SERVER else "report")
+
+
+class BudgetError(ValueError):
+    pass
+
+
+def parse_budget(spec):
+    # "p50=200 p95=800" -> {"p50": 200.0, "p95": 800.0}
+    budget = {}
+    for part in spec.replace(",", " ").split():
+        key, _, value = part.partition("=")
+        if key not in BUDGET_KEYS or not value:
+            raise BudgetError(f"Bad latency budget {part!r}; expected p50=<ms> and/or p95=<ms>")
+        budget[key] = float(value)
+    return budget
+
+
+def parse_budgets(lines):
+    # One "<endpoint>: p50=<ms> p95=<ms>" per line; "*" applies to every endpoint
+    # without a line of its own.
+    budgets = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        endpoint, sep, spec = line.rpartition(":")
+        if not sep or not endpoint.strip():
+            raise BudgetError(f"Bad latency_budgets line {line!r}; expected '<METHOD /path>: p95=<ms>'")
+        budgets[endpoint.strip()] = parse_budget(spec)
+    return budgets
+
+
+def violations(stats, budgets, min_samples=1):
+    """``(endpoint, key, actual_ms, budget_ms)`` for every budget exceeded."""
+    out = []
+    for endpoint, hist in sorted(stats.histograms.items()):
+        budget = budgets.get(endpoint, budgets.get("*"))
+        if not budget or hist.count < min_samples:
+            continue
+        for key, limit in sorted(budget.items()):
+            actual = hist.percentile(float(key[1:]))
+            if actual > limit:
+                out.append((endpoint, key, actual, limit))
+    return out
+
+
+def format_violations(found):
+    return "; ".join(f"{endpoint} {key} {actual:.1f} ms > {limit:g} ms" for endpoint, key, actual, limit in found)
+
+
+class LatencyBudgetPlugin:
+    """Times every HTTP call the tests make and checks per-endpoint budgets.
+
+    Calls are aggregated per endpoint (``PUT /booking/{id}``) whether they go
+    through APIClient or straight through ``requests`` in a fixture. Budgets
+    come from the ``latency_budgets`` ini option (whole session) or a
+    ``latency_budget`` marker (calls made by that one test).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.mode = config.getoption("latency_budget_mode") or config.getini("latency_budget_mode") or default_mode()
+        if self.mode not in MODES:
+            raise pytest.UsageError(f"latency_budget_mode must be one of {', '.join(MODES)}")
+        self.budgets = parse_budgets(config.getini("latency_budgets"))
+        self.min_samples = int(config.getini("latency_budget_min_samples") or 1)
+        self.exclude = set(config.getini("latency_budget_exclude"))
+        self.stats = LoadStats()
+        self.current = None
+        self.failed = []
+        self._patch = pytest.MonkeyPatch()
+
+    def record(self, method, url, elapsed_ms, ok):
+        if getattr(_untimed, "active", False):
+            return
+        endpoint = endpoint_name(method, urlsplit(url).path)
+        if endpoint in self.exclude:
+            return
+        self.stats.record(endpoint, elapsed_ms, ok)
+        current = self.current
+        if current is not None:
+            current.record(endpoint, elapsed_ms, ok)
+
+    def install(self):
+        import requests
+        from api.transport import HttpxSession
+
+        plugin = self
+        send, httpx_request = requests.Session.send, HttpxSession.request
+
+        # requests.Session.send covers APIClient's default transport and every
+        # plain requests.get/post in fixtures; HttpxSession covers the others.
+        # The two never call each other, so no request is counted twice.
+        def timed_send(self, request, **kwargs):
+            t0 = time.perf_counter()
+            resp = send(self, request, **kwargs)
+            plugin.record(request.method, request.url, (time.perf_counter() - t0) * 1000.0, resp.status_code < 500)
+            return resp
+
+        def timed_httpx_request(self, method, url, *args, **kwargs):
+            t0 = time.perf_counter()
+            resp = httpx_request(self, method, url, *args, **kwargs)
+            plugin.record(method, url, (time.perf_counter() - t0) * 1000.0, resp.status_code < 500)
+            return resp
+
+        self._patch.setattr(requests.Session, "send", timed_send)
+        self._patch.setattr(HttpxSession, "request", timed_httpx_request)
+
+    def pytest_sessionstart(self, session):
+        self.install()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        if item.get_closest_marker("latency_budget") is not None:
+            self.current = LoadStats()
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        outcome = yield
+        current, self.current = self.current, None
+        if current is None or outcome.excinfo is not None or self.mode != "enforce":
+            return
+        budgets = {}
+        for marker in item.iter_markers("latency_budget"):
+            endpoint = marker.args[0] if marker.args else marker.kwargs.get("endpoint", "*")
+            budgets.setdefault(endpoint, {k: float(v) for k, v in marker.kwargs.items() if k in BUDGET_KEYS})
+        found = violations(current, budgets)
+        if found:
+            outcome.force_exception(pytest.fail.Exception(
+                f"Latency budget exceeded: {format_violations(found)}", pytrace=False))
+
+    def pytest_runtest_teardown(self, item):
+        self.current = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # pytest-xdist: each worker ships its histograms back to the controller.
+        data = getattr(node, "workeroutput", {}).get("latency_budget")
+        if data:
+            self.stats.merge(LoadStats.from_dict(data))
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self._patch.undo()
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["latency_budget"] = self.stats.to_dict()
+            return
+        if self.mode == "enforce":
+            self.failed = violations(self.stats, self.budgets, self.min_samples)
+            if self.failed and session.exitstatus == pytest.ExitCode.OK:
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if getattr(self.config, "workeroutput", None) is not None or not self.stats.histograms:
+            return
+        tr = terminalreporter
+        tr.section("latency budgets")
+        tr.write_line(f"{'endpoint':<28} {'count':>6} {'errors':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  "
+                      f"budget")
+        failed = {(endpoint, key) for endpoint, key, _, _ in self.failed}
+        for endpoint, hist in sorted(self.stats.histograms.items()):
+            p50, p95, p99 = (hist.percentile(pct) for pct in (50, 95, 99))
+            budget = self.budgets.get(endpoint, self.budgets.get("*")) or {}
+            limits = " ".join(f"{k}={v:g}{' FAIL' if (endpoint, k) in failed else ''}"
+                              for k, v in sorted(budget.items()))
+            tr.write_line(f"{endpoint[-28:]:<28} {hist.count:>6} {hist.errors:>6} {p50:>7.1f}ms {p95:>7.1f}ms "
+                          f"{p99:>7.1f}ms {hist.max_us / 1000:>7.1f}ms  {limits or '-'}")
+        if self.failed:
+            tr.write_line(f"Latency budget exceeded: {format_violations(self.failed)}", red=True, bold=True)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("latency-budget")
+    group.addoption("--latency-budget-mode", choices=MODES, default=None,
+                    help="enforce (default): fail on exceeded budgets; report: table only; off: no timing")
+    parser.addini("latency_budgets", type="linelist",
+                  help="per-endpoint session budgets, one '<METHOD /path>: p50=<ms> p95=<ms>' per line")
+    parser.addini("latency_budget_mode", default="",
+                  help="enforce, report or off; defaults to enforce under RB_LOCAL_SERVER, report otherwise")
+    parser.addini("latency_budget_min_samples", default="1",
+                  help="endpoints with fewer calls are not checked against the session budgets")
+    parser.addini("latency_budget_exclude", type="linelist", default=list(DEFAULT_EXCLUDE),
+                  help="endpoints ('<METHOD /path>') that are never timed, e.g. test infrastructure")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "latency_budget(endpoint='*', p50=None, p95=None): latency budget in ms for the calls this "
+                   "test makes to endpoint")
+    mode = config.getoption("latency_budget_mode") or config.getini("latency_budget_mode") or default_mode()
+    if mode != "off" and not config.pluginmanager.has_plugin("latency-budget"):
+        config.pluginmanager.register(LatencyBudgetPlugin(config), "latency-budget")
@@ -0,0 +1,214 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tools.histogram import LatencyHistogram, LoadStats
+from utils.config import METRICS_INTERVAL, METRICS_JSONL, METRICS_PORT
+
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LiveMetrics:
+    """Per-endpoint metrics read from a driver's cumulative LoadStats.
+
+    ``source`` returns the current cumulative stats; nothing is added to the
+    drivers' hot path. ``snapshot()`` turns the difference since the previous
+    snapshot into one time bucket, which also feeds the rate gauges.
+    """
+
+    def __init__(self, source, driver, clock=time.time):
+        self.source = source
+        self.driver = driver
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._previous = LoadStats()
+        self._previous_at = clock()
+        self._window = {}
+
+    def snapshot(self):
+        with self._lock:
+            now = self._clock()
+            current = self.source().copy()
+            delta = current.since(self._previous)
+            interval = max(now - self._previous_at, 1e-9)
+            self._previous, self._previous_at = current, now
+            ops = {}
+            for op, hist in delta.histograms.items():
+                entry = hist.summary(interval)
+                entry["rate_rps"] = round(hist.count / interval, 3)
+                entry["histogram"] = hist.to_dict()
+                ops[op] = entry
+            self._window = {op: (e["rate_rps"], e.get("error_rate", 0.0)) for op, e in ops.items()}
+        return {"ts": round(now, 3), "interval_s": round(interval, 3), "driver": self.driver, "ops": ops}
+
+    def render(self):
+        stats = self.source().copy()
+        with self._lock:
+            window = dict(self._window)
+        driver = _escape(self.driver)
+        hists = sorted(stats.histograms.items())
+        families = (
+            ("rb_requests", "counter", "Requests completed.", "_total", lambda op, h: h.count),
+            ("rb_request_errors", "counter", "Requests that failed.", "_total", lambda op, h: h.errors),
+            ("rb_request_rate", "gauge", "Requests per second over the last snapshot interval.", "",
+             lambda op, h: window.get(op, (0.0, 0.0))[0]),
+            ("rb_request_error_ratio", "gauge", "Failed share of requests over the last snapshot interval.", "",
+             lambda op, h: window.get(op, (0.0, 0.0))[1]),
+        )
+        lines = []
+        for name, kind, help_text, suffix, value in families:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for op, hist in hists:
+                lines.append(f'{name}{suffix}{{driver="{driver}",endpoint="{_escape(op)}"}} {value(op, hist)}')
+        name = "rb_request_latency_seconds"
+        lines += [f"# HELP {name} Request latency.", f"# TYPE {name} histogram", f"# UNIT {name} seconds"]
+        for op, hist in hists:
+            labels = f'driver="{driver}",endpoint="{_escape(op)}"'
+            for bound, count in zip(LATENCY_BUCKETS_MS, hist.cumulative(LATENCY_BUCKETS_MS)):
+                lines.append(f'{name}_bucket{{{labels},le="{bound / 1000:g}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"{name}_count{{{labels}}} {hist.count}")
+            lines.append(f"{name}_sum{{{labels}}} {hist.total_us / 1e6:.6f}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, metrics, host="127.0.0.1", port=0):
+        super().__init__((host, port), _MetricsHandler)
+        self.metrics = metrics
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+
+class MetricsExporter:
+    """Serves ``/metrics`` and/or appends one JSONL snapshot per interval."""
+
+    def __init__(self, metrics, port=None, jsonl_path=None, interval=METRICS_INTERVAL, host="127.0.0.1"):
+        self.metrics = metrics
+        self.interval = interval
+        self.jsonl_path = jsonl_path
+        self.server = MetricsServer(metrics, host, port) if port is not None else None
+        self._done = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self.server is not None:
+            self._threads.append(threading.Thread(target=self.server.serve_forever, daemon=True))
+        self._threads.append(threading.Thread(target=self._snapshots, daemon=True))
+        for t in self._threads:
+            t.start()
+        return self
+
+    def _snapshots(self):
+        while not self._done.wait(self.interval):
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        record = self.metrics.snapshot()
+        if self.jsonl_path:
+            with open(self.jsonl_path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return record
+
+    def stop(self):
+        # The last partial interval is flushed so the file covers the whole run.
+        self._done.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        for t in self._threads:
+            t.join()
+        self.write_snapshot()
+
+
+def start_from_config(source, driver, port_offset=0):
+    # port_offset lets several exporters on one host share RB_METRICS_PORT as a base.
+    if not METRICS_PORT and not METRICS_JSONL:
+        return None
+    return MetricsExporter(LiveMetrics(source, driver), port=METRICS_PORT + port_offset if METRICS_PORT else None,
+                           jsonl_path=METRICS_JSONL or None).start()
+
+
+def read_snapshots(path):
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay(path, driver=None):
+    """Merge every snapshot in a JSONL stream back into one LoadStats."""
+    stats = LoadStats()
+    for record in read_snapshots(path):
+        if driver is None or record["driver"] == driver:
+            for op, entry in record["ops"].items():
+                stats.histogram(op).merge(LatencyHistogram.from_dict(entry["histogram"]))
+    return stats
+
+
+def _duration(path):
+    return sum(record["interval_s"] for record in read_snapshots(path))
+
+
+def diff(path_a, path_b):
+    a, b = replay(path_a).summary(_duration(path_a)), replay(path_b).summary(_duration(path_b))
+    out = {}
+    for op in sorted(set(a) | set(b)):
+        row = {}
+        for key in ("count", "error_rate", "throughput_rps", "p50_ms", "p99_ms"):
+            before, after = a.get(op, {}).get(key), b.get(op, {}).get(key)
+            row[key] = {"a": before, "b": after}
+            if isinstance(before, (int, float)) and isinstance(after, (int, float)) and before:
+                row[key]["change"] = round((after - before) / before, 4)
+        out[op] = row
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise or diff JSONL metrics streams from load runs.")
+    parser.add_argument("command", choices=("summary", "diff"))
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+    if args.command == "summary":
+        path = args.files[0]
+        report = replay(path).summary(_duration(path))
+    else:
+        if len(args.files) != 2:
+            parser.error("diff needs two files")
+        report = diff(*args.files)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import queue
+import random
+import threading
+import time
+
+
+def constant(rate, duration):
+    n = int(rate * duration)
+    return [i / rate for i in range(n)]
+
+
+def poisson(rate, duration, seed=None):
+    rng = random.Random(seed)
+    offsets = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        offsets.append(t)
+        t += rng.expovariate(rate)
+    return offsets
+
+
+def stepped(stages):
+    offsets = []
+    start = 0.0
+    for rate, duration in stages:
+        offsets.extend(start + off for off in constant(rate, duration))
+        start += duration
+    return offsets
+
+
+def parse_stages(spec):
+    # "10:5,20:5,40:10" -> [(10.0, 5.0), (20.0, 5.0), (40.0, 10.0)]
+    stages = []
+    for part in spec.split(","):
+        rate, _, duration = part.strip().partition(":")
+        stages.append((float(rate), float(duration)))
+    return stages
+
+
+def build_schedule(profile, rate, duration, stages=None, seed=None):
+    if profile == "constant":
+        return constant(rate, duration), duration
+    if profile == "poisson":
+        return poisson(rate, duration, seed), duration
+    if profile == "ramp":
+        parsed = parse_stages(stages) if isinstance(stages, str) else list(stages)
+        return stepped(parsed), sum(d for _, d in parsed)
+    raise ValueError(f"Unknown rate profile: {profile}")
+
+
+def run(offsets, fn, workers, schedule_duration=None):
+    """Call ``fn(scheduled_at)`` at each offset, whether or not earlier calls finished.
+
+    ``scheduled_at`` is the intended ``time.perf_counter()`` send time; callers
+    measure latency from it so time spent queued behind a slow server counts.
+    """
+    pending = queue.Queue()
+    lag = {"max": 0.0}
+    lock = threading.Lock()
+    completed = [0]
+
+    def sender():
+        while True:
+            scheduled_at = pending.get()
+            if scheduled_at is None:
+                return
+            late = time.perf_counter() - scheduled_at
+            try:
+                fn(scheduled_at)
+            finally:
+                with lock:
+                    completed[0] += 1
+                    if late > lag["max"]:
+                        lag["max"] = late
+
+    threads = [threading.Thread(target=sender, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+
+    t0 = time.perf_counter()
+    for off in offsets:
+        scheduled_at = t0 + off
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        pending.put(scheduled_at)
+    dispatched = time.perf_counter() - t0
+    for _ in threads:
+        pending.put(None)
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    window = schedule_duration or (offsets[-1] if offsets else 0) or dispatched
+    return {
+        "scheduled": len(offsets),
+        "completed": completed[0],
+        "target_rps": round(len(offsets) / window, 2) if window else 0.0,
+        "achieved_rps": round(completed[0] / elapsed, 2) if elapsed else 0.0,
+        "elapsed_s": round(elapsed, 2),
+        "max_start_lag_ms": round(lag["max"] * 1000, 2),
+    }
+
+
+def merge_results(results):
+    elapsed = max(r["elapsed_s"] for r in results)
+    completed = sum(r["completed"] for r in results)
+    return {
+        "scheduled": sum(r["scheduled"] for r in results),
+        "completed": completed,
+        "target_rps": round(sum(r["target_rps"] for r in results), 2),
+        "achieved_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "elapsed_s": elapsed,
+        "max_start_lag_ms": max(r["max_start_lag_ms"] for r in results),
+    }
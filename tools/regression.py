@@ -0,0 +1,243 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCHMARK_ARGS = ("--benchmark-save-data", "--benchmark-warmup=on", "--benchmark-min-time=0.0002",
+                  "--benchmark-max-time=0.5", "-q", "-p", "no:cacheprovider")
+BASELINE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks", "baselines"))
+MAX_SAMPLES = 200
+MAX_RUNS = 5
+ALPHA = 0.01
+MIN_EFFECT = 0.10
+
+
+def _cpu_model():
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as fh:
+            for line in fh:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or "unknown"
+
+
+def machine_fingerprint():
+    """Describe the things that move benchmark numbers between machines."""
+    info = {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "python": f"{platform.python_implementation()} {platform.python_version_tuple()[0]}."
+                  f"{platform.python_version_tuple()[1]}",
+    }
+    info["id"] = hashlib.sha1(json.dumps(info, sort_keys=True).encode()).hexdigest()[:12]
+    return info
+
+
+def downsample(samples, size=MAX_SAMPLES):
+    # Evenly spaced order statistics keep the shape of the distribution while
+    # bounding the baseline file; micro benchmarks produce thousands of rounds.
+    ordered = sorted(samples)
+    if len(ordered) <= size:
+        return ordered
+    step = (len(ordered) - 1) / (size - 1)
+    return [ordered[round(i * step)] for i in range(size)]
+
+
+def median(samples):
+    ordered = sorted(samples)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def mann_whitney(baseline, current):
+    """One-sided Mann-Whitney U tests, normal approximation with tie correction.
+
+    Returns ``(p_slower, p_faster)``: the p-values for ``current`` being
+    stochastically larger (slower) or smaller (faster) than ``baseline``.
+    """
+    n1, n2 = len(baseline), len(current)
+    if not n1 or not n2:
+        return 1.0, 1.0
+    combined = sorted([(v, 0) for v in baseline] + [(v, 1) for v in current])
+    rank_sum, ties, i = 0.0, 0.0, 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 1)
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    n = n1 + n2
+    u = rank_sum - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0, 1.0
+    sigma = math.sqrt(variance)
+    z_slower = (u - mean - 0.5) / sigma
+    z_faster = (mean - u - 0.5) / sigma
+    return 0.5 * math.erfc(z_slower / math.sqrt(2)), 0.5 * math.erfc(z_faster / math.sqrt(2))
+
+
+def noise_floor(runs):
+    """Relative spread of the per-run medians saved for one benchmark.
+
+    Rounds within one run are much tighter than runs on different days (CPU
+    frequency, neighbours, cache state), so a change has to beat the drift the
+    baseline itself has shown before it counts.
+    """
+    if len(runs) < 2:
+        return 0.0
+    medians = [median(run) for run in runs]
+    centre = median(medians)
+    return (max(medians) - min(medians)) / centre if centre else 0.0
+
+
+def compare(runs, current, alpha=ALPHA, min_effect=MIN_EFFECT):
+    """Classify one benchmark: only significant *and* large changes count."""
+    baseline = [v for run in runs for v in run]
+    base_median, cur_median = median(baseline), median(current)
+    change = (cur_median - base_median) / base_median if base_median else 0.0
+    threshold = max(min_effect, noise_floor(runs))
+    p_slower, p_faster = mann_whitney(baseline, current)
+    verdict = "unchanged"
+    if p_slower < alpha and change > threshold:
+        verdict = "regressed"
+    elif p_faster < alpha and change < -threshold:
+        verdict = "improved"
+    return {
+        "baseline_median": base_median,
+        "current_median": cur_median,
+        "change": round(change, 4),
+        "threshold": round(threshold, 4),
+        "p_value": round(min(p_slower, p_faster), 6),
+        "verdict": verdict,
+    }
+
+
+def load_results(path):
+    """Per-round samples from a ``pytest --benchmark-json`` file.
+
+    The suite must be run with ``--benchmark-save-data``; without raw data
+    there is nothing to test statistically.
+    """
+    with open(path, encoding="utf-8") as fh:
+        report = json.load(fh)
+    samples = {}
+    for bench in report.get("benchmarks", []):
+        data = bench["stats"].get("data")
+        if not data:
+            raise ValueError(f"{bench['fullname']} has no raw data; rerun with --benchmark-save-data")
+        samples[bench["fullname"]] = data
+    return samples
+
+
+def baseline_path(directory=BASELINE_DIR, fingerprint=None):
+    fingerprint = fingerprint or machine_fingerprint()
+    return os.path.join(directory, f"{fingerprint['id']}.json")
+
+
+def save_baseline(samples, directory=BASELINE_DIR, fingerprint=None):
+    """Append one run per benchmark, keeping the last MAX_RUNS of them."""
+    fingerprint = fingerprint or machine_fingerprint()
+    path = baseline_path(directory, fingerprint)
+    existing = load_baseline(directory, fingerprint) or {}
+    for name, values in samples.items():
+        existing[name] = (existing.get(name, []) + [downsample(values)])[-MAX_RUNS:]
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"machine": fingerprint, "benchmarks": existing}, fh, indent=1, sort_keys=True)
+    return path
+
+
+def load_baseline(directory=BASELINE_DIR, fingerprint=None):
+    path = baseline_path(directory, fingerprint)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)["benchmarks"]
+
+
+def compare_all(samples, baseline, alpha=ALPHA, min_effect=MIN_EFFECT):
+    report = {}
+    for name, values in sorted(samples.items()):
+        if name not in baseline:
+            report[name] = {"verdict": "new", "current_median": median(values)}
+        else:
+            report[name] = compare(baseline[name], downsample(values), alpha, min_effect)
+    return report
+
+
+def format_report(report):
+    lines = [f"{'benchmark':<60} {'baseline':>12} {'current':>12} {'change':>8} {'limit':>6} {'p':>9}  verdict"]
+    for name, row in report.items():
+        base = row.get("baseline_median")
+        base = f"{base * 1e6:10.2f}us" if base is not None else f"{'-':>12}"
+        change = f"{row['change']:+8.1%}" if "change" in row else f"{'-':>8}"
+        limit = f"{row['threshold']:6.0%}" if "threshold" in row else f"{'-':>6}"
+        p = f"{row['p_value']:9.2g}" if "p_value" in row else f"{'-':>9}"
+        lines.append(f"{name[-60:]:<60} {base} {row['current_median'] * 1e6:10.2f}us {change} {limit} {p}  "
+                     f"{row['verdict']}")
+    return "\n".join(lines)
+
+
+def run_suite(extra_args=()):
+    """Run benchmarks/ with the flags comparisons rely on; returns samples."""
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        cmd = [sys.executable, "-m", "pytest", os.path.join(PROJECT_ROOT, "benchmarks"),
+               f"--benchmark-json={path}", *BENCHMARK_ARGS, *extra_args]
+        subprocess.run(cmd, cwd=PROJECT_ROOT, check=True, stdout=subprocess.DEVNULL)
+        return load_results(path)
+    finally:
+        os.unlink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Save or compare benchmark baselines for this machine.")
+    parser.add_argument("command", choices=("run", "save", "compare", "fingerprint"),
+                        help="run: run benchmarks/ and compare (or --save) in one go")
+    parser.add_argument("results", nargs="?", help="pytest --benchmark-json output (with --benchmark-save-data)")
+    parser.add_argument("--save", action="store_true", help="with run: store the run as a baseline")
+    parser.add_argument("--dir", default=BASELINE_DIR)
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--min-effect", type=float, default=MIN_EFFECT,
+                        help="smallest relative change in the median treated as real (default 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.command == "fingerprint":
+        print(json.dumps(machine_fingerprint(), indent=2))
+        return 0
+    if args.command == "run":
+        samples = run_suite()
+    elif not args.results:
+        parser.error("results file is required")
+    else:
+        samples = load_results(args.results)
+    if args.command == "save" or args.save:
+        print(f"Saved {len(samples)} baselines to {save_baseline(samples, args.dir)}")
+        return 0
+    baseline = load_baseline(args.dir)
+    if baseline is None:
+        print(f"No baseline for this machine at {baseline_path(args.dir)}; run 'save' first", file=sys.stderr)
+        return 2
+    report = compare_all(samples, baseline, args.alpha, args.min_effect)
+    print(format_report(report))
+    return 1 if any(row["verdict"] == "regressed" for row in report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+import json
+import os
+import random
+from collections import namedtuple
+
+from api.auth import AuthenticationError
+
+SCENARIO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scenarios"))
+
+Operation = namedtuple("Operation", "method path label endpoint needs_id needs_auth")
+
+OPERATIONS = {
+    "ping": Operation("GET", "/ping", "ping", "GET /ping", False, False),
+    "list_bookings": Operation("GET", "/booking", "list", "GET /booking", False, False),
+    "create_booking": Operation("POST", "/booking", "create", "POST /booking", False, False),
+    "get_booking": Operation("GET", "/booking/{id}", "get", "GET /booking/{id}", True, False),
+    "update_booking": Operation("PUT", "/booking/{id}", "update", "PUT /booking/{id}", True, True),
+    "patch_booking": Operation("PATCH", "/booking/{id}", "patch", "PATCH /booking/{id}", True, True),
+    "delete_booking": Operation("DELETE", "/booking/{id}", "delete", "DELETE /booking/{id}", True, True),
+}
+FILTER_FIELDS = ("firstname", "lastname", "checkin", "checkout")
+
+
+class ScenarioError(ValueError):
+    pass
+
+
+class Step:
+    def __init__(self, spec):
+        if isinstance(spec, str):
+            spec = {"op": spec}
+        self.op = spec.get("op")
+        if self.op not in OPERATIONS:
+            raise ScenarioError(f"Unknown operation: {self.op!r}")
+        operation = self.operation = OPERATIONS[self.op]
+        # A custom name replaces both the short stats label and the locust name.
+        self.label = spec.get("name", operation.label)
+        self.endpoint = spec.get("name", operation.endpoint)
+        self.filters = tuple(spec.get("filter", ()))
+        if set(self.filters) - set(FILTER_FIELDS):
+            raise ScenarioError(f"Unknown list filter(s): {sorted(set(self.filters) - set(FILTER_FIELDS))}")
+        self.fields = tuple(spec.get("fields", ("firstname",)))
+
+
+class Task:
+    def __init__(self, spec):
+        self.name = spec["name"]
+        self.weight = float(spec.get("weight", 1))
+        self.steps = [Step(s) for s in spec.get("steps", ())]
+        if not self.steps:
+            raise ScenarioError(f"Task {self.name!r} has no steps")
+
+
+class Scenario:
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec.get("name", "scenario")
+        think = spec.get("think_time", 0)
+        if isinstance(think, (int, float)):
+            think = (think, think)
+        self.think_time = (float(think[0]), float(think[1]))
+        self.stages = [(int(s["users"]), float(s["duration"])) for s in spec.get("stages", ())]
+        self.tasks = [Task(t) for t in spec.get("tasks", ())]
+        if not self.tasks:
+            raise ScenarioError(f"Scenario {self.name!r} has no tasks")
+        self.weights = [t.weight for t in self.tasks]
+
+    @property
+    def duration(self):
+        return sum(d for _, d in self.stages) if self.stages else None
+
+    @property
+    def max_users(self):
+        return max(u for u, _ in self.stages) if self.stages else None
+
+    def users_at(self, elapsed):
+        for users, duration in self.stages:
+            if elapsed < duration:
+                return users
+            elapsed -= duration
+        return 0
+
+    def think(self, rng):
+        low, high = self.think_time
+        return low if low == high else rng.uniform(low, high)
+
+
+def load(path):
+    """Load a scenario from a YAML or TOML file, or by name from scenarios/."""
+    if not os.path.exists(path) and not os.path.dirname(path):
+        for ext in ("", ".yaml", ".yml", ".toml"):
+            candidate = os.path.join(SCENARIO_DIR, path + ext)
+            if os.path.exists(candidate):
+                path = candidate
+                break
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        with open(path, "rb") as fh:
+            return Scenario(tomllib.load(fh))
+    import yaml
+    with open(path, encoding="utf-8") as fh:
+        return Scenario(yaml.safe_load(fh))
+
+
+class _Sent(tuple):
+    # (status, data) pair that TokenProvider.call can inspect for 401/403.
+    @property
+    def status_code(self):
+        return self[0]
+
+
+class ScenarioUser:
+    """One virtual user: picks weighted tasks and runs their steps in order.
+
+    ``send(step, method, path, body=None, params=None, token=None, start=None)``
+    performs the request and returns ``(status, decoded_json_or_None)``; each
+    driver supplies its own so timings land in its own stats. With a ``pool``
+    (api.pool.BookingPool), steps without a booking of their own read shared
+    pooled bookings and lease one for the length of a mutating step.
+    """
+
+    def __init__(self, scenario, send, next_payload, tokens, rng=None, max_known=1000, pool=None):
+        self.scenario = scenario
+        self.send = send
+        self.next_payload = next_payload
+        self.tokens = tokens
+        self.rng = rng or random.Random()
+        self.max_known = max_known
+        self.pool = pool
+        self.known = []
+
+    def pick(self):
+        return self.rng.choices(self.scenario.tasks, weights=self.scenario.weights)[0]
+
+    def run_task(self, task=None, start=None):
+        task = task or self.pick()
+        # Steps inside a task share the booking they create; steps that need one
+        # without a prior create borrow a booking this user created earlier.
+        current = None
+        for step in task.steps:
+            current = self._run_step(step, current, start)
+            start = None
+        return task
+
+    def _run_step(self, step, current, start):
+        op = step.operation
+        if step.op == "create_booking":
+            return self._create(step, start)
+        if not op.needs_id:
+            params = self._filters(step, current) if step.filters else None
+            self.send(step, op.method, op.path, params=params, start=start)
+            return current
+
+        if op.needs_auth and self.pool is not None and (current is None or current[0] in self.pool):
+            # Pooled bookings are shared with readers, so a mutation leases one.
+            leased = self.pool.acquire()
+            if leased is not None:
+                return self._run_leased(step, leased, start)
+            current = None
+        if current is None:
+            current = self._existing(shared=not op.needs_auth)
+        if current is None:
+            current = self._create(Step("create_booking"), start)
+            start = None
+            if current is None:
+                return None
+        path = op.path.format(id=current[0])
+        if not op.needs_auth:
+            self.send(step, op.method, path, start=start)
+            return current
+
+        try:
+            status, body = self._mutate(step, path, start)
+        except AuthenticationError:
+            return current
+        if step.op == "delete_booking":
+            self._forget(current)
+            return None
+        if step.op == "update_booking" and status is not None and status < 400:
+            current = self._replace(current, self._as_dict(body))
+        return current
+
+    def _mutate(self, step, path, start):
+        op = step.operation
+        body = None
+        if step.op == "update_booking":
+            body = self.next_payload()
+        elif step.op == "patch_booking":
+            fresh = self._as_dict(self.next_payload())
+            body = {f: fresh[f] for f in step.fields}
+        status, _ = self.tokens.call(
+            lambda tok: _Sent(self.send(step, op.method, path, body=body, token=tok, start=start)))
+        return status, body
+
+    def _run_leased(self, step, entry, start):
+        # The booking goes back to the pool after this one step, so readers never
+        # see it half-changed and later steps of the task do not hold it.
+        booking, deleted = None, False
+        try:
+            status, body = self._mutate(step, step.operation.path.format(id=entry[0]), start)
+            if status is not None and status < 400:
+                deleted = step.op == "delete_booking"
+                if step.op == "update_booking":
+                    booking = self._as_dict(body)
+                elif step.op == "patch_booking":
+                    booking = {**entry[1], **body}
+        except AuthenticationError:
+            pass
+        finally:
+            self.pool.release(entry, booking, deleted)
+        return None
+
+    def _create(self, step, start):
+        payload = self.next_payload()
+        _, data = self.send(step, "POST", "/booking", body=payload, start=start)
+        if not isinstance(data, dict) or not data.get("bookingid"):
+            return None
+        entry = (data["bookingid"], data.get("booking") or self._as_dict(payload))
+        self.known.append(entry)
+        if len(self.known) > self.max_known:
+            self.known.pop(0)
+        return entry
+
+    def _existing(self, shared=True):
+        if shared and self.pool is not None:
+            entry = self.pool.next()
+            if entry is not None:
+                return entry
+        return self.rng.choice(self.known) if self.known else None
+
+    def _forget(self, entry):
+        try:
+            self.known.remove(entry)
+        except ValueError:
+            pass
+
+    def _replace(self, entry, booking):
+        updated = (entry[0], booking)
+        try:
+            self.known[self.known.index(entry)] = updated
+        except ValueError:
+            pass
+        return updated
+
+    def _filters(self, step, current):
+        source = current or self._existing()
+        if source is None:
+            return None
+        booking = source[1]
+        dates = booking.get("bookingdates", {})
+        return {f: dates[f] if f in ("checkin", "checkout") else booking[f] for f in step.filters}
+
+    @staticmethod
+    def _as_dict(payload):
+        return payload if isinstance(payload, dict) else json.loads(payload)
@@ -1,84 +1,365 @@
 import os
+import sys
+import math
 import time
-import uuid
 import json
+import queue
+import random
 import threading
-import statistics
+import multiprocessing
 import requests
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from api.auth import AuthenticationError, TokenProvider
+from api.codec import default_codec
+from api.pool import BookingPool
+from utils.config import AUTH_PASSWORD, AUTH_USERNAME, LOCAL_SERVER, METRICS_INTERVAL, METRICS_JSONL, METRICS_PORT
+from utils.payloads import BookingGenerator
+from tools.histogram import LoadStats
+from tools import metrics, open_loop, scenario
+
 BASE_URL = os.getenv("BASE_URL", "https://restful-booker.herokuapp.com")
 USERS = int(os.getenv("USERS", "5"))
 DURATION = int(os.getenv("DURATION", "15"))
+REPORT_INTERVAL = float(os.getenv("REPORT_INTERVAL", "10"))
+MODE = os.getenv("MODE", "closed")
+RATE = float(os.getenv("RATE", "20"))
+RATE_PROFILE = os.getenv("RATE_PROFILE", "constant")
+RAMP = os.getenv("RAMP", "")
+PROCESSES = os.getenv("PROCESSES", "1")
+BOOKING_POOL = int(os.getenv("BOOKING_POOL", "0"))
+
+
+def default_scenario():
+    # booking_flow creates the booking it reads; with a pool the reads need no POST.
+    return "pooled_flow" if BOOKING_POOL > 0 else "booking_flow"
+
+
+SCENARIO = scenario.load(os.getenv("SCENARIO") or default_scenario())
+
+OPERATIONS = ("ping", "auth", "create", "get", "delete")
+# How often the parent checks for children that died without a final report.
+LIVENESS_POLL = 1.0
+JSON_HEADERS = {"Content-Type": "application/json"}
+CODEC = default_codec()
 
 
-def worker(stats):
-    session = requests.Session()
-    end = time.time() + DURATION
-    token = None
-    while time.time() < end:
-        t0 = time.perf_counter()
-        r = session.get(f"{BASE_URL}/ping")
-        stats["ping"].append((time.perf_counter() - t0) * 1000)
+def timed(stats, op, fn, *args, start=None, **kwargs):
+    t0 = time.perf_counter() if start is None else start
+    try:
+        r = fn(*args, **kwargs)
+    except requests.RequestException:
+        stats.record(op, (time.perf_counter() - t0) * 1000, ok=False)
+        return None
+    stats.record(op, (time.perf_counter() - t0) * 1000, ok=r.status_code < 400)
+    return r
 
-        t0 = time.perf_counter()
-        r = session.post(f"{BASE_URL}/auth", json={"username": "admin", "password": "password123"})
+
+def token_provider(stats):
+    # One cached token per driver process; "auth" is only timed when the
+    # provider actually has to fetch or refresh it.
+    def fetch(username, password):
+        r = timed(stats, "auth", requests.post, f"{BASE_URL}/auth",
+                  data=CODEC.dumps({"username": username, "password": password}), headers=JSON_HEADERS)
         try:
-            token = r.json().get("token")
+            return CODEC.loads(r.content).get("token")
         except Exception:
-            token = None
-        stats["auth"].append((time.perf_counter() - t0) * 1000)
-
-        payload = {
-            "firstname": f"Fn-{uuid.uuid4().hex[:8]}",
-            "lastname": f"Ln-{uuid.uuid4().hex[:8]}",
-            "totalprice": 123,
-            "depositpaid": True,
-            "bookingdates": {
-                "checkin": "2026-02-01",
-                "checkout": "2026-02-03",
-            },
-            "additionalneeds": "Breakfast",
-        }
-        t0 = time.perf_counter()
-        cr = session.post(f"{BASE_URL}/booking", json=payload, headers={"Content-Type": "application/json"})
-        stats["create"].append((time.perf_counter() - t0) * 1000)
-        bid = None
+            return None
+
+    return TokenProvider(AUTH_USERNAME, AUTH_PASSWORD, fetch=fetch)
+
+
+def sender(session, stats):
+    def send(step, method, path, body=None, params=None, token=None, start=None):
+        kwargs = {}
+        if body is not None:
+            kwargs["data"] = body if isinstance(body, bytes) else CODEC.dumps(body)
+            kwargs["headers"] = JSON_HEADERS
+        if token:
+            kwargs["cookies"] = {"token": token}
+        r = timed(stats, step.label, session.request, method, f"{BASE_URL}{path}", params=params,
+                  start=start, **kwargs)
+        if r is None:
+            return None, None
+        data = None
+        if step.op == "create_booking":
+            try:
+                data = CODEC.loads(r.content)
+            except Exception:
+                data = None
+        return r.status_code, data
+
+    return send
+
+
+def scenario_user(session, stats, tokens, next_payload, pool=None):
+    return scenario.ScenarioUser(SCENARIO, sender(session, stats), next_payload, tokens, random.Random(), pool=pool)
+
+
+def booking_pool(seed=None):
+    # Pooled bookings are set-up data: they are created (and replaced after a
+    # delete) outside the stats, before the measurement window opens.
+    if BOOKING_POOL <= 0:
+        return None
+
+    def create(payload):
         try:
-            bid = cr.json().get("bookingid")
-        except Exception:
-            bid = None
-        if bid:
-            t0 = time.perf_counter()
-            session.get(f"{BASE_URL}/booking/{bid}")
-            stats["get"].append((time.perf_counter() - t0) * 1000)
-            cookies = {"token": token} if token else None
-            t0 = time.perf_counter()
-            session.delete(f"{BASE_URL}/booking/{bid}", cookies=cookies or {})
-            stats["delete"].append((time.perf_counter() - t0) * 1000)
-
-
-def summarize(stats):
-    def m(d):
-        if not d:
-            return {}
-        return {
-            "count": len(d),
-            "mean_ms": round(statistics.mean(d), 2),
-            "p95_ms": round(statistics.quantiles(d, n=100)[94], 2) if len(d) >= 100 else None,
-        }
-
-    out = {k: m(v) for k, v in stats.items()}
-    print(json.dumps(out, indent=2))
+            r = requests.post(f"{BASE_URL}/booking", data=payload, headers=JSON_HEADERS)
+            data = CODEC.loads(r.content) if r.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            return None
+        return (data["bookingid"], data["booking"]) if data else None
+
+    pool = BookingPool(BOOKING_POOL, create=create, payloads=BookingGenerator(seed).stream(serialized=True))
+    pool.fill()
+    return pool
+
+
+def drain_pool(pool, tokens):
+    ids = pool.clear()
+    if not ids:
+        return
+    try:
+        token = tokens.token()
+    except AuthenticationError:
+        return
+    with requests.Session() as session:
+        for bookingid in ids:
+            try:
+                session.delete(f"{BASE_URL}/booking/{bookingid}", cookies={"token": token})
+            except requests.RequestException:
+                pass
+
+
+def run_duration():
+    return SCENARIO.duration or DURATION
+
+
+def user_count(share=1.0):
+    # USERS is per process; scenario stages describe the whole fleet.
+    if SCENARIO.stages:
+        return max(1, math.ceil(SCENARIO.max_users * share))
+    return USERS
+
+
+def worker(stats, tokens, next_payload, end=None, stop=None, index=0, share=1.0, pool=None):
+    user = scenario_user(requests.Session(), stats, tokens, next_payload, pool)
+    end = end or time.time() + run_duration()
+    started = end - run_duration()
+    while time.time() < end and not (stop is not None and stop.is_set()):
+        # Ramp stages: only the first N workers run while a stage asks for N users.
+        if SCENARIO.stages and index >= math.ceil(SCENARIO.users_at(time.time() - started) * share):
+            time.sleep(0.1)
+            continue
+        user.run_task()
+        pause = SCENARIO.think(user.rng)
+        if pause:
+            time.sleep(pause)
+
+
+def run_open_loop(stats, tokens, next_payload, share=1.0, seed=None, rate=None, duration=None, workers=None,
+                  pool=None):
+    # Open loop: tasks start on a fixed schedule regardless of how the server
+    # keeps up. Each task's first step and "flow" are timed from the scheduled
+    # start, so queueing delay shows up in the latency instead of being omitted.
+    # rate/duration/workers override RATE/run_duration()/USERS (tools.capacity).
+    profile, stages = RATE_PROFILE, None
+    if rate is not None:
+        # An explicit rate is held constant (or Poisson) for the whole run.
+        profile = "constant" if profile == "ramp" else profile
+    elif RAMP:
+        stages = [(r * share, d) for r, d in open_loop.parse_stages(RAMP)]
+    offsets, window = open_loop.build_schedule(profile, (RATE if rate is None else rate) * share,
+                                               run_duration() if duration is None else duration, stages, seed)
+    local = threading.local()
+
+    def fire(scheduled_at):
+        user = getattr(local, "user", None)
+        if user is None:
+            user = local.user = scenario_user(requests.Session(), stats, tokens, next_payload, pool)
+        user.run_task(start=scheduled_at)
+        stats.record("flow", (time.perf_counter() - scheduled_at) * 1000)
+
+    return open_loop.run(offsets, fire, workers or USERS, window)
+
+
+def summarize(stats, out=sys.stdout, extra=None, elapsed_s=None):
+    report = stats.summary(elapsed_s)
+    if extra:
+        report.update(extra)
+    print(json.dumps(report, indent=2), file=out, flush=True)
+
+
+def report_periodically(stats, done, interval):
+    while not done.wait(interval):
+        print(json.dumps({"elapsed_s": round(stats.elapsed(), 1), "interim": stats.summary()}),
+              file=sys.stderr, flush=True)
+
+
+def run_load(stats, share=1.0, end=None, stop=None, seed=None, pool=None):
+    # pool: a booking_pool() filled by the caller before the window opened, or None.
+    tokens = token_provider(stats)
+    next_payload = BookingGenerator(seed).stream(serialized=True)
+    try:
+        if MODE == "open":
+            return {"open_loop": run_open_loop(stats, tokens, next_payload, share, seed, pool=pool)}
+        threads = [threading.Thread(target=worker, args=(stats, tokens, next_payload, end, stop, i, share, pool),
+                                    daemon=True)
+                   for i in range(user_count(share))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return None
+    finally:
+        if pool is not None:
+            drain_pool(pool, tokens)
+
+
+def process_main(index, count, base_url, start, go, stop, results):
+    global BASE_URL
+    BASE_URL = base_url
+    pool = booking_pool(index)
+    results.put(("ready", index, None, None))
+    go.wait()
+    start_at = start.value
+    # Every process sleeps until the same wall-clock instant so the fleet shares
+    # one measurement window; histograms are only created once it opens.
+    time.sleep(max(0.0, start_at - time.time()))
+    stats = LoadStats(OPERATIONS)
+    done = threading.Event()
+
+    interval = push_interval()
+
+    def push_interim():
+        while not done.wait(interval):
+            results.put(("interim", index, stats.to_dict(), None))
+
+    if interval > 0:
+        threading.Thread(target=push_interim, daemon=True).start()
+    extra = run_load(stats, share=1.0 / count, end=start_at + run_duration(), stop=stop, seed=index, pool=pool)
+    done.set()
+    results.put(("final", index, stats.to_dict(), extra))
+
+
+def push_interval():
+    # Children report often enough for both the stderr summaries and the live
+    # metrics exporter in the parent.
+    intervals = [REPORT_INTERVAL] if REPORT_INTERVAL > 0 else []
+    if METRICS_PORT or METRICS_JSONL:
+        intervals.append(METRICS_INTERVAL)
+    return min(intervals) if intervals else 0
+
+
+def run_processes(count, latest=None):
+    ctx = multiprocessing.get_context()
+    results = ctx.Queue()
+    stop = ctx.Event()
+    go = ctx.Event()
+    start = ctx.Value("d", 0.0)
+    procs = [ctx.Process(target=process_main, args=(i, count, BASE_URL, start, go, stop, results), daemon=True)
+             for i in range(count)]
+    for p in procs:
+        p.start()
+
+    latest = {} if latest is None else latest
+    extras, finished, lost, ready = [], set(), [], set()
+    start_at = None
+    last_report = time.monotonic()
+    try:
+        while len(finished) < count:
+            if start_at is None and len(ready | finished) == count:
+                # The start time is only chosen once every child has finished its
+                # set-up (e.g. filling the booking pool), so none of them starts late.
+                start_at = start.value = time.time() + 0.5 + 0.05 * count
+                go.set()
+            try:
+                kind, index, data, extra = results.get(timeout=LIVENESS_POLL)
+            except queue.Empty:
+                # A crashed or OOM-killed child never sends "final"; its last
+                # interim snapshot (if any) stays in the merged report.
+                for index, p in enumerate(procs):
+                    if index not in finished and not p.is_alive():
+                        finished.add(index)
+                        lost.append(index)
+                        print(f"process {index} exited with code {p.exitcode} before reporting",
+                              file=sys.stderr, flush=True)
+                continue
+            if kind == "ready":
+                ready.add(index)
+                continue
+            latest[index] = data
+            if kind == "final":
+                finished.add(index)
+                if extra:
+                    extras.append(extra["open_loop"])
+            elif REPORT_INTERVAL > 0 and time.monotonic() - last_report >= REPORT_INTERVAL:
+                last_report = time.monotonic()
+                merged = merge_stats(latest.values())
+                print(json.dumps({"elapsed_s": round(time.time() - start_at, 1),
+                                  "interim": merged.summary(time.time() - start_at)}),
+                      file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        stop.set()
+        go.set()
+        raise
+    finally:
+        for p in procs:
+            p.join(timeout=5)
+
+    start_at = start_at or time.time()
+    elapsed = max(time.time() - start_at, 1e-9) if MODE == "open" else run_duration()
+    extra = {"processes": count}
+    if extras:
+        extra["open_loop"] = open_loop.merge_results(extras)
+    if lost:
+        extra["lost_processes"] = sorted(lost)
+    return merge_stats(latest.values()), extra, elapsed
+
+
+def merge_stats(snapshots):
+    merged = LoadStats(OPERATIONS)
+    for data in snapshots:
+        merged.merge(LoadStats.from_dict(data))
+    return merged
+
+
+def process_count():
+    if PROCESSES == "auto":
+        return os.cpu_count() or 1
+    return max(1, int(PROCESSES))
 
 
 def main():
-    stats = {"ping": [], "auth": [], "create": [], "get": [], "delete": []}
-    threads = [threading.Thread(target=worker, args=(stats,), daemon=True) for _ in range(USERS)]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
-    summarize(stats)
+    global BASE_URL
+    local = None
+    if LOCAL_SERVER:
+        from server import LocalBookerServer
+        local = LocalBookerServer().start()
+        BASE_URL = local.url
+    count = process_count()
+    elapsed = None
+    if count > 1:
+        latest = {}
+        exporter = metrics.start_from_config(lambda: merge_stats(list(latest.values())), "simple_load")
+        stats, extra, elapsed = run_processes(count, latest)
+    else:
+        pool = booking_pool()
+        stats = LoadStats(OPERATIONS)
+        exporter = metrics.start_from_config(lambda: stats, "simple_load")
+        done = threading.Event()
+        if REPORT_INTERVAL > 0:
+            threading.Thread(target=report_periodically, args=(stats, done, REPORT_INTERVAL), daemon=True).start()
+        extra = run_load(stats, pool=pool)
+        done.set()
+    if exporter is not None:
+        exporter.stop()
+    summarize(stats, extra=extra, elapsed_s=elapsed)
+    if local is not None:
+        local.stop()
 
 
 if __name__ == "__main__":
@@ -1 +1,35 @@
-BASE_URL = "https://restful-booker.herokuapp.com"
+import os
+
+BASE_URL = os.getenv("BASE_URL", "https://restful-booker.herokuapp.com")
+LOCAL_SERVER = os.getenv("RB_LOCAL_SERVER", "").lower() in ("1", "true", "yes")
+AUTH_USERNAME = os.getenv("AUTH_USERNAME", "admin")
+AUTH_PASSWORD = os.getenv("AUTH_PASSWORD", "password123")
+TOKEN_TTL = float(os.getenv("RB_TOKEN_TTL", "600"))
+TOKEN_REFRESH_MARGIN = float(os.getenv("RB_TOKEN_REFRESH_MARGIN", "60"))
+TOKEN_REFRESH_BACKOFF = float(os.getenv("RB_TOKEN_REFRESH_BACKOFF", "5"))
+CASSETTE_PATH = os.getenv("RB_CASSETTE", "")
+CASSETTE_MODE = os.getenv("RB_CASSETTE_MODE", "")
+CASSETTE_LATENCY = os.getenv("RB_CASSETTE_LATENCY", "").lower() in ("1", "true", "yes")
+CACHE_TTL = float(os.getenv("RB_CACHE_TTL", "0"))
+CACHE_SIZE = int(os.getenv("RB_CACHE_SIZE", "1024"))
+RETRY_ATTEMPTS = int(os.getenv("RB_RETRY_ATTEMPTS", "3"))
+RETRY_BACKOFF = float(os.getenv("RB_RETRY_BACKOFF", "0.1"))
+RETRY_BACKOFF_MAX = float(os.getenv("RB_RETRY_BACKOFF_MAX", "2"))
+RETRY_BUDGET = float(os.getenv("RB_RETRY_BUDGET", "0.2"))
+BREAKER_THRESHOLD = float(os.getenv("RB_BREAKER_THRESHOLD", "0.5"))
+BREAKER_MIN_REQUESTS = int(os.getenv("RB_BREAKER_MIN_REQUESTS", "20"))
+BREAKER_WINDOW = float(os.getenv("RB_BREAKER_WINDOW", "10"))
+BREAKER_COOLDOWN = float(os.getenv("RB_BREAKER_COOLDOWN", "5"))
+METRICS_PORT = int(os.getenv("RB_METRICS_PORT", "0"))
+METRICS_JSONL = os.getenv("RB_METRICS_JSONL", "")
+METRICS_INTERVAL = float(os.getenv("RB_METRICS_INTERVAL", "5"))
+TRANSPORT = os.getenv("RB_TRANSPORT", "requests")
+POOL_SIZE = int(os.getenv("RB_POOL_SIZE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("RB_KEEPALIVE_EXPIRY", "0"))
+TCP_NODELAY = os.getenv("RB_TCP_NODELAY", "1").lower() in ("1", "true", "yes")
+IMPORT_BUDGET_MS = float(os.getenv("RB_IMPORT_BUDGET_MS", "60"))
+LATENCY_BUDGET_MODE = os.getenv("RB_LATENCY_BUDGET_MODE", "")
+SLO_P99_MS = float(os.getenv("RB_SLO_P99_MS", "1000"))
+SLO_ERROR_RATE = float(os.getenv("RB_SLO_ERROR_RATE", "0.01"))
+BOOKING_POOL_SIZE = int(os.getenv("RB_BOOKING_POOL_SIZE", "10"))
+BOOKING_POOL_MODE = os.getenv("RB_BOOKING_POOL_MODE", "round_robin")
@@ -1,3 +1,7 @@
+import json
+import threading
+
+
 def booking_payload():
     return {
         "firstname": "Test",
@@ -23,3 +27,129 @@ def updated_booking_payload():
         },
         "additionalneeds": "Dinner"
     }
+
+
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Sally", "Jim", "Eric", "Mark", "Nora", "Ana", "Luis", "Sofia", "Wei", "Yuki",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+)
+ADDITIONAL_NEEDS = ("Breakfast", "Lunch", "Dinner", "Late checkout", "Airport transfer", "None")
+
+
+class BookingGenerator:
+    def __init__(self, seed=None, first_names=FIRST_NAMES, last_names=LAST_NAMES, name_skew=1.1,
+                 price_median=150, price_sigma=0.6, price_min=20, price_max=5000,
+                 deposit_rate=0.7, start_date="2026-01-01", date_span_days=365,
+                 stay_mean=3.0, stay_max=30, additional_needs=ADDITIONAL_NEEDS, needs_weights=None):
+        import numpy as np
+
+        self._np = np
+        self.rng = np.random.default_rng(seed)
+        self.first_names = np.array(first_names, dtype=object)
+        self.last_names = np.array(last_names, dtype=object)
+        self.first_weights = self._zipf_weights(len(first_names), name_skew)
+        self.last_weights = self._zipf_weights(len(last_names), name_skew)
+        self.price_median = price_median
+        self.price_sigma = price_sigma
+        self.price_min = price_min
+        self.price_max = price_max
+        self.deposit_rate = deposit_rate
+        self.start_date = np.datetime64(start_date, "D")
+        self.date_span_days = date_span_days
+        self.stay_mean = stay_mean
+        self.stay_max = stay_max
+        self.additional_needs = np.array(additional_needs, dtype=object)
+        self.needs_weights = None if needs_weights is None else np.asarray(needs_weights) / np.sum(needs_weights)
+        # Pre-escaped JSON fragments so serialisation is string joining, not json.dumps per row.
+        self._json_first = np.array([json.dumps(n) for n in first_names], dtype=object)
+        self._json_last = np.array([json.dumps(n) for n in last_names], dtype=object)
+        self._json_needs = np.array([json.dumps(n) for n in additional_needs], dtype=object)
+
+    def _zipf_weights(self, size, skew):
+        weights = 1.0 / self._np.arange(1, size + 1) ** skew
+        return weights / weights.sum()
+
+    def batch(self, size):
+        np, rng = self._np, self.rng
+        first = rng.choice(len(self.first_names), size=size, p=self.first_weights)
+        last = rng.choice(len(self.last_names), size=size, p=self.last_weights)
+        price = np.clip(np.rint(rng.lognormal(np.log(self.price_median), self.price_sigma, size)),
+                        self.price_min, self.price_max).astype(np.int64)
+        deposit = rng.random(size) < self.deposit_rate
+        checkin = self.start_date + rng.integers(0, self.date_span_days, size)
+        stay = np.clip(rng.geometric(1.0 / self.stay_mean, size), 1, self.stay_max)
+        needs = rng.choice(len(self.additional_needs), size=size, p=self.needs_weights)
+        return {
+            "firstname": first,
+            "lastname": last,
+            "totalprice": price,
+            "depositpaid": deposit,
+            "checkin": checkin,
+            "checkout": checkin + stay,
+            "additionalneeds": needs,
+        }
+
+    def payloads(self, total, batch_size=10000):
+        for columns in self._batches(total, batch_size):
+            rows = zip(
+                self.first_names[columns["firstname"]].tolist(),
+                self.last_names[columns["lastname"]].tolist(),
+                columns["totalprice"].tolist(),
+                columns["depositpaid"].tolist(),
+                self._np.datetime_as_string(columns["checkin"]).tolist(),
+                self._np.datetime_as_string(columns["checkout"]).tolist(),
+                self.additional_needs[columns["additionalneeds"]].tolist(),
+            )
+            for first, last, price, deposit, checkin, checkout, needs in rows:
+                yield {
+                    "firstname": first,
+                    "lastname": last,
+                    "totalprice": price,
+                    "depositpaid": deposit,
+                    "bookingdates": {"checkin": checkin, "checkout": checkout},
+                    "additionalneeds": needs,
+                }
+
+    def json_payloads(self, total, batch_size=10000):
+        np = self._np
+        for columns in self._batches(total, batch_size):
+            rows = zip(
+                self._json_first[columns["firstname"]].tolist(),
+                self._json_last[columns["lastname"]].tolist(),
+                columns["totalprice"].tolist(),
+                np.where(columns["depositpaid"], "true", "false").tolist(),
+                np.datetime_as_string(columns["checkin"]).tolist(),
+                np.datetime_as_string(columns["checkout"]).tolist(),
+                self._json_needs[columns["additionalneeds"]].tolist(),
+            )
+            for first, last, price, deposit, checkin, checkout, needs in rows:
+                yield (
+                    f'{{"firstname":{first},"lastname":{last},"totalprice":{price},'
+                    f'"depositpaid":{deposit},"bookingdates":{{"checkin":"{checkin}",'
+                    f'"checkout":"{checkout}"}},"additionalneeds":{needs}}}'
+                ).encode()
+
+    def _batches(self, total, batch_size):
+        remaining = total
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            yield self.batch(size)
+            if remaining is not None:
+                remaining -= size
+
+    def stream(self, batch_size=1000, serialized=False):
+        """Endless thread-safe source: ``next_payload()`` hands out one booking per call."""
+        source = (self.json_payloads if serialized else self.payloads)(None, batch_size)
+        lock = threading.Lock()
+
+        def next_payload():
+            with lock:
+                return next(source)
+
+        return next_payload
@@ -0,0 +1,78 @@
+import threading
+
+PHASES = ("dns", "connect", "tls", "ttfb", "transfer", "total", "json_decode", "validation")
+
+_local = threading.local()
+
+
+class Instrumentation:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hooks = ()
+        self.connections = {"new": 0, "reused": 0}
+
+    @property
+    def enabled(self):
+        return bool(self.hooks)
+
+    def add_hook(self, hook):
+        # Hooks are kept in an immutable tuple so the hot path can read it without
+        # taking the lock; callers only pay for the ``if hooks`` check when off.
+        with self._lock:
+            self.hooks = self.hooks + (hook,)
+        return hook
+
+    def remove_hook(self, hook):
+        with self._lock:
+            self.hooks = tuple(h for h in self.hooks if h is not hook)
+
+    def emit(self, endpoint, phase, duration_ms):
+        for hook in self.hooks:
+            hook(endpoint, phase, duration_ms)
+
+    def count_connection(self, reused):
+        with self._lock:
+            self.connections["reused" if reused else "new"] += 1
+
+
+def set_current_endpoint(endpoint, instrumentation=None):
+    # Remembers the last traced request on this thread, so validate_schema can
+    # report to the client that sent it.
+    _local.endpoint = endpoint
+    _local.instrumentation = instrumentation
+
+
+def current_endpoint():
+    return getattr(_local, "endpoint", None)
+
+
+def current_instrumentation():
+    return getattr(_local, "instrumentation", None)
+
+
+class PhaseRecorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def __call__(self, endpoint, phase, duration_ms):
+        with self._lock:
+            entry = self.stats.get((endpoint, phase))
+            if entry is None:
+                entry = self.stats[(endpoint, phase)] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += duration_ms
+            if duration_ms > entry[2]:
+                entry[2] = duration_ms
+
+    def summary(self):
+        out = {}
+        with self._lock:
+            for (endpoint, phase), (count, total, peak) in sorted(self.stats.items(),
+                                                                  key=lambda kv: (str(kv[0][0]), kv[0][1])):
+                out.setdefault(endpoint, {})[phase] = {
+                    "count": count,
+                    "mean_ms": round(total / count, 3),
+                    "max_ms": round(peak, 3),
+                }
+        return out
@@ -1,32 +1,117 @@
-from typing import Any
-from jsonschema import Draft7Validator
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 from .schemas import (
     AUTH_TOKEN_RESPONSE_SCHEMA,
     BOOKING_OBJECT_SCHEMA,
     BOOKING_CREATE_RESPONSE_SCHEMA,
     BOOKINGS_LIST_SCHEMA,
 )
+from .timing import current_endpoint, current_instrumentation
+
+if TYPE_CHECKING:
+    from jsonschema import Draft7Validator
 
 SCHEMAS = {
     "auth_token_response": AUTH_TOKEN_RESPONSE_SCHEMA,
     "booking_object": BOOKING_OBJECT_SCHEMA,
     "booking_create_response": BOOKING_CREATE_RESPONSE_SCHEMA,
     "bookings_list": BOOKINGS_LIST_SCHEMA,
+    "bookings_list_item": BOOKINGS_LIST_SCHEMA["items"],
 }
 
 
-def validate_schema(data: Any, schema_name: str) -> None:
+def _schema(schema_name: str) -> dict:
     schema = SCHEMAS.get(schema_name)
     assert schema is not None, f"Unknown schema: {schema_name}"
+    return schema
+
+
+# jsonschema and fastjsonschema are imported on first use: importing this module
+# stays cheap, and with fastjsonschema installed jsonschema is only loaded to
+# explain a failure.
+@lru_cache(maxsize=None)
+def get_validator(schema_name: str) -> "Draft7Validator":
+    from jsonschema import Draft7Validator
+    return Draft7Validator(_schema(schema_name))
+
+
+@lru_cache(maxsize=None)
+def get_checker(schema_name: str) -> Callable[[Any], bool]:
+    try:
+        import fastjsonschema
+    except ImportError:
+        return get_validator(schema_name).is_valid
+    compiled = fastjsonschema.compile(_schema(schema_name))
+
+    def check(data):
+        try:
+            compiled(data)
+        except fastjsonschema.JsonSchemaException:
+            return False
+        return True
+
+    return check
+
+
+def is_valid(data: Any, schema_name: str) -> bool:
+    return get_checker(schema_name)(data)
 
-    validator = Draft7Validator(schema)
+
+def validate_schema(data: Any, schema_name: str) -> None:
+    instrumentation = current_instrumentation()
+    if instrumentation is None or not instrumentation.hooks:
+        return _validate_schema(data, schema_name)
+    t0 = time.perf_counter()
+    try:
+        return _validate_schema(data, schema_name)
+    finally:
+        instrumentation.emit(current_endpoint() or schema_name, "validation",
+                             (time.perf_counter() - t0) * 1000.0)
+
+
+def _validate_schema(data: Any, schema_name: str) -> None:
+    # Errors are only collected and sorted once the cheap check has failed.
+    if get_checker(schema_name)(data):
+        return
+    validator = get_validator(schema_name)
     errors = sorted(validator.iter_errors(data), key=lambda e: list(e.path))
     assert not errors, _format_errors(errors)
 
 
-def _format_errors(errors) -> str:
+def validate_many(documents: Iterable[Any], schema_name: str) -> int:
+    check = get_checker(schema_name)
+    count = 0
+    failures = []
+    for index, doc in enumerate(documents):
+        count += 1
+        if not check(doc):
+            errors = sorted(get_validator(schema_name).iter_errors(doc), key=lambda e: list(e.path))
+            failures.extend((index, err) for err in errors)
+    assert not failures, _format_errors([err for _, err in failures],
+                                        prefixes=[str(i) for i, _ in failures])
+    return count
+
+
+def validate_each(documents: Iterable[Any], schema_name: str) -> Iterable[Any]:
+    """Yield documents one at a time, failing at the first invalid one.
+
+    The streaming counterpart of validate_many: nothing is collected, so it
+    works on unbounded iterables.
+    """
+    check = get_checker(schema_name)
+    for index, doc in enumerate(documents):
+        if not check(doc):
+            errors = sorted(get_validator(schema_name).iter_errors(doc), key=lambda e: list(e.path))
+            assert not errors, _format_errors(errors, prefixes=[str(index)] * len(errors))
+        yield doc
+
+
+def _format_errors(errors, prefixes=None) -> str:
     msgs = []
-    for err in errors:
-        path = "/".join(str(p) for p in err.path) or "<root>"
-        msgs.append(f"{path}: {err.message}")
+    for i, err in enumerate(errors):
+        path = "/".join(str(p) for p in err.path)
+        if prefixes is not None:
+            path = "/".join(p for p in (prefixes[i], path) if p)
+        msgs.append(f"{path or '<root>'}: {err.message}")
     return "Schema validation failed: " + "; ".join(msgs)